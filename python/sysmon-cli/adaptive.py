@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# =======================================================================================================================================================================
+#  File        : adaptive.py
+#  Author      : Ionescu Robert-Constantin
+#  Date        : 2025-11-29
+#  Version     : 1.0
+#  Description : Health-driven adaptive sampling interval for sysmon_cli - slow when health is high and stable, fast when it falls or alerts fire.
+# =======================================================================================================================================================================
+#  Usage       : from adaptive import AdaptiveInterval; if adaptive.update(health, alerts): scheduler.retime(adaptive.scale)
+# =======================================================================================================================================================================
+
+# =======================================================================================================================================================================
+# TO DO SECTION / Development Steps / Requirements
+# =======================================================================================================================================================================
+
+# TODO - STEP1 - Three intervals: fast (incident), normal (--interval), slow (idle)
+# TODO - STEP2 - Go fast at once when health drops below the low threshold, falls sharply in one sample, or an alert fires (resolved alerts do not count)
+# TODO - STEP3 - Hysteresis: leave fast only after health has stayed above low + margin for a settle time
+# TODO - STEP4 - Go slow only after health has stayed above the high threshold and steady for a stable time; leave it below high - margin
+# TODO - STEP5 - Hold times are measured in seconds (summed intervals), so they mean the same thing at every rate
+# TODO - STEP6 - Ignore the health of the very first sample (its CPU reading right after priming is unreliable); alerts still count
+
+# =======================================================================================================================================================================
+# Constants / Variables / Classes
+# =======================================================================================================================================================================
+
+MODES = ("fast", "normal", "slow")
+FAST_FACTOR = 0.25              # default fast interval = --interval / 4
+SLOW_FACTOR = 5.0               # default slow interval = --interval * 5
+DEFAULT_HIGH = 90.0             # health at or above this, steady, is "idle"
+DEFAULT_LOW = 60.0              # health below this is an incident
+DEFAULT_DROP = 10.0             # health points lost in one sample that count as an incident
+DEFAULT_MARGIN = 5.0            # hysteresis band around both thresholds
+DEFAULT_STEADY = 2.0            # max health change per sample that still counts as steady
+DEFAULT_SETTLE = 30.0           # seconds of calm before leaving fast sampling
+DEFAULT_STABLE = 60.0           # seconds of high, steady health before slowing down
+
+# Chooses the sampling interval from the health score and the alerts of each sample
+class AdaptiveInterval:
+    # Method to initialize the controller in normal mode (fast / slow default to a fraction / multiple of normal)
+    def __init__(self, normal, fast=None, slow=None, high=DEFAULT_HIGH, low=DEFAULT_LOW, drop=DEFAULT_DROP,
+                 margin=DEFAULT_MARGIN, steady=DEFAULT_STEADY, settle=DEFAULT_SETTLE, stable=DEFAULT_STABLE):
+        fast = normal * FAST_FACTOR if fast is None else fast
+        slow = normal * SLOW_FACTOR if slow is None else slow
+        if not 0 < fast <= normal <= slow:
+            raise ValueError("adaptive intervals must satisfy 0 < fast <= normal <= slow")
+        if not 0 <= low < high <= 100:
+            raise ValueError("adaptive thresholds must satisfy 0 <= low < high <= 100")
+        self.intervals = {"fast": fast, "normal": normal, "slow": slow}
+        self.high = high
+        self.low = low
+        self.drop = drop
+        self.margin = margin
+        self.steady = steady
+        self.settle = settle
+        self.stable = stable
+        self.mode = "normal"
+        self.switches = {mode: 0 for mode in MODES}   # times each mode was entered
+        self._held = 0.0                              # seconds the exit condition of the current mode has held
+        self._last = None
+        self._primed = False                          # the first sample has been seen
+
+    # Method to return the interval in effect
+    @property
+    def interval(self):
+        return self.intervals[self.mode]
+
+    # Method to return the interval relative to normal (collector periods are scaled by it)
+    @property
+    def scale(self):
+        return self.interval / self.intervals["normal"]
+
+    # Method to feed one sample's health and anomaly.Alert list; returns True when the mode (and so the interval) changed
+    def update(self, health, alerts=None):
+        elapsed = self.interval
+        firing = any(alert.state == "firing" for alert in alerts or ())
+        if not self._primed:
+            # the first CPU reading after priming can be 0 or 100 %: only an alert may switch on it
+            self._primed = True
+            return self._switch("fast") if firing else False
+        change = 0.0 if self._last is None else health - self._last
+        self._last = health
+        if firing or health < self.low or -change >= self.drop:
+            return self._switch("fast")
+        if self.mode == "fast":
+            return self._hold(health >= self.low + self.margin, elapsed, self.settle, "normal")
+        if self.mode == "slow":
+            return self._switch("normal") if health < self.high - self.margin else False
+        return self._hold(health >= self.high and abs(change) <= self.steady, elapsed, self.stable, "slow")
+
+    # Method to return the controller state for JSON output
+    def summary(self):
+        return {"mode": self.mode, "interval": self.interval, "switches": dict(self.switches)}
+
+    # Method to count time while `condition` holds and switch to `mode` once it has held for `needed` seconds
+    def _hold(self, condition, elapsed, needed, mode):
+        self._held = self._held + elapsed if condition else 0.0
+        return self._switch(mode) if self._held >= needed else False
+
+    # Method to enter a mode (the hold timer restarts); returns True if it was a change
+    def _switch(self, mode):
+        self._held = 0.0
+        if mode == self.mode:
+            return False
+        self.mode = mode
+        self.switches[mode] += 1
+        return True
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+# =======================================================================================================================================================================
+#  File        : agent.py
+#  Author      : Ionescu Robert-Constantin
+#  Date        : 2025-11-19
+#  Version     : 1.0
+#  Description : Agent / collector mode for sysmon_cli - agents send compact binary samples over UDP or a Unix datagram socket, one collector merges them.
+# =======================================================================================================================================================================
+#  Usage       : python3 sysmon_cli.py --agent udp://collector:9200          (on every target)
+#                python3 sysmon_cli.py collect --listen udp://0.0.0.0:9200   (on the aggregator)
+# =======================================================================================================================================================================
+
+import asyncio
+import os
+import socket
+import struct
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+from rich.table import Table
+
+from csvlog import CsvLogger, AGENT_LOG_HEADER
+from liveview import LiveView
+from ndjson import NdjsonWriter
+from ringbuffer import RingBuffer
+
+# =======================================================================================================================================================================
+# TO DO SECTION / Development Steps / Requirements
+# =======================================================================================================================================================================
+
+# TODO - STEP1 - Pack one sample into a fixed 54-byte datagram header plus the source name (no JSON on the wire)
+# TODO - STEP2 - Agents send with a non-blocking datagram socket - a missing collector never slows the monitor down
+# TODO - STEP3 - The collector receives on one asyncio datagram endpoint (UDP or Unix socket), hundreds of agents on one core
+# TODO - STEP4 - Keep a ring buffer, last-seen time and sequence-gap (lost / reordered) counters per source
+# TODO - STEP6 - Every agent run sends a random boot id; a new one resets the sequence tracking (a lost first datagram cannot hide a restart)
+# TODO - STEP5 - Merge all sources into one table, NDJSON stream or CSV log; mark sources that stopped sending as stale
+
+# =======================================================================================================================================================================
+# Constants / Variables / Classes
+# =======================================================================================================================================================================
+
+MAGIC = b"SYSA"
+VERSION = 2
+# magic, version, source name length, boot id, sequence, timestamp, cpu, mem, disk, health, net_sent (KB), net_recv (KB)
+PACKET = struct.Struct("<4sBBIIdffffQQ")
+MAX_SOURCE = 255
+SEQ_MOD = 1 << 32
+SOURCE_FIELDS = ("cpu", "mem", "disk", "health")
+DEFAULT_LISTEN = "udp://0.0.0.0:9200"
+RECEIVE_BUFFER = 1 << 20      # absorbs bursts when hundreds of agents tick at the same moment
+
+@dataclass
+class AgentSample:
+    source: str
+    seq: int
+    boot: int                   # random per agent run - changes when the agent restarts
+    timestamp: float
+    cpu: float
+    mem: float
+    disk: float
+    health: float
+    net_sent: int
+    net_recv: int
+
+# Per-source state kept by the collector
+class SourceState:
+    __slots__ = ("source", "address", "latest", "last_seen", "received", "lost", "reordered", "restarts", "previous_boot", "buffer")
+
+    # Method to initialize the state and the source's ring buffer
+    def __init__(self, source, capacity):
+        self.source = source
+        self.address = None
+        self.latest = None
+        self.last_seen = 0.0
+        self.received = 0
+        self.lost = 0
+        self.reordered = 0
+        self.restarts = 0
+        self.previous_boot = None
+        self.buffer = RingBuffer(capacity, SOURCE_FIELDS)
+
+# Sends this monitor's samples to a collector
+class AgentSender:
+    # Method to open a non-blocking datagram socket towards the collector
+    def __init__(self, address, source=None):
+        family, self.target = resolve_endpoint(address)
+        self.kind = "unix" if family == socket.AF_UNIX else "udp"
+        self.source = (source or socket.gethostname()).encode()[:MAX_SOURCE]
+        self.seq = 0
+        self.boot = int.from_bytes(os.urandom(4), "little")
+        self.sent = 0
+        self.errors = 0
+        self._sock = socket.socket(family, socket.SOCK_DGRAM)
+        self._sock.setblocking(False)
+
+    # Method to send one sample; failures (collector down, full buffer) are counted and dropped, never retried
+    def send(self, stats, health, ts=None):
+        self.seq = (self.seq + 1) % SEQ_MOD
+        packet = encode_sample(self.source, self.seq, time.time() if ts is None else ts,
+                               stats.cpu, stats.mem, stats.disk, health, stats.net_sent, stats.net_recv, self.boot)
+        try:
+            self._sock.sendto(packet, self.target)
+            self.sent += 1
+        except OSError:
+            self.errors += 1
+
+    # Method to close the socket
+    def close(self):
+        self._sock.close()
+
+# Merges the samples of many agents
+class Aggregator:
+    # Method to initialize the aggregator; capacity is the ring buffer length per source
+    def __init__(self, capacity=60, stale_after=5.0, clock=time.monotonic):
+        self.capacity = capacity
+        self.stale_after = stale_after
+        self.clock = clock
+        self.states = {}
+        self.invalid = 0
+
+    # Method to decode and merge one datagram - returns the sample, or None if it was invalid or out of order
+    def ingest(self, data, address=None):
+        try:
+            sample = decode_sample(data)
+        except ValueError:
+            self.invalid += 1
+            return None
+        state = self.states.get(sample.source)
+        if state is None:
+            state = self.states[sample.source] = SourceState(sample.source, self.capacity)
+        elif sample.boot != state.latest.boot:
+            if sample.boot == state.previous_boot:
+                state.reordered += 1         # late datagram from before the restart
+                return None
+            state.restarts += 1              # the agent restarted: its sequence starts over, whatever got lost on the way
+            state.previous_boot = state.latest.boot
+        else:
+            delta = (sample.seq - state.latest.seq) % SEQ_MOD
+            if delta == 0 or delta >= SEQ_MOD // 2:
+                state.reordered += 1         # duplicate or late datagram: keep the newer sample
+                return None
+            state.lost += delta - 1
+        state.address = address
+        state.latest = sample
+        state.last_seen = self.clock()
+        state.received += 1
+        state.buffer.append((sample.cpu, sample.mem, sample.disk, sample.health))
+        return sample
+
+    # Method to return True when a source has not sent anything for stale_after seconds
+    def is_stale(self, state, now=None):
+        return (self.clock() if now is None else now) - state.last_seen > self.stale_after
+
+    # Method to return all source states sorted by name
+    def sources(self):
+        return [self.states[name] for name in sorted(self.states)]
+
+# Datagram endpoint that feeds the aggregator
+class CollectorProtocol(asyncio.DatagramProtocol):
+    # Method to initialize the protocol; on_sample(sample) is called for every accepted sample
+    def __init__(self, aggregator, on_sample=None):
+        self.aggregator = aggregator
+        self.on_sample = on_sample
+
+    # Method to handle one datagram
+    def datagram_received(self, data, addr):
+        sample = self.aggregator.ingest(data, addr)
+        if sample is not None and self.on_sample:
+            self.on_sample(sample)
+
+# =======================================================================================================================================================================
+# Helper Functions
+# =======================================================================================================================================================================
+
+# Function to split an endpoint such as "udp://host:9200", "host:9200" or "unix:///run/sysmon.sock" into (kind, target)
+def parse_endpoint(text):
+    if text.startswith("unix://"):
+        return "unix", text[len("unix://"):]
+    if text.startswith("/"):
+        return "unix", text
+    if text.startswith("udp://"):
+        text = text[len("udp://"):]
+    host, sep, port = text.rpartition(":")
+    if not sep or not port.isdigit() or int(port) > 65535:
+        raise ValueError(f"invalid endpoint {text!r} (use udp://HOST:PORT, HOST:PORT or unix:///PATH)")
+    return "udp", (host.strip("[]") or "0.0.0.0", int(port))
+
+# Function to parse an endpoint and resolve its host name - (socket family, address to bind / send to)
+def resolve_endpoint(text):
+    kind, target = parse_endpoint(text)
+    if kind == "unix":
+        return socket.AF_UNIX, target
+    try:
+        family, _, _, _, address = socket.getaddrinfo(*target, type=socket.SOCK_DGRAM)[0]
+    except socket.gaierror as e:
+        raise ValueError(f"cannot resolve {target[0]!r} in endpoint {text!r}: {e.strerror}") from e
+    return family, address
+
+# Function to pack one sample into a datagram
+def encode_sample(source, seq, ts, cpu, mem, disk, health, net_sent, net_recv, boot=0):
+    if isinstance(source, str):
+        source = source.encode()[:MAX_SOURCE]
+    return PACKET.pack(MAGIC, VERSION, len(source), boot, seq, ts, cpu, mem, disk, health,
+                       max(0, int(net_sent)), max(0, int(net_recv))) + source
+
+# Function to unpack a datagram, raising ValueError when it is not a valid sample
+def decode_sample(data):
+    if len(data) < PACKET.size:
+        raise ValueError("datagram too short")
+    magic, version, length, boot, seq, ts, cpu, mem, disk, health, sent, recv = PACKET.unpack_from(data)
+    if magic != MAGIC or version != VERSION or len(data) != PACKET.size + length:
+        raise ValueError("not a sysmon agent datagram")
+    source = bytes(data[PACKET.size:]).decode(errors="replace")
+    return AgentSample(source, seq, boot, ts, round(cpu, 2), round(mem, 2), round(disk, 2), round(health, 2), sent, recv)
+
+# Function to start listening for agents on the running event loop - returns the transport
+async def listen(address, aggregator, on_sample=None):
+    loop = asyncio.get_running_loop()
+    family, target = resolve_endpoint(address)
+    if family == socket.AF_UNIX:
+        if os.path.exists(target):
+            os.unlink(target)  # left over from a previous collector
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sock.bind(target)
+    else:
+        sock = socket.socket(family, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(target)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RECEIVE_BUFFER)
+    except OSError:
+        pass
+    transport, _ = await loop.create_datagram_endpoint(lambda: CollectorProtocol(aggregator, on_sample), sock=sock)
+    return transport
+
+# Function to build the JSON object / CSV row for one received sample
+def sample_record(sample):
+    return {"timestamp": datetime.fromtimestamp(sample.timestamp).isoformat(), "source": sample.source,
+            "seq": sample.seq, "cpu": sample.cpu, "mem": sample.mem, "disk": sample.disk, "health": sample.health,
+            "net_sent_kb": sample.net_sent, "net_recv_kb": sample.net_recv}
+
+# Function to build the merged table of all sources
+def source_table(aggregator, now=None):
+    now = aggregator.clock() if now is None else now
+    table = Table(title=f"sysmon collector - {len(aggregator.states)} sources", show_lines=False)
+    table.add_column("Source", style="cyan", no_wrap=True)
+    for column in ("CPU (%)", "Mem (%)", "Disk (%)", "Health", "CPU min / mean / max", "Sent (KB)", "Recv (KB)", "Age (s)", "Lost"):
+        table.add_column(column, justify="right", style="magenta")
+    for state in aggregator.sources():
+        sample = state.latest
+        window = state.buffer.summary()
+        low, mean, high = window["cpu"]
+        age = now - state.last_seen
+        name = f"[red]{state.source} (stale)[/red]" if aggregator.is_stale(state, now) else state.source
+        health = f"[green]{sample.health:.1f}[/green]" if sample.health > 70 else (
+            f"[yellow]{sample.health:.1f}[/yellow]" if sample.health > 40 else f"[red]{sample.health:.1f}[/red]")
+        table.add_row(name, f"{sample.cpu:.1f}", f"{sample.mem:.1f}", f"{sample.disk:.1f}", health,
+                      f"{low:.1f} / {mean:.1f} / {high:.1f}", str(sample.net_sent), str(sample.net_recv),
+                      f"{age:.1f}", str(state.lost))
+    return table
+
+# Function to run the collector until max_runtime (or Ctrl+C): merge agents into a table, NDJSON stream and / or CSV log
+async def collect(address, console, interval=1.0, stale_after=5.0, capacity=60, stream=None, logger=None, view=None,
+                  max_runtime=None):
+    aggregator = Aggregator(capacity, stale_after)
+
+    def on_sample(sample):
+        if not (stream or logger):
+            return
+        record = sample_record(sample)
+        if stream:
+            stream.write(record)
+        if logger:
+            logger.write([record["timestamp"], sample.source, sample.cpu, sample.mem, sample.disk, sample.health,
+                          sample.net_sent, sample.net_recv])
+
+    transport = await listen(address, aggregator, on_sample)
+    console.print(f"[bold green]Collecting agent samples on[/bold green] {address}")
+    loop = asyncio.get_running_loop()
+    start = next_time = loop.time()
+    try:
+        while max_runtime is None or loop.time() - start < max_runtime:
+            if stream:
+                stream.flush()
+                if stream.broken:
+                    break
+            elif aggregator.states:
+                table = source_table(aggregator)
+                if view:
+                    if view.due():
+                        view.update(table)
+                else:
+                    console.clear()
+                    console.print(table)
+            next_time += interval
+            await asyncio.sleep(max(0.0, next_time - loop.time()))
+    finally:
+        transport.close()
+        if view:
+            view.close()
+        kind, target = parse_endpoint(address)
+        if kind == "unix" and os.path.exists(target):
+            os.unlink(target)
+    return aggregator
+
+# Function to run the `collect` subcommand
+def run(args, console):
+    stream = NdjsonWriter(flush_lines=args.ndjson_flush_lines) if args.ndjson else None
+    if stream:
+        console.stderr = True
+    logger = CsvLogger(args.log, header=AGENT_LOG_HEADER) if args.log else None
+    view = LiveView(console) if args.live and not stream else None
+    try:
+        asyncio.run(collect(args.listen, console, args.interval, args.stale_after, args.history, stream, logger, view,
+                            args.max_runtime))
+    finally:
+        if stream:
+            stream.close()
+        if logger:
+            logger.close()
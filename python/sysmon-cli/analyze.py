@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+# =======================================================================================================================================================================
+#  File        : analyze.py
+#  Author      : Ionescu Robert-Constantin
+#  Date        : 2025-11-07
+#  Version     : 1.0
+#  Description : Offline analysis of sysmon_cli logs - streams CSV / gzip / binary logs in chunks and computes per-window statistics with vectorized NumPy math.
+# =======================================================================================================================================================================
+#  Usage       : python3 sysmon_cli.py analyze system_log.csv [--window 60] [--output windows.csv]
+# =======================================================================================================================================================================
+
+import csv
+import gzip
+import json
+import sys
+from datetime import datetime, timedelta
+from itertools import islice
+
+import numpy as np
+from rich.table import Table
+
+from binlog import open_binary_log, is_binary_log
+
+# =======================================================================================================================================================================
+# TO DO SECTION / Development Steps / Requirements
+# =======================================================================================================================================================================
+
+# TODO - STEP1 - Stream CSV (plain or gzip-rotated) and binary logs in fixed-size chunks, never loading a whole file
+# TODO - STEP2 - Parse each CSV chunk with NumPy's C-level loadtxt instead of per-row Python (per-row fallback only for damaged chunks)
+# TODO - STEP3 - Group rows into time windows and compute min / max / mean / p50 / p95 / p99 per window with reduceat + lexsort
+# TODO - STEP4 - Carry the last (possibly incomplete) window over to the next chunk so memory stays bounded by the window size
+# TODO - STEP5 - Keep whole-run health summaries in fixed-size histograms (0.1 % resolution) - constant memory for any file size
+# TODO - STEP6 - Write per-window rows as CSV and print a summary table (or JSON)
+
+# =======================================================================================================================================================================
+# Constants / Variables / Classes
+# =======================================================================================================================================================================
+
+METRICS = ("cpu", "mem", "disk", "health")
+PERCENTILES = (50, 95, 99)
+STATS = ("min", "max", "mean") + tuple(f"p{q}" for q in PERCENTILES)
+DEFAULT_CHUNK_ROWS = 100_000
+HISTOGRAM_BINS = 1001           # 0.0 .. 100.0 in 0.1 steps
+HEALTH_CRITICAL = 40            # same color thresholds as display()
+HEALTH_WARNING = 70
+
+# Streaming per-window aggregator; memory is bounded by one window plus one chunk
+class WindowAggregator:
+    # Method to initialize the aggregator for a window length in seconds
+    def __init__(self, window, metrics=METRICS):
+        if window <= 0:
+            raise ValueError("window must be positive")
+        self.window = window
+        self.metrics = tuple(metrics)
+        self.rows = 0
+        self.first_ts = None
+        self.last_ts = None
+        self._carry_ts = np.empty(0)
+        self._carry_values = np.empty((0, len(self.metrics)))
+        self._count = np.zeros(len(self.metrics), dtype=np.int64)
+        self._sum = np.zeros(len(self.metrics))
+        self._min = np.full(len(self.metrics), np.inf)
+        self._max = np.full(len(self.metrics), -np.inf)
+        self._hist = np.zeros((len(self.metrics), HISTOGRAM_BINS), dtype=np.int64)
+        self._worst_window = None
+
+    # Method to add one chunk (timestamps in seconds, values shaped rows x metrics); returns the completed windows
+    def feed(self, ts, values):
+        if len(ts) == 0:
+            return None
+        self._update_totals(ts, values)
+        ts = np.concatenate([self._carry_ts, ts])
+        values = np.concatenate([self._carry_values, values])
+        starts = window_starts(ts, self.window)
+        last = starts[-1]
+        self._carry_ts, self._carry_values = ts[last:], values[last:]
+        if last == 0:
+            return None
+        return self._aggregate(ts[:last], values[:last], starts[:-1])
+
+    # Method to emit the final (carried) window
+    def finish(self):
+        ts, values = self._carry_ts, self._carry_values
+        self._carry_ts, self._carry_values = ts[:0], values[:0]
+        if len(ts) == 0:
+            return None
+        return self._aggregate(ts, values, window_starts(ts, self.window))
+
+    # Method to compute all statistics for a block of complete windows
+    def _aggregate(self, ts, values, starts):
+        counts = np.diff(np.append(starts, len(ts)))
+        result = {
+            "window_start": np.floor(ts[starts] / self.window) * self.window,
+            "samples": counts,
+        }
+        run_ids = np.repeat(np.arange(len(starts)), counts)
+        for i, metric in enumerate(self.metrics):
+            column = values[:, i]
+            result[f"{metric}_min"] = np.minimum.reduceat(column, starts)
+            result[f"{metric}_max"] = np.maximum.reduceat(column, starts)
+            result[f"{metric}_mean"] = np.add.reduceat(column, starts) / counts
+            ordered = column[np.lexsort((column, run_ids))]
+            for q in PERCENTILES:
+                result[f"{metric}_p{q}"] = sorted_percentile(ordered, starts, counts, q)
+        self._track_worst(result)
+        return result
+
+    # Method to update whole-run counters and histograms
+    def _update_totals(self, ts, values):
+        self.rows += len(ts)
+        if self.first_ts is None:
+            self.first_ts = float(ts[0])
+        self.last_ts = float(ts[-1])
+        self._count += len(ts)
+        self._sum += values.sum(axis=0)
+        self._min = np.minimum(self._min, values.min(axis=0))
+        self._max = np.maximum(self._max, values.max(axis=0))
+        bins = np.clip(np.rint(values * 10), 0, HISTOGRAM_BINS - 1).astype(np.int64)
+        for i in range(len(self.metrics)):
+            self._hist[i] += np.bincount(bins[:, i], minlength=HISTOGRAM_BINS)
+
+    # Method to remember the window with the lowest mean health
+    def _track_worst(self, result):
+        if "health_mean" not in result:
+            return
+        i = int(np.argmin(result["health_mean"]))
+        value = float(result["health_mean"][i])
+        if self._worst_window is None or value < self._worst_window[1]:
+            self._worst_window = (float(result["window_start"][i]), value)
+
+    # Method to build the whole-run summary (percentiles from the histograms, 0.1 % resolution)
+    def summary(self):
+        metrics = {}
+        for i, metric in enumerate(self.metrics):
+            count = int(self._count[i])
+            if count == 0:
+                continue
+            cumulative = np.cumsum(self._hist[i])
+            entry = {
+                "min": float(self._min[i]),
+                "max": float(self._max[i]),
+                "mean": float(self._sum[i] / count),
+            }
+            for q in PERCENTILES:
+                entry[f"p{q}"] = float(np.searchsorted(cumulative, q / 100 * count)) / 10
+            metrics[metric] = entry
+
+        result = {"rows": self.rows, "window": self.window, "metrics": metrics}
+        if self.first_ts is not None:
+            result["start"] = format_ts(self.first_ts)
+            result["end"] = format_ts(self.last_ts)
+        if "health" in self.metrics and self.rows:
+            hist = self._hist[self.metrics.index("health")]
+            critical = int(hist[:HEALTH_CRITICAL * 10 + 1].sum())
+            warning = int(hist[HEALTH_CRITICAL * 10 + 1:HEALTH_WARNING * 10 + 1].sum())
+            result["health"] = {
+                "critical_pct": critical / self.rows * 100,
+                "warning_pct": warning / self.rows * 100,
+                "ok_pct": (self.rows - critical - warning) / self.rows * 100,
+            }
+            if self._worst_window is not None:
+                result["health"]["worst_window"] = format_ts(self._worst_window[0])
+                result["health"]["worst_window_mean"] = self._worst_window[1]
+        return result
+
+# =======================================================================================================================================================================
+# Helper Functions
+# =======================================================================================================================================================================
+
+# Function to find the index where each run of same-window rows begins
+def window_starts(ts, window):
+    ids = np.floor(ts / window)
+    return np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+
+# Function to take the q-th percentile of each run in an array sorted by (run, value) - linear interpolation like np.percentile
+def sorted_percentile(ordered, starts, counts, q):
+    pos = starts + (counts - 1) * (q / 100)
+    low = np.floor(pos).astype(np.int64)
+    high = np.ceil(pos).astype(np.int64)
+    return ordered[low] + (ordered[high] - ordered[low]) * (pos - low)
+
+# Function to format wall-clock seconds (naive, as written by the logger) as an ISO timestamp
+def format_ts(seconds):
+    return (datetime(1970, 1, 1) + timedelta(seconds=float(seconds))).isoformat(sep=" ")
+
+# Function to stream (timestamps, values) chunks from a CSV log (plain or .gz)
+def iter_csv_chunks(path, metrics=METRICS, chunk_rows=DEFAULT_CHUNK_ROWS):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", newline="") as f:
+        header = f.readline().strip().split(",")
+        try:
+            columns = [header.index(metric) for metric in metrics]
+        except ValueError:
+            raise ValueError(f"{path}: not a sysmon log (missing {' / '.join(metrics)} columns)") from None
+        while True:
+            lines = list(islice(f, chunk_rows))
+            if not lines:
+                break
+            stamps, values = parse_csv_lines(lines, len(header), columns)
+            if len(stamps) == 0:
+                continue
+            yield stamps.astype(np.int64) / 1e6, values
+
+# Function to parse CSV lines into (datetime64 timestamps, float matrix) - one C-level loadtxt pass, per-row fallback for odd lines
+def parse_csv_lines(lines, width, columns):
+    dtype = [("timestamp", "datetime64[us]")] + [(f"c{c}", np.float64) for c in columns]
+    try:
+        table = np.loadtxt(lines, delimiter=",", usecols=[0] + columns, dtype=dtype, ndmin=1)
+        return table["timestamp"], np.column_stack([table[f"c{c}"] for c in columns])
+    except ValueError:
+        rows = parse_csv_rows(lines, width)
+        stamps = np.array([row[0] for row in rows], dtype="datetime64[us]")
+        values = np.array([[float(row[c]) for c in columns] for row in rows], dtype=np.float64).reshape(-1, len(columns))
+        return stamps, values
+
+# Function to parse CSV lines one by one, skipping headers and malformed rows
+def parse_csv_rows(lines, width):
+    rows = []
+    for row in csv.reader(lines):
+        if len(row) != width or row[0] == "timestamp":
+            continue
+        try:
+            [float(cell) for cell in row[1:]]
+            np.datetime64(row[0])
+        except ValueError:
+            continue
+        rows.append(row)
+    return rows
+
+# Function to stream (timestamps, values) chunks from a binary log - slices of the memory map
+def iter_binary_chunks(path, metrics=METRICS, chunk_rows=DEFAULT_CHUNK_ROWS):
+    log = open_binary_log(path)
+    if len(log) == 0:
+        return
+    # binary timestamps are epoch seconds; shift them to local wall-clock time like the CSV timestamps
+    first = float(log["timestamp"][0])
+    offset = datetime.fromtimestamp(first).astimezone().utcoffset().total_seconds()
+    for start in range(0, len(log), chunk_rows):
+        block = log.records[start:start + chunk_rows]
+        ts = block["timestamp"] + offset
+        yield ts, np.column_stack([block[metric].astype(np.float64) for metric in metrics])
+
+# Function to stream chunks from a log of either format
+def iter_log_chunks(path, metrics=METRICS, chunk_rows=DEFAULT_CHUNK_ROWS):
+    if not path.endswith(".gz") and is_binary_log(path):
+        return iter_binary_chunks(path, metrics, chunk_rows)
+    return iter_csv_chunks(path, metrics, chunk_rows)
+
+# Function to write one block of window results as CSV rows
+def write_windows(writer, result, metrics=METRICS):
+    columns = [[format_ts(ts) for ts in result["window_start"]], result["samples"].tolist()]
+    for metric in metrics:
+        for stat in STATS:
+            columns.append(np.round(result[f"{metric}_{stat}"], 2).tolist())
+    writer.writerows(zip(*columns))
+
+# Function to analyze one or more logs (e.g. rotated segments, in order) as a single stream
+def analyze_logs(paths, window=60, output=None, chunk_rows=DEFAULT_CHUNK_ROWS, metrics=METRICS):
+    aggregator = WindowAggregator(window, metrics)
+    writer = None
+    if output is not None:
+        writer = csv.writer(output)
+        writer.writerow(["window_start", "samples"] + [f"{m}_{s}" for m in metrics for s in STATS])
+    for path in paths:
+        for ts, values in iter_log_chunks(path, metrics, chunk_rows):
+            result = aggregator.feed(ts, values)
+            if result is not None and writer is not None:
+                write_windows(writer, result, metrics)
+    result = aggregator.finish()
+    if result is not None and writer is not None:
+        write_windows(writer, result, metrics)
+    return aggregator.summary()
+
+# Function to print the run summary as a rich table
+def print_summary(summary, console):
+    table = Table(title=f"Log Summary ({summary['rows']} samples, {summary['window']}s windows)", show_lines=True)
+    table.add_column("Metric", style="cyan", no_wrap=True)
+    for stat in STATS:
+        table.add_column(stat, style="magenta", justify="right")
+    for metric, entry in summary["metrics"].items():
+        table.add_row(metric, *(f"{entry[stat]:.1f}" for stat in STATS))
+    console.print(table)
+
+    if "start" in summary:
+        console.print(f"[bold]Period:[/bold] {summary['start']} → {summary['end']}")
+    health = summary.get("health")
+    if health:
+        console.print(f"[bold]Health:[/bold] [green]{health['ok_pct']:.1f}% ok[/green], "
+                      f"[yellow]{health['warning_pct']:.1f}% warning[/yellow], "
+                      f"[red]{health['critical_pct']:.1f}% critical[/red]")
+        if "worst_window" in health:
+            console.print(f"[bold]Worst window:[/bold] {health['worst_window']} "
+                          f"(mean health {health['worst_window_mean']:.1f})")
+
+# Function to run the analyze subcommand from parsed arguments
+def run(args, console):
+    output = None
+    if args.output == "-":
+        output = sys.stdout
+    elif args.output:
+        output = open(args.output, "w", newline="")
+    try:
+        summary = analyze_logs(args.files, args.window, output, args.chunk_rows)
+    finally:
+        if output is not None and output is not sys.stdout:
+            output.close()
+    # with --output - stdout carries only the CSV windows; the summary goes to stderr
+    if args.json:
+        print(json.dumps(summary), file=sys.stderr if output is sys.stdout else sys.stdout)
+    else:
+        if output is sys.stdout:
+            console.stderr = True
+        print_summary(summary, console)
+    return summary
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# =======================================================================================================================================================================
+#  File        : anomaly.py
+#  Author      : Ionescu Robert-Constantin
+#  Date        : 2025-11-20
+#  Version     : 1.0
+#  Description : Streaming anomaly detection for sysmon_cli - EWMA z-scores and rate-of-change detectors (O(1) per sample) with pluggable alert hooks.
+# =======================================================================================================================================================================
+#  Usage       : from anomaly import AnomalyDetector, AlertDispatcher, parse_hook
+# =======================================================================================================================================================================
+
+import json
+import math
+import os
+import queue
+import subprocess
+import threading
+import time
+import urllib.request
+from dataclasses import dataclass, asdict
+from datetime import datetime
+
+# =======================================================================================================================================================================
+# TO DO SECTION / Development Steps / Requirements
+# =======================================================================================================================================================================
+
+# TODO - STEP1 - EWMA mean / variance per metric, z-score of each new sample against the state before it (constant memory)
+# TODO - STEP2 - Rate-of-change detector (units per second) on monotonic time
+# TODO - STEP3 - Hysteresis: fire when the score crosses the trigger level, resolve only below the lower clear level
+# TODO - STEP4 - Cooldown: a metric / detector pair fires at most once per cooldown period
+# TODO - STEP5 - Alert hooks (exec command, webhook, append to file) run on a background thread - the monitor loop only enqueues
+
+# =======================================================================================================================================================================
+# Constants / Variables / Classes
+# =======================================================================================================================================================================
+
+DEFAULT_METRICS = ("cpu", "mem", "disk", "health")
+# Rate-of-change trigger levels in percentage points (health: score points) per second
+DEFAULT_RATE_LIMITS = {"cpu": 25.0, "mem": 5.0, "disk": 1.0, "health": 15.0}
+HOOK_QUEUE_SIZE = 256
+HOOK_TIMEOUT = 10.0
+
+@dataclass
+class Alert:
+    metric: str
+    detector: str           # "zscore" or "rate"
+    state: str              # "firing" or "resolved"
+    value: float
+    score: float            # z-score, or rate per second
+    timestamp: str
+    message: str
+
+# Trigger / clear levels with hysteresis and a cooldown between firings
+class Hysteresis:
+    __slots__ = ("trigger", "clear", "cooldown", "active", "notified", "last_fired")
+
+    # Method to initialize the levels (clear defaults to half the trigger level)
+    def __init__(self, trigger, clear=None, cooldown=60.0):
+        self.trigger = trigger
+        self.clear = trigger / 2 if clear is None else clear
+        self.cooldown = cooldown
+        self.active = False
+        self.notified = False
+        self.last_fired = None
+
+    # Method to feed one absolute score - returns "firing", "resolved" or None
+    def update(self, score, now):
+        if not self.active:
+            if score >= self.trigger:
+                self.active = True
+                self.notified = self.last_fired is None or now - self.last_fired >= self.cooldown
+                if self.notified:
+                    self.last_fired = now
+                    return "firing"
+            return None
+        if score < self.clear:
+            self.active = False
+            if self.notified:  # episodes suppressed by the cooldown resolve silently too
+                return "resolved"
+        return None
+
+# Exponentially weighted mean / variance with a z-score per sample
+class EwmaDetector:
+    __slots__ = ("alpha", "warmup", "mean", "var", "count", "level")
+
+    # Method to initialize the detector; the first `warmup` samples only train the mean / variance
+    def __init__(self, alpha=0.1, threshold=3.0, warmup=10, cooldown=60.0):
+        self.alpha = alpha
+        self.warmup = warmup
+        self.mean = 0.0
+        self.var = 0.0
+        self.count = 0
+        self.level = Hysteresis(threshold, threshold * 2 / 3, cooldown)
+
+    # Method to score one sample against the state before it, then fold it in - returns (z, transition)
+    def update(self, value, now):
+        self.count += 1
+        if self.count == 1:
+            self.mean = value
+            return 0.0, None
+        diff = value - self.mean
+        std = math.sqrt(self.var)
+        z = diff / std if std > 1e-9 else 0.0
+        increment = self.alpha * diff
+        self.mean += increment
+        self.var = (1 - self.alpha) * (self.var + diff * increment)
+        if self.count <= self.warmup:
+            return z, None
+        return z, self.level.update(abs(z), now)
+
+# Rate-of-change detector on monotonic time
+class RateDetector:
+    __slots__ = ("previous", "previous_time", "level")
+
+    # Method to initialize the detector with a trigger level in units per second
+    def __init__(self, limit, cooldown=60.0):
+        self.previous = None
+        self.previous_time = None
+        self.level = Hysteresis(limit, limit / 2, cooldown)
+
+    # Method to feed one sample - returns (rate, transition)
+    def update(self, value, now):
+        previous, previous_time = self.previous, self.previous_time
+        self.previous, self.previous_time = value, now
+        if previous is None or now <= previous_time:
+            return 0.0, None
+        rate = (value - previous) / (now - previous_time)
+        return rate, self.level.update(abs(rate), now)
+
+# Per-metric EWMA and rate detectors
+class AnomalyDetector:
+    # Method to create one detector pair per metric
+    def __init__(self, metrics=DEFAULT_METRICS, alpha=0.1, threshold=3.0, warmup=10, cooldown=60.0, rate_limits=None,
+                 clock=time.monotonic):
+        limits = {**DEFAULT_RATE_LIMITS, **(rate_limits or {})}
+        self.clock = clock
+        self.detectors = {
+            metric: (EwmaDetector(alpha, threshold, warmup, cooldown),
+                     RateDetector(limits[metric], cooldown) if limits.get(metric) else None)
+            for metric in metrics
+        }
+        self.active = set()      # (metric, detector) pairs currently firing
+
+    # Method to feed one sample ({metric: value}) and return the alerts it triggered or resolved; timestamp (epoch) defaults to now
+    def check(self, values, timestamp=None):
+        now = self.clock()
+        stamp = (datetime.now() if timestamp is None else datetime.fromtimestamp(timestamp)).isoformat()
+        alerts = []
+        for metric, (ewma, rate) in self.detectors.items():
+            value = values.get(metric)
+            if value is None:
+                continue
+            z, transition = ewma.update(value, now)
+            if transition:
+                alerts.append(self._alert(metric, "zscore", transition, value, z, stamp,
+                                          f"{metric} {value:.1f} is {z:+.1f} sigma from its moving average {ewma.mean:.1f}"))
+            if rate is not None:
+                per_second, transition = rate.update(value, now)
+                if transition:
+                    alerts.append(self._alert(metric, "rate", transition, value, per_second, stamp,
+                                              f"{metric} changing at {per_second:+.1f}/s (now {value:.1f})"))
+        return alerts
+
+    # Method to build an alert and track which ones are active
+    def _alert(self, metric, detector, state, value, score, stamp, message):
+        key = (metric, detector)
+        if state == "firing":
+            self.active.add(key)
+        else:
+            self.active.discard(key)
+            message = f"{metric} back to normal ({value:.1f})"
+        return Alert(metric, detector, state, round(value, 2), round(score, 2), stamp, message)
+
+# Runs alert hooks on one background thread so slow hooks never block the monitor
+class AlertDispatcher:
+    # Method to start the worker thread
+    def __init__(self, hooks):
+        self.hooks = list(hooks)
+        self.dropped = 0
+        self.errors = 0
+        self._queue = queue.Queue(HOOK_QUEUE_SIZE)
+        self._thread = threading.Thread(target=self._run, name="sysmon-alerts", daemon=True)
+        self._thread.start()
+
+    # Method to queue alerts for the hooks (dropped, and counted, if the queue is full)
+    def dispatch(self, alerts):
+        for alert in alerts:
+            try:
+                self._queue.put_nowait(alert)
+            except queue.Full:
+                self.dropped += 1
+
+    # Method to deliver the queued alerts and stop the worker
+    def close(self, timeout=HOOK_TIMEOUT):
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    # Method to call every hook for every alert
+    def _run(self):
+        while True:
+            alert = self._queue.get()
+            if alert is None:
+                return
+            for hook in self.hooks:
+                try:
+                    hook(alert)
+                except Exception:
+                    self.errors += 1
+
+# Hook that runs a shell command with the alert as JSON on stdin and SYSMON_ALERT_* environment variables
+class ExecHook:
+    # Method to store the command
+    def __init__(self, command, timeout=HOOK_TIMEOUT):
+        self.command = command
+        self.timeout = timeout
+
+    # Method to run the command for one alert
+    def __call__(self, alert):
+        env = {f"SYSMON_ALERT_{key.upper()}": str(value) for key, value in asdict(alert).items()}
+        subprocess.run(self.command, shell=True, input=alert_json(alert), timeout=self.timeout, check=False,
+                       env={**os.environ, **env}, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+# Hook that POSTs the alert as JSON to a URL
+class WebhookHook:
+    # Method to store the URL
+    def __init__(self, url, timeout=HOOK_TIMEOUT):
+        self.url = url
+        self.timeout = timeout
+
+    # Method to send one alert
+    def __call__(self, alert):
+        request = urllib.request.Request(self.url, data=alert_json(alert), method="POST",
+                                         headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+# Hook that appends the alert as one JSON line to a file
+class FileHook:
+    # Method to store the path
+    def __init__(self, path):
+        self.path = path
+
+    # Method to append one alert
+    def __call__(self, alert):
+        with open(self.path, "ab") as f:
+            f.write(alert_json(alert) + b"\n")
+
+# =======================================================================================================================================================================
+# Helper Functions
+# =======================================================================================================================================================================
+
+# Function to serialize an alert as compact JSON bytes
+def alert_json(alert):
+    return json.dumps(asdict(alert), separators=(",", ":")).encode()
+
+# Function to build a hook from a spec: "exec:COMMAND", "http(s)://URL" or "file:PATH"
+def parse_hook(spec):
+    if spec.startswith("exec:"):
+        return ExecHook(spec[len("exec:"):])
+    if spec.startswith(("http://", "https://")):
+        return WebhookHook(spec)
+    if spec.startswith("file:"):
+        return FileHook(spec[len("file:"):])
+    raise ValueError(f"unknown alert hook {spec!r} (use exec:COMMAND, http://URL or file:PATH)")
+
+# Function to parse "metric=limit" rate-of-change overrides
+def parse_rate_limits(specs):
+    limits = {}
+    for spec in specs or []:
+        metric, _, limit = spec.partition("=")
+        try:
+            value = float(limit)
+        except ValueError:
+            value = 0.0                     # not a number: rejected below with the same message
+        if metric not in DEFAULT_RATE_LIMITS or not value > 0:
+            raise ValueError(f"invalid rate limit {spec!r} (use e.g. cpu=25 with one of {', '.join(DEFAULT_RATE_LIMITS)})")
+        limits[metric] = value
+    return limits
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# =======================================================================================================================================================================
+#  File        : binlog.py
+#  Author      : Ionescu Robert-Constantin
+#  Date        : 2025-11-06
+#  Version     : 1.0
+#  Description : Compact fixed-width binary log format for sysmon_cli, with a memory-mapped reader exposing zero-copy NumPy columns.
+# =======================================================================================================================================================================
+#  Usage       : from binlog import BinaryLogger, open_binary_log
+# =======================================================================================================================================================================
+
+import os
+import struct
+import time
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed by the reader
+    np = None
+
+# =======================================================================================================================================================================
+# TO DO SECTION / Development Steps / Requirements
+# =======================================================================================================================================================================
+
+# TODO - STEP1 - Define a small fixed header (magic, version, record size, field count) padded to 64 bytes
+# TODO - STEP2 - Define one fixed-width little-endian record: timestamp, cpu, mem, disk, health, net_sent, net_recv
+# TODO - STEP3 - Append records through a batching writer with the same flush / fsync options as the CSV logger
+# TODO - STEP4 - Validate the header and drop a torn trailing record when appending to an existing file
+# TODO - STEP5 - Memory-map the file and expose every column as a zero-copy NumPy view
+# TODO - STEP6 - Optional trailing interval field (adaptive sampling); the header's field count tells readers which layout a file uses
+
+# =======================================================================================================================================================================
+# Constants / Variables / Classes
+# =======================================================================================================================================================================
+
+MAGIC = b"SYSMONB\x00"
+VERSION = 1
+HEADER_SIZE = 64
+HEADER = struct.Struct("<8sHHH")          # magic, version, record size, field count (rest of the 64 bytes is zero padding)
+
+FIELDS = ("timestamp", "cpu", "mem", "disk", "health", "net_sent", "net_recv")
+RECORD = struct.Struct("<dffffQQ")        # epoch seconds, 4 x float32 percentages, 2 x uint64 KB counters
+RECORD_SIZE = RECORD.size                 # 40 bytes, 8-byte aligned after the 64-byte header
+RECORD_FORMATS = ("<f8", "<f4", "<f4", "<f4", "<f4", "<u8", "<u8")
+
+INTERVAL_FIELDS = FIELDS + ("interval",)
+INTERVAL_RECORD = struct.Struct("<dffffQQd")   # same record plus the sampling interval in effect (48 bytes)
+INTERVAL_FORMATS = RECORD_FORMATS + ("<f8",)
+LAYOUTS = {len(FIELDS): (FIELDS, RECORD, RECORD_FORMATS), len(INTERVAL_FIELDS): (INTERVAL_FIELDS, INTERVAL_RECORD, INTERVAL_FORMATS)}
+
+# Appends fixed-width records to a binary log, batching them in memory
+class BinaryLogger:
+    # Method to open (or create) the log and write / validate its header (interval=True adds the interval field to every record)
+    def __init__(self, path, flush_rows=100, flush_interval=10.0, fsync="rotate", interval=False):
+        self.path = path
+        self.fields, self.record, _ = LAYOUTS[len(INTERVAL_FIELDS if interval else FIELDS)]
+        self.flush_rows = max(1, flush_rows)
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self._pending = bytearray()
+        self._rows = 0
+        self._last_flush = time.monotonic()
+        self._file = open(path, "ab")
+        try:
+            self._prepare()
+        except Exception:
+            self._file.close()
+            raise
+
+    # Method to queue one record (timestamp, cpu, mem, disk, health, net_sent, net_recv[, interval])
+    def write(self, record):
+        self._pending += self.record.pack(*record)
+        self._rows += 1
+        if self._rows >= self.flush_rows or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    # Method to write pending records to disk (and fsync if the policy asks for it)
+    def flush(self):
+        if self._pending:
+            self._file.write(self._pending)
+            self._pending.clear()
+            self._rows = 0
+        self._file.flush()
+        if self.fsync == "flush":
+            os.fsync(self._file.fileno())
+        self._last_flush = time.monotonic()
+
+    # Method to flush and close the log
+    def close(self):
+        if self._file is None:
+            return
+        self.flush()
+        if self.fsync != "never":
+            os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
+
+    # Method to write the header into a new file, or check it and trim a torn record in an existing one
+    def _prepare(self):
+        size = self._file.seek(0, os.SEEK_END)
+        if size == 0:
+            self._file.write(pack_header(self.fields))
+            self._file.flush()
+            return
+        with open(self.path, "rb") as f:
+            _, _, field_count = read_header(f.read(HEADER_SIZE))
+        if field_count != len(self.fields):
+            raise ValueError(f"{self.path}: existing log has {field_count} fields, not {len(self.fields)} "
+                             f"({'with' if field_count > len(FIELDS) else 'without'} the interval field)")
+        torn = (size - HEADER_SIZE) % self.record.size
+        if torn:
+            self._file.truncate(size - torn)
+
+# Memory-mapped view of a binary log; every column is a zero-copy NumPy array
+class BinaryLog:
+    # Method to map the records that are fully written at open time (mode "r+" maps them writable)
+    def __init__(self, path, mode="r"):
+        if np is None:
+            raise ImportError("numpy is required to read binary sysmon logs")
+        self.path = path
+        with open(path, "rb") as f:
+            _, record_size, field_count = read_header(f.read(HEADER_SIZE))
+            size = f.seek(0, os.SEEK_END)
+        self.fields = LAYOUTS[field_count][0]
+        dtype = record_dtype(self.fields)
+        count = max(0, size - HEADER_SIZE) // record_size
+        if count:
+            self.records = np.memmap(path, dtype=dtype, mode=mode, offset=HEADER_SIZE, shape=(count,))
+        else:
+            self.records = np.zeros(0, dtype=dtype)
+
+    # Method to return the number of records
+    def __len__(self):
+        return len(self.records)
+
+    # Method to return one column (a view into the mapping, no copy)
+    def __getitem__(self, field):
+        return self.records[field]
+
+    # Method to return all columns as {field: array}
+    @property
+    def columns(self):
+        return {field: self.records[field] for field in self.fields}
+
+# =======================================================================================================================================================================
+# Helper Functions
+# =======================================================================================================================================================================
+
+# Function to build the NumPy structured dtype that matches the record layout of `fields`
+def record_dtype(fields=FIELDS):
+    return np.dtype(list(zip(fields, LAYOUTS[len(fields)][2])))
+
+# Function to build the 64-byte file header
+def pack_header(fields=FIELDS):
+    return HEADER.pack(MAGIC, VERSION, LAYOUTS[len(fields)][1].size, len(fields)).ljust(HEADER_SIZE, b"\x00")
+
+# Function to validate a file header, raising ValueError if it is not a compatible sysmon binary log
+def read_header(data):
+    if len(data) < HEADER_SIZE:
+        raise ValueError("file too short for a sysmon binary log header")
+    magic, version, record_size, field_count = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("not a sysmon binary log")
+    layout = LAYOUTS.get(field_count)
+    if version != VERSION or layout is None or record_size != layout[1].size:
+        raise ValueError(f"unsupported sysmon binary log (version {version}, record size {record_size})")
+    return version, record_size, field_count
+
+# Function to check whether a log file is in the binary format
+def is_binary_log(path):
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+# Function to open a binary log for reading (or in-place updates with mode="r+")
+def open_binary_log(path, mode="r"):
+    return BinaryLog(path, mode)
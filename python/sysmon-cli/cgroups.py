@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+# =======================================================================================================================================================================
+#  File        : cgroups.py
+#  Author      : Ionescu Robert-Constantin
+#  Date        : 2025-11-24
+#  Version     : 1.0
+#  Description : cgroup v2 collector for sysmon_cli - cached cgroup tree refreshed on inotify events, per-cgroup CPU / memory / IO rates and health.
+# =======================================================================================================================================================================
+#  Usage       : from cgroups import CgroupMonitor
+# =======================================================================================================================================================================
+
+import ctypes
+import ctypes.util
+import os
+import time
+from dataclasses import dataclass
+
+from health import HealthModel
+from psi import RESOURCES, parse_pressure, pressure_from, stall_score, stall_totals
+
+# =======================================================================================================================================================================
+# TO DO SECTION / Development Steps / Requirements
+# =======================================================================================================================================================================
+
+# TODO - STEP1 - Find the cgroup2 mount (pure v2 or the "unified" hierarchy of a hybrid setup) and walk the tree once
+# TODO - STEP2 - Watch every cgroup directory with inotify (mkdir / rmdir) and rescan only when something changed;
+#                fall back to the descendant counters in the root cgroup.stat when inotify is unavailable
+# TODO - STEP3 - Per tick read cpu.stat, memory.current, memory.max and io.stat of every tracked cgroup (open / read / close, no fd pressure)
+# TODO - STEP4 - Turn counters into rates on monotonic time: CPU cores and % of the cgroup's CPU limit, IO bytes/s and IOPS, throttled periods
+# TODO - STEP5 - Score every cgroup with the health model (CPU % of limit, memory % of limit, throttling in place of disk)
+# TODO - STEP6 - Optional PSI: some / full avg10 / avg60 and stall % from cpu.pressure / memory.pressure / io.pressure, and stall-driven health (see psi.py)
+
+# =======================================================================================================================================================================
+# Constants / Variables / Classes
+# =======================================================================================================================================================================
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+MOUNTINFO = "/proc/self/mountinfo"
+MEMINFO = "/proc/meminfo"
+READ_SIZE = 4096
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_ONLYDIR = 0x01000000
+WATCH_MASK = IN_CREATE | IN_DELETE | IN_ONLYDIR
+
+@dataclass
+class CgroupUsage:
+    path: str                       # relative to the cgroup root, e.g. "system.slice/docker-1234.scope"
+    cpu_cores: float = 0.0          # CPUs used on average over the last period
+    cpu_percent: float = 0.0        # % of the cgroup's CPU limit (cpu.max, else all host CPUs)
+    mem_bytes: int = 0
+    mem_limit: int = None           # memory.max in bytes, None for "max"
+    mem_percent: float = 0.0        # % of memory.max (or of host RAM when unlimited)
+    read_bps: float = 0.0
+    write_bps: float = 0.0
+    iops: float = 0.0
+    throttled_percent: float = 0.0  # share of CPU periods in which the cgroup was throttled
+    cpu_pressure: float = None      # % of the interval some task of the cgroup stalled on CPU / memory / IO (with PSI)
+    mem_pressure: float = None
+    io_pressure: float = None
+    pressure: dict = None           # {resource: psi.Pressure} with PSI: some / full kernel averages and last-tick stall %
+    health: float = 100.0
+
+# Counters of one cgroup from the previous tick (slots: hundreds of these live for the whole run)
+class CgroupState:
+    __slots__ = ("path", "directory", "cpu_limit", "usage", "periods", "throttled", "read", "write", "ios", "stalls", "time")
+
+    # Method to initialize the state for a cgroup directory
+    def __init__(self, path, directory, cpu_limit):
+        self.path = path
+        self.directory = directory
+        self.cpu_limit = cpu_limit
+        self.usage = None
+        self.periods = self.throttled = self.read = self.write = self.ios = 0
+        self.stalls = None
+        self.time = None
+
+# Directory watcher on top of the inotify syscalls (Linux only)
+class Inotify:
+    # Method to create a non-blocking inotify instance
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    # Method to watch a directory for subdirectories being created or removed (watches vanish with the directory)
+    def watch(self, path):
+        if self._add_watch(self.fd, os.fsencode(path), WATCH_MASK) < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+
+    # Method to drain pending events; returns True if there were any
+    def changed(self):
+        seen = False
+        while True:
+            try:
+                if not os.read(self.fd, 65536):
+                    return seen
+            except BlockingIOError:
+                return seen
+            seen = True
+
+    # Method to close the inotify descriptor
+    def close(self):
+        os.close(self.fd)
+
+# Tracks every cgroup below a cgroup2 root and reports per-cgroup usage
+class CgroupMonitor:
+    # Method to find the root, walk the tree once and start watching it; max_depth limits how deep cgroups are tracked,
+    # pressure adds the PSI files to every read and psi_health scores stall time instead of usage
+    def __init__(self, root=None, max_depth=None, model=None, clock=time.monotonic, pressure=False, psi_health=False):
+        self.root = root or find_cgroup2_root()
+        if not self.root or not os.path.exists(os.path.join(self.root, "cgroup.controllers")):
+            raise OSError(f"no cgroup v2 hierarchy found at {self.root or CGROUP_ROOT}")
+        self.max_depth = max_depth
+        self.model = model or HealthModel()
+        self.clock = clock
+        self.pressure = pressure or psi_health
+        self.psi_health = psi_health
+        self.cpus = os.cpu_count() or 1
+        self.host_memory = read_mem_total()
+        self.cgroups = {}
+        self.scans = 0
+        try:
+            self._inotify = Inotify()
+        except (OSError, AttributeError):
+            self._inotify = None        # no inotify: watch the descendant counters of the root instead
+        self._descendants = None
+        self.scan()
+
+    # Method to walk the tree, (re)watch every directory and keep the counters of cgroups that still exist
+    def scan(self):
+        found = {}
+        stack = [("", self.root, 0)]
+        while stack:
+            path, directory, depth = stack.pop()
+            if self._inotify is not None:
+                try:
+                    self._inotify.watch(directory)
+                except OSError:
+                    pass
+            if path:
+                state = self.cgroups.get(path)
+                found[path] = state if state is not None else CgroupState(path, directory, None)
+                found[path].cpu_limit = read_cpu_limit(directory)
+            if self.max_depth is not None and depth >= self.max_depth:
+                continue
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append((f"{path}/{entry.name}" if path else entry.name, entry.path, depth + 1))
+            except OSError:
+                continue
+        self.cgroups = dict(sorted(found.items()))
+        self._descendants = read_descendants(self.root)
+        self.scans += 1
+
+    # Method to return True when cgroups were created or removed since the last check
+    def changed(self):
+        if self._inotify is not None:
+            return self._inotify.changed()
+        return read_descendants(self.root) != self._descendants
+
+    # Method to read every tracked cgroup once and return their usage (rescans first if the tree changed)
+    def collect(self):
+        if self.changed():
+            self.scan()
+        results = []
+        vanished = []
+        for state in self.cgroups.values():
+            usage = self._read(state)
+            if usage is None:
+                vanished.append(state.path)   # removed between scans; inotify will trigger a rescan
+            else:
+                results.append(usage)
+        for path in vanished:
+            self.cgroups.pop(path, None)
+        return results
+
+    # Method to read one cgroup and turn its counters into rates
+    def _read(self, state):
+        cpu = read_keyed(os.path.join(state.directory, "cpu.stat"))
+        if cpu is None:
+            return None
+        now = self.clock()
+        usage = CgroupUsage(state.path)
+        usage.mem_bytes = read_int(os.path.join(state.directory, "memory.current")) or 0
+        usage.mem_limit = read_int(os.path.join(state.directory, "memory.max"))
+        limit = usage.mem_limit or self.host_memory
+        usage.mem_percent = round(usage.mem_bytes / limit * 100, 1) if limit else 0.0
+        read_bytes, write_bytes, ios = read_io(os.path.join(state.directory, "io.stat"))
+
+        total = cpu.get("usage_usec", 0)
+        periods, throttled = cpu.get("nr_periods", 0), cpu.get("nr_throttled", 0)
+        elapsed = now - state.time if state.time is not None else 0
+        if elapsed > 0 and total >= state.usage:
+            usage.cpu_cores = round((total - state.usage) / 1e6 / elapsed, 3)
+            usage.cpu_percent = round(min(100.0, usage.cpu_cores / (state.cpu_limit or self.cpus) * 100), 1)
+            usage.read_bps = max(0, read_bytes - state.read) / elapsed
+            usage.write_bps = max(0, write_bytes - state.write) / elapsed
+            usage.iops = round(max(0, ios - state.ios) / elapsed, 1)
+            if periods > state.periods:
+                usage.throttled_percent = round(max(0, throttled - state.throttled) / (periods - state.periods) * 100, 1)
+        state.usage, state.periods, state.throttled, state.time = total, periods, throttled, now
+        state.read, state.write, state.ios = read_bytes, write_bytes, ios
+        if self.pressure:
+            usage.pressure, state.stalls = read_pressure(state.directory, state.stalls, elapsed)
+            usage.cpu_pressure, usage.mem_pressure, usage.io_pressure = (
+                usage.pressure[resource].some_percent for resource in RESOURCES)
+        if self.psi_health:
+            values = {"cpu": stall_score("cpu", usage.cpu_pressure), "mem": stall_score("memory", usage.mem_pressure),
+                      "disk": stall_score("io", usage.io_pressure)}
+        else:
+            values = {"cpu": usage.cpu_percent, "mem": usage.mem_percent, "disk": usage.throttled_percent}
+        usage.health = round(self.model.score(values), 1)
+        return usage
+
+    # Method to stop watching the tree
+    def close(self):
+        if self._inotify is not None:
+            self._inotify.close()
+
+# =======================================================================================================================================================================
+# Helper Functions
+# =======================================================================================================================================================================
+
+# Function to read a small kernel file in one call (None if it does not exist, e.g. controller not enabled)
+def read_file(path):
+    try:
+        fd = os.open(path, os.O_RDONLY | os.O_CLOEXEC)
+    except OSError:
+        return None
+    try:
+        chunks = []
+        while True:
+            chunk = os.read(fd, READ_SIZE)
+            if not chunk:
+                return b"".join(chunks)
+            chunks.append(chunk)
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+
+# Function to read a single-number file ("max" and missing files give None)
+def read_int(path):
+    data = read_file(path)
+    if not data:
+        return None
+    data = data.strip()
+    return None if data == b"max" else int(data)
+
+# Function to read a flat "key value" file such as cpu.stat or cgroup.stat
+def read_keyed(path):
+    data = read_file(path)
+    if data is None:
+        return None
+    values = {}
+    for line in data.split(b"\n"):
+        key, _, value = line.partition(b" ")
+        if value:
+            values[key.decode()] = int(value)
+    return values
+
+# Function to sum read / written bytes and IOs over all devices in io.stat
+def read_io(path):
+    data = read_file(path)
+    read_bytes = write_bytes = ios = 0
+    for line in (data or b"").split(b"\n"):
+        for field in line.split()[1:]:
+            key, _, value = field.partition(b"=")
+            if key == b"rbytes":
+                read_bytes += int(value)
+            elif key == b"wbytes":
+                write_bytes += int(value)
+            elif key in (b"rios", b"wios"):
+                ios += int(value)
+    return read_bytes, write_bytes, ios
+
+# Function to read the CPU limit from cpu.max as a number of CPUs (None when unlimited or unknown)
+def read_cpu_limit(directory):
+    data = read_file(os.path.join(directory, "cpu.max"))
+    if not data:
+        return None
+    fields = data.split()
+    if len(fields) < 2 or fields[0] == b"max":
+        return None
+    return int(fields[0]) / int(fields[1])
+
+# Function to read cpu.pressure, memory.pressure and io.pressure of a cgroup (zeros when missing)
+# returns ({resource: Pressure}, {resource: (some, full) stall totals}); `previous` is the totals of the last tick
+def read_pressure(directory, previous, elapsed):
+    pressure, totals = {}, {}
+    for resource in RESOURCES:
+        lines = parse_pressure(read_file(os.path.join(directory, f"{resource}.pressure")) or b"")
+        totals[resource] = stall_totals(lines)
+        pressure[resource] = pressure_from(resource, lines, (previous or {}).get(resource), totals[resource], elapsed)
+    return pressure, totals
+
+# Function to read the number of live and dying descendants from the root cgroup.stat
+def read_descendants(root):
+    stat = read_keyed(os.path.join(root, "cgroup.stat")) or {}
+    return stat.get("nr_descendants"), stat.get("nr_dying_descendants")
+
+# Function to read the host memory size in bytes
+def read_mem_total(path=MEMINFO):
+    try:
+        with open(path, "rb") as f:
+            for line in f:
+                if line.startswith(b"MemTotal:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+# Function to find where the cgroup2 hierarchy is mounted (pure v2, or /sys/fs/cgroup/unified on hybrid systems)
+def find_cgroup2_root(mountinfo=MOUNTINFO):
+    try:
+        with open(mountinfo) as f:
+            for line in f:
+                fields = line.split()
+                separator = fields.index("-")
+                if fields[separator + 1] == "cgroup2":
+                    return fields[4]
+    except (OSError, ValueError, IndexError):
+        pass
+    return CGROUP_ROOT if os.path.exists(os.path.join(CGROUP_ROOT, "cgroup.controllers")) else None
+
+# Function to order cgroups for display: busiest CPU first, then memory
+def busiest(cgroups, limit):
+    return sorted(cgroups, key=lambda c: (c.cpu_percent, c.mem_percent), reverse=True)[:limit]
@@ -0,0 +1,47 @@
+import csv
+from datetime import datetime, timedelta
+import pytest
+from csvlog import LOG_HEADER
+
+LOG_START = datetime(2025, 1, 1)
+
+class FakeClock:
+    """Monotonic clock the tests move by hand (clock.now += seconds)."""
+    def __init__(self, now=100.0):
+        self.now = now
+    def __call__(self):
+        return self.now
+
+def log_rows(n, step=1.0, seed=0, health=None):
+    """Main-log rows from LOG_START: random cpu / mem / disk, default 40/40/20 health unless a fixed one is given."""
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    rows = []
+    for i in range(n):
+        cpu, mem, disk = (round(float(v), 1) for v in rng.uniform(0, 100, 3))
+        score = 100 - (cpu * 0.4 + mem * 0.4 + disk * 0.2) if health is None else health
+        rows.append([LOG_START + timedelta(seconds=i * step), cpu, mem, disk, score, i, i])
+    return rows
+
+def write_log_csv(path, rows, opener=open):
+    """Write rows under the main-log header (opener=gzip.open for a rotated segment)."""
+    with opener(path, "wt", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(LOG_HEADER)
+        writer.writerows(rows)
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def log_start():
+    return LOG_START
+
+@pytest.fixture
+def make_rows():
+    return log_rows
+
+@pytest.fixture
+def write_csv():
+    return write_log_csv
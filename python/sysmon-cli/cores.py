@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# =======================================================================================================================================================================
+#  File        : cores.py
+#  Author      : Ionescu Robert-Constantin
+#  Date        : 2025-11-23
+#  Version     : 1.0
+#  Description : Per-core CPU view for many-core machines - one /proc/stat delta pass into preallocated arrays, heatmap grid, top-K cores and NUMA aggregates.
+# =======================================================================================================================================================================
+#  Usage       : from cores import CoreSampler, core_view
+# =======================================================================================================================================================================
+
+import glob
+import os
+import re
+from dataclasses import dataclass
+
+try:
+    import numpy as np
+except ImportError:  # without numpy --per-core falls back to the plain per-core list
+    np = None
+from rich.table import Table
+from rich.text import Text
+
+from procfs import ProcFile, PROC_ROOT
+
+# =======================================================================================================================================================================
+# TO DO SECTION / Development Steps / Requirements
+# =======================================================================================================================================================================
+
+# TODO - STEP1 - Read the aggregate and every per-core line of /proc/stat in one pass, into preallocated int64 counter arrays
+# TODO - STEP2 - Compute busy % and user / system / iowait / steal shares for all cores at once from the jiffy deltas
+# TODO - STEP3 - Overall CPU comes from the same pass, so overall and per-core usage cover exactly the same window
+# TODO - STEP4 - Map cores to NUMA nodes from /sys/devices/system/node/node*/cpulist and aggregate per node
+# TODO - STEP5 - Compact heatmap grid (one cell per core), top-K hottest cores and a per-node table instead of one row per core
+
+# =======================================================================================================================================================================
+# Constants / Variables / Classes
+# =======================================================================================================================================================================
+
+SYS_ROOT = "/sys"
+STAT_FIELDS = 8                  # user nice system idle iowait irq softirq steal (guest time is already in user / nice)
+BREAKDOWN = ("user", "system", "iowait", "steal")
+DEFAULT_TOP_CORES = 8
+CELL_WIDTH = 4
+HOT = 80                         # same red threshold as the CPU row
+WARM = 50
+CPU_LABEL = re.compile(rb"cpu(\d*) ")
+
+# One per-core measurement: busy % and the user / system / iowait / steal split for every core (arrays indexed like `ids`)
+@dataclass
+class CoreSample:
+    ids: object                 # CPU numbers (int array)
+    percent: object             # busy % per core
+    breakdown: object           # cores x 4 (user, system, iowait, steal) in %
+    total: float                # overall busy %, same window as the cores
+    total_breakdown: object     # overall user, system, iowait, steal in %
+    nodes: object = None        # NUMA node number per core, or None when unknown
+    top_k: int = DEFAULT_TOP_CORES
+
+    # Method to return the per-core busy % as a plain list (JSON / exporter / log consumers)
+    def per_core(self):
+        return self.percent.round(1).tolist()
+
+    # Method to return the k hottest cores, hottest first
+    def top(self, k=None):
+        k = min(self.top_k if k is None else k, len(self.percent))
+        if k <= 0:
+            return []
+        hottest = np.argpartition(self.percent, -k)[-k:]
+        hottest = hottest[np.argsort(self.percent[hottest])[::-1]]
+        return [core_entry(int(self.ids[i]), self.percent[i], self.breakdown[i]) for i in hottest]
+
+    # Method to aggregate the cores of every NUMA node (mean / max busy, mean breakdown)
+    def numa(self):
+        if self.nodes is None:
+            return []
+        labels, index = np.unique(self.nodes, return_inverse=True)
+        counts = np.bincount(index)
+        busy = np.bincount(index, weights=self.percent) / counts
+        peak = np.full(len(labels), -np.inf)
+        np.maximum.at(peak, index, self.percent)
+        shares = [np.bincount(index, weights=self.breakdown[:, j]) / counts for j in range(len(BREAKDOWN))]
+        return [{"node": int(label), "cores": int(counts[n]), "mean": round(float(busy[n]), 1), "max": round(float(peak[n]), 1),
+                 **{name: round(float(shares[j][n]), 1) for j, name in enumerate(BREAKDOWN)}}
+                for n, label in enumerate(labels)]
+
+    # Method to summarize the sample for JSON output
+    def summary(self):
+        result = {"count": len(self.percent),
+                  "breakdown": {name: round(float(v), 1) for name, v in zip(BREAKDOWN, self.total_breakdown)},
+                  "top": self.top()}
+        numa = self.numa()
+        if numa:
+            result["numa"] = numa
+        return result
+
+# Reads every core from /proc/stat in one pass and keeps the previous counters in preallocated arrays
+class CoreSampler:
+    # Method to open /proc/stat, map cores to NUMA nodes and prime the counters
+    def __init__(self, proc_root=PROC_ROOT, sys_root=SYS_ROOT, top_k=DEFAULT_TOP_CORES):
+        if np is None:
+            raise ImportError("numpy is required for the per-core view")
+        self.sys_root = sys_root
+        self.top_k = top_k
+        self._stat = ProcFile(os.path.join(proc_root, "stat"))
+        self._labels = None
+        self.read()
+
+    # Method to read /proc/stat once and return a CoreSample for the time since the previous read
+    def read(self):
+        data = self._stat.read()
+        end = data.find(b"\nintr")
+        block = data[:end if end >= 0 else len(data)]
+        labels = CPU_LABEL.findall(block)
+        counters = np.fromstring(CPU_LABEL.sub(b" ", block).decode(), dtype=np.int64, sep=" ")
+        rows = len(labels)
+        counters = counters.reshape(rows, -1)[:, :STAT_FIELDS]
+        if labels == self._labels:
+            self._current[:, :counters.shape[1]] = counters
+        else:
+            self._reset(labels, counters)
+
+        delta = self._current - self._previous
+        total = delta.sum(axis=1)
+        idle = delta[:, 3] + delta[:, 4]
+        scale = np.divide(100.0, total, out=np.zeros(rows), where=total > 0)
+        busy = np.clip((total - idle) * scale, 0, 100)
+        breakdown = np.column_stack([
+            delta[:, 0] + delta[:, 1],                 # user + nice
+            delta[:, 2] + delta[:, 5] + delta[:, 6],   # system + irq + softirq
+            delta[:, 4],                               # iowait
+            delta[:, 7],                               # steal
+        ]) * scale[:, None]
+        self._previous, self._current = self._current, self._previous
+        return CoreSample(self._ids, busy[1:], breakdown[1:], round(float(busy[0]), 1), breakdown[0],
+                          self._nodes, self.top_k)
+
+    # Method to (re)allocate the counter arrays when the set of CPUs changes (first read, CPU hotplug); that read reports 0 %
+    def _reset(self, labels, counters):
+        self._labels = labels
+        self._ids = np.array([int(label) for label in labels[1:]], dtype=np.int64)
+        self._current = np.zeros((len(labels), STAT_FIELDS), dtype=np.int64)
+        self._current[:, :counters.shape[1]] = counters
+        self._previous = self._current.copy()
+        self._nodes = numa_nodes(self._ids, self.sys_root)
+
+    # Method to close /proc/stat
+    def close(self):
+        self._stat.close()
+
+# =======================================================================================================================================================================
+# Helper Functions
+# =======================================================================================================================================================================
+
+# Function to build one top-K entry
+def core_entry(cpu, percent, breakdown):
+    return {"cpu": cpu, "percent": round(float(percent), 1),
+            **{name: round(float(value), 1) for name, value in zip(BREAKDOWN, breakdown)}}
+
+# Function to parse a kernel CPU list such as "0-3,8-11,16"
+def parse_cpulist(text):
+    cpus = []
+    for part in text.strip().split(","):
+        if not part:
+            continue
+        low, _, high = part.partition("-")
+        cpus.extend(range(int(low), int(high or low) + 1))
+    return cpus
+
+# Function to map CPU numbers to NUMA nodes - returns a node array aligned with `ids`, or None on non-NUMA systems
+def numa_nodes(ids, sys_root=SYS_ROOT):
+    mapping = {}
+    for path in glob.glob(os.path.join(sys_root, "devices", "system", "node", "node*", "cpulist")):
+        node = int(os.path.basename(os.path.dirname(path))[4:])
+        try:
+            with open(path) as f:
+                for cpu in parse_cpulist(f.read()):
+                    mapping[cpu] = node
+        except (OSError, ValueError):
+            continue
+    if not mapping:
+        return None
+    return np.array([mapping.get(int(cpu), -1) for cpu in ids], dtype=np.int64)
+
+# Function to pick the heatmap style for a busy %
+def cell_style(percent):
+    if percent >= HOT:
+        return "bold white on red"
+    if percent >= WARM:
+        return "black on yellow"
+    return "black on green" if percent >= 5 else "white on grey23"
+
+# Function to draw cores as a grid of colored cells, `columns` per line, labelled with the first CPU of each line
+def core_grid(ids, percent, columns):
+    text = Text()
+    columns = max(1, columns)
+    for start in range(0, len(percent), columns):
+        if start:
+            text.append("\n")
+        text.append(f"{int(ids[start]):>4} ", style="cyan")
+        for value in percent[start:start + columns]:
+            text.append(f"{value:3.0f}".rjust(CELL_WIDTH - 1), style=cell_style(value))
+            text.append(" ")
+    return text
+
+# Function to compute how many heatmap cells fit on one line of a terminal `width` columns wide
+def grid_columns(width):
+    return max(8, (width - 6) // CELL_WIDTH)
+
+# Function to build the renderables for the per-core view: heatmap grid per node, top-K table and NUMA table
+def core_view(sample, width=120):
+    columns = grid_columns(width)
+    renderables = []
+    numa = sample.numa()
+    if len(numa) > 1:
+        for entry in numa:
+            members = sample.nodes == entry["node"]
+            renderables.append(Text(f"node{entry['node']}  mean {entry['mean']:.1f}%  max {entry['max']:.1f}%", style="bold"))
+            renderables.append(core_grid(sample.ids[members], sample.percent[members], columns))
+    else:
+        renderables.append(Text(f"Cores ({len(sample.percent)})  mean {float(sample.percent.mean()):.1f}%", style="bold"))
+        renderables.append(core_grid(sample.ids, sample.percent, columns))
+
+    top = Table(title=f"Hottest Cores (top {min(sample.top_k, len(sample.percent))})", show_lines=False)
+    top.add_column("CPU", justify="right", style="cyan")
+    top.add_column("Busy (%)", justify="right", style="magenta")
+    for name in BREAKDOWN:
+        top.add_column(f"{name.capitalize()} (%)", justify="right")
+    for entry in sample.top():
+        top.add_row(str(entry["cpu"]), f"{entry['percent']:.1f}", *(f"{entry[name]:.1f}" for name in BREAKDOWN))
+    renderables.append(top)
+
+    if len(numa) > 1:
+        nodes = Table(title="NUMA Nodes", show_lines=False)
+        nodes.add_column("Node", justify="right", style="cyan")
+        for column in ("Cores", "Mean (%)", "Max (%)") + tuple(f"{name.capitalize()} (%)" for name in BREAKDOWN):
+            nodes.add_column(column, justify="right")
+        for entry in numa:
+            nodes.add_row(str(entry["node"]), str(entry["cores"]), f"{entry['mean']:.1f}", f"{entry['max']:.1f}",
+                          *(f"{entry[name]:.1f}" for name in BREAKDOWN))
+        renderables.append(nodes)
+    return renderables
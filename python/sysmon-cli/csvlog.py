@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# =======================================================================================================================================================================
+#  File        : csvlog.py
+#  Author      : Ionescu Robert-Constantin
+#  Date        : 2025-11-05
+#  Version     : 1.0
+#  Description : Buffered CSV logger for sysmon_cli - persistent file handle, batched flushes, size/age rotation and background gzip of rotated segments.
+# =======================================================================================================================================================================
+#  Usage       : from csvlog import CsvLogger
+# =======================================================================================================================================================================
+
+import csv
+import gzip
+import os
+import queue
+import shutil
+import threading
+import time
+from datetime import datetime
+
+# =======================================================================================================================================================================
+# TO DO SECTION / Development Steps / Requirements
+# =======================================================================================================================================================================
+
+# TODO - STEP1 - Open the log once and keep the handle for the whole run
+# TODO - STEP2 - Batch rows in memory, flush every N rows or every T seconds
+# TODO - STEP3 - Explicit fsync policy: never, after every flush, or only when a segment is closed
+# TODO - STEP4 - Rotate by size and/or age, writing the header exactly once per segment
+#                (an existing file with another header is rotated away at open, never appended to)
+# TODO - STEP5 - Gzip rotated segments on a background thread so the monitor loop never waits on compression
+
+# =======================================================================================================================================================================
+# Constants / Variables / Classes
+# =======================================================================================================================================================================
+
+LOG_HEADER = ["timestamp", "cpu", "mem", "disk", "health", "net_sent", "net_recv"]
+INTERVAL_LOG_HEADER = LOG_HEADER + ["interval"]      # --adaptive: sampling interval in effect for each row
+MOUNT_LOG_HEADER = ["timestamp", "mountpoint", "fstype", "percent", "used", "total", "stale"]
+AGENT_LOG_HEADER = ["timestamp", "source", "cpu", "mem", "disk", "health", "net_sent", "net_recv"]
+DISKIO_LOG_HEADER = ["timestamp", "device", "read_bps", "write_bps", "read_iops", "write_iops", "await_ms", "util", "queue", "reset"]
+CGROUP_LOG_HEADER = ["timestamp", "cgroup", "cpu_cores", "cpu_percent", "mem_bytes", "mem_percent", "read_bps", "write_bps", "iops",
+                     "throttled_percent", "health", "cpu_pressure", "mem_pressure", "io_pressure",
+                     "cpu_some_avg10", "cpu_some_avg60", "cpu_full_avg10", "cpu_full_avg60",
+                     "mem_some_avg10", "mem_some_avg60", "mem_full_avg10", "mem_full_avg60",
+                     "io_some_avg10", "io_some_avg60", "io_full_avg10", "io_full_avg60"]
+PRESSURE_LOG_HEADER = ["timestamp", "resource", "some_avg10", "some_avg60", "some_percent", "full_avg10", "full_avg60", "full_percent"]
+FSYNC_POLICIES = ("never", "flush", "rotate")
+
+# CSV logger that keeps its file open, batches rows and rotates segments
+class CsvLogger:
+    # Method to initialize the logger and open the first segment
+    def __init__(self, path, header=LOG_HEADER, flush_rows=100, flush_interval=10.0, fsync="rotate",
+                 max_bytes=None, max_age=None, compress=True):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}")
+        self.path = path
+        self.header = list(header)
+        self.flush_rows = max(1, flush_rows)
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.compress = compress
+
+        self.rotated = []           # paths of closed segments (before compression)
+        self._pending = []
+        self._file = None
+        self._writer = None
+        self._segment_start = 0.0
+        self._last_flush = time.monotonic()
+        self._compressor = None
+        self._jobs = queue.Queue()
+        if read_header(path) not in (None, self.header):
+            self._set_aside()       # written with other columns (e.g. with / without --adaptive's interval): new segment
+        self._open_segment()
+
+    # Method to queue one row, flushing / rotating when the policy says so
+    def write(self, row):
+        self._pending.append(row)
+        now = time.monotonic()
+        if len(self._pending) >= self.flush_rows or now - self._last_flush >= self.flush_interval:
+            self.flush()
+            if self._should_rotate(now):
+                self.rotate()
+
+    # Method to write all pending rows to the file (and fsync if the policy asks for it)
+    def flush(self):
+        if self._pending:
+            self._writer.writerows(self._pending)
+            self._pending.clear()
+        self._file.flush()
+        if self.fsync == "flush":
+            os.fsync(self._file.fileno())
+        self._last_flush = time.monotonic()
+
+    # Method to close the current segment, move it aside and start a new one
+    def rotate(self):
+        self.flush()
+        self._close_segment()
+        self._set_aside()
+        self._open_segment()
+
+    # Method to flush, close the file and wait for pending compressions
+    def close(self):
+        if self._file is None:
+            return
+        self.flush()
+        self._close_segment()
+        self._file = None
+        if self._compressor is not None:
+            self._jobs.put(None)
+            self._compressor.join()
+            self._compressor = None
+
+    # Method to move the (closed) active file aside under a rotated name, compressing it in the background
+    def _set_aside(self):
+        rotated_path = self._rotated_name()
+        os.replace(self.path, rotated_path)
+        self.rotated.append(rotated_path)
+        if self.compress:
+            self._compress_later(rotated_path)
+
+    # Method to open (or continue) the active segment, writing the header only into an empty file
+    def _open_segment(self):
+        self._file = open(self.path, "a", newline="")
+        self._writer = csv.writer(self._file)
+        if self._file.tell() == 0:
+            self._writer.writerow(self.header)
+            self._file.flush()
+        self._segment_start = time.monotonic()
+
+    # Method to close the active segment file
+    def _close_segment(self):
+        self._file.flush()
+        if self.fsync != "never":
+            os.fsync(self._file.fileno())
+        self._file.close()
+
+    # Method to check the size / age limits of the active segment
+    def _should_rotate(self, now):
+        if self.max_bytes and self._file.tell() >= self.max_bytes:
+            return True
+        return bool(self.max_age) and now - self._segment_start >= self.max_age
+
+    # Method to build a unique timestamped name for a rotated segment
+    def _rotated_name(self):
+        root, ext = os.path.splitext(self.path)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        candidate = f"{root}.{stamp}{ext}"
+        counter = 1
+        while os.path.exists(candidate) or os.path.exists(candidate + ".gz"):
+            candidate = f"{root}.{stamp}-{counter}{ext}"
+            counter += 1
+        return candidate
+
+    # Method to hand a rotated segment to the background compressor thread
+    def _compress_later(self, path):
+        if self._compressor is None:
+            self._compressor = threading.Thread(target=self._compress_worker, name="sysmon-gzip", daemon=True)
+            self._compressor.start()
+        self._jobs.put(path)
+
+    # Method run by the compressor thread: gzip each rotated segment, then remove the original
+    def _compress_worker(self):
+        while True:
+            path = self._jobs.get()
+            if path is None:
+                break
+            try:
+                gzip_file(path)
+            except OSError:
+                pass  # keep the uncompressed segment rather than lose data
+
+# =======================================================================================================================================================================
+# Helper Functions
+# =======================================================================================================================================================================
+
+# Function to read the header row of an existing log - None when the file is missing or empty
+def read_header(path):
+    try:
+        with open(path, newline="") as f:
+            return next(csv.reader(f), None)
+    except FileNotFoundError:
+        return None
+
+# Function to gzip a file next to itself (path + ".gz") and delete the original
+def gzip_file(path):
+    with open(path, "rb") as src, gzip.open(path + ".gz", "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(path)
+    return path + ".gz"
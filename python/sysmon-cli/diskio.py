@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# =======================================================================================================================================================================
+#  File        : diskio.py
+#  Author      : Ionescu Robert-Constantin
+#  Date        : 2025-11-25
+#  Version     : 1.0
+#  Description : Block device I/O for sysmon_cli - per-device throughput, IOPS, await and utilization from one /proc/diskstats read per tick.
+# =======================================================================================================================================================================
+#  Usage       : from diskio import DiskIOMonitor
+# =======================================================================================================================================================================
+
+import os
+import re
+import time
+from dataclasses import dataclass
+
+from netrates import counter_delta
+from procfs import ProcFile, PROC_ROOT
+
+# =======================================================================================================================================================================
+# TO DO SECTION / Development Steps / Requirements
+# =======================================================================================================================================================================
+
+# TODO - STEP1 - Keep /proc/diskstats open and reread it in place each tick - one read for all devices, no per-device syscalls
+# TODO - STEP2 - Keep whole disks only: names listed in /sys/block (cached, relisted only when an unknown name shows up),
+#                minus loop / ram / zram; without /sys the partition suffix of the name decides
+# TODO - STEP3 - Derive rates from counter deltas over time.monotonic() (32-bit wrap handled like /proc/net/dev)
+# TODO - STEP4 - Report read / write bytes/s, IOPS, average await (ms), utilization (% of time busy) and queue depth per device
+# TODO - STEP5 - Busiest device utilization can stand in for the disk term of the health score (--disk-io-health)
+
+# =======================================================================================================================================================================
+# Constants / Variables / Classes
+# =======================================================================================================================================================================
+
+SYS_BLOCK = "/sys/block"
+SECTOR_SIZE = 512               # /proc/diskstats always counts 512-byte sectors, whatever the device block size
+IGNORED_PREFIXES = ("loop", "ram", "zram")
+# /proc/diskstats columns used (after "major minor name"): reads, sectors read, ms reading, writes, sectors written,
+# ms writing, ms doing I/O, weighted ms doing I/O
+COUNTER_COLUMNS = (3, 5, 6, 7, 9, 10, 12, 13)
+NUMBERED_DISKS = ("nvme", "mmcblk")            # whole disk names end in a digit, partitions add "p<n>"
+LETTERED_DISKS = ("sd", "vd", "hd", "xvd")     # whole disk names end in a letter, partitions add "<n>"
+NUMBERED_PARTITION = re.compile(r"\dp\d+$")
+
+@dataclass
+class DeviceIO:
+    name: str
+    read_bps: float = 0.0
+    write_bps: float = 0.0
+    read_iops: float = 0.0
+    write_iops: float = 0.0
+    await_ms: float = 0.0       # average time per completed request (queue + service)
+    util: float = 0.0           # % of the interval with at least one request in flight
+    queue: float = 0.0          # average number of requests in flight
+    reset: bool = False         # counters went backwards (device re-added) during this interval
+
+# Computes per-device I/O rates incrementally from /proc/diskstats
+class DiskIOMonitor:
+    # Method to open /proc/diskstats, list the whole disks and take the baseline sample
+    def __init__(self, proc_root=PROC_ROOT, sys_block=SYS_BLOCK, ignore=IGNORED_PREFIXES, clock=time.monotonic):
+        self.sys_block = sys_block
+        self.ignore = tuple(ignore)
+        self.clock = clock
+        self._diskstats = ProcFile(os.path.join(proc_root, "diskstats"))
+        self._disks = list_disks(sys_block)
+        self._keep = {}
+        self._prev = {}
+        self._prev_time = None
+        self.collect()
+
+    # Method to read all counters and return a list of DeviceIO (empty on the first call)
+    def collect(self):
+        now = self.clock()
+        counters = self._read()
+        elapsed = now - self._prev_time if self._prev_time is not None else 0.0
+        devices = []
+        for name, values in counters.items():
+            prev = self._prev.get(name)
+            if prev is None or elapsed <= 0:
+                continue
+            deltas = []
+            reset = False
+            for old, new in zip(prev, values):
+                delta = counter_delta(old, new)
+                if delta is None:
+                    reset = True
+                    delta = 0
+                deltas.append(delta)
+            reads, read_sectors, read_ms, writes, write_sectors, write_ms, busy_ms, weighted_ms = deltas
+            requests = reads + writes
+            devices.append(DeviceIO(
+                name,
+                read_sectors * SECTOR_SIZE / elapsed,
+                write_sectors * SECTOR_SIZE / elapsed,
+                round(reads / elapsed, 1),
+                round(writes / elapsed, 1),
+                round((read_ms + write_ms) / requests, 2) if requests else 0.0,
+                round(min(100.0, busy_ms / (elapsed * 10)), 1),
+                round(weighted_ms / (elapsed * 1000), 2),
+                reset))
+        self._prev = counters
+        self._prev_time = now
+        return devices
+
+    # Method to parse /proc/diskstats into {device: (counters...)} for the devices we keep
+    def _read(self):
+        counters = {}
+        for line in self._diskstats.read().split(b"\n"):
+            fields = line.split()
+            if len(fields) < 14:
+                continue
+            name = fields[2].decode()
+            keep = self._keep.get(name)
+            if keep is None:
+                keep = self._keep[name] = self._whole_disk(name)
+            if keep:
+                counters[name] = tuple(int(fields[i]) for i in COUNTER_COLUMNS)
+        return counters
+
+    # Method to decide once per device name whether it is a whole, non-virtual disk (relists /sys/block for hot-added disks)
+    def _whole_disk(self, name):
+        if name.startswith(self.ignore):
+            return False
+        if self._disks is not None and name not in self._disks:
+            self._disks = list_disks(self.sys_block)
+        if self._disks is None:
+            return not is_partition(name)
+        return name in self._disks
+
+    # Method to close /proc/diskstats
+    def close(self):
+        self._diskstats.close()
+
+# =======================================================================================================================================================================
+# Helper Functions
+# =======================================================================================================================================================================
+
+# Function to list the whole block devices (partitions have no entry of their own in /sys/block); None without sysfs
+def list_disks(sys_block=SYS_BLOCK):
+    try:
+        return set(os.listdir(sys_block))
+    except OSError:
+        return None
+
+# Function to guess from its name whether a device is a partition (only used when /sys/block cannot be listed)
+def is_partition(name):
+    if name.startswith(NUMBERED_DISKS):
+        return bool(NUMBERED_PARTITION.search(name))
+    if name.startswith(LETTERED_DISKS):
+        return name[-1].isdigit()
+    return False
+
+# Function to return the highest utilization of any device (0 when there are none)
+def busiest_util(devices):
+    return max((device.util for device in devices or []), default=0.0)
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# =======================================================================================================================================================================
+#  File        : exporter.py
+#  Author      : Ionescu Robert-Constantin
+#  Date        : 2025-11-14
+#  Version     : 1.0
+#  Description : Prometheus / OpenMetrics exporter for sysmon_cli - renders each sample once and serves the cached body from a small asyncio HTTP server.
+# =======================================================================================================================================================================
+#  Usage       : python3 sysmon_cli.py --serve :9100
+# =======================================================================================================================================================================
+
+import asyncio
+
+# =======================================================================================================================================================================
+# TO DO SECTION / Development Steps / Requirements
+# =======================================================================================================================================================================
+
+# TODO - STEP1 - Render SystemStats, health score and trends as OpenMetrics text once per sample
+# TODO - STEP2 - Keep the rendered response (headers + body) as one cached bytes object
+# TODO - STEP3 - Serve GET /metrics from the cache on an asyncio server - scrapes never trigger collection
+# TODO - STEP4 - Handle many concurrent (keep-alive) scrapers on a single event loop thread, no thread per connection
+# TODO - STEP5 - Run on the collector scheduler's event loop (serve()) - the exporter has no thread of its own
+
+# =======================================================================================================================================================================
+# Constants / Variables / Classes
+# =======================================================================================================================================================================
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+REQUEST_TIMEOUT = 10.0
+MAX_HEADER_LINES = 100
+
+# Asyncio HTTP server that only ever serves the last published metrics body
+class MetricsServer:
+    # Method to initialize the server (nothing is bound until serve())
+    def __init__(self, host=None, port=9100):
+        self.host = host or None
+        self.port = port
+        self.scrapes = 0
+        self._response = build_response(200, "OK", b"# EOF\n", CONTENT_TYPE)
+        self._server = None
+        self._clients = set()
+
+    # Method to replace the cached response - called once per sample by the monitor loop
+    def publish(self, body):
+        self._response = build_response(200, "OK", body, CONTENT_TYPE)
+
+    # Method to start serving on the running event loop (the collector scheduler's) - no extra thread
+    async def serve(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    # Method to stop listening and drop open connections - call it on the loop serve() ran on
+    def stop(self):
+        if self._server is not None:
+            self._server.close()
+            self._close_clients()
+
+    # Method to drop idle keep-alive connections on shutdown
+    def _close_clients(self):
+        for task in list(self._clients):
+            task.cancel()
+
+    # Method to answer requests on one connection until the client closes it
+    async def _handle(self, reader, writer):
+        task = asyncio.current_task()
+        self._clients.add(task)
+        try:
+            while True:
+                request = await asyncio.wait_for(reader.readline(), REQUEST_TIMEOUT)
+                if not request:
+                    break
+                keep_alive = True
+                for _ in range(MAX_HEADER_LINES):
+                    line = await asyncio.wait_for(reader.readline(), REQUEST_TIMEOUT)
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    if line.lower().startswith(b"connection:") and b"close" in line.lower():
+                        keep_alive = False
+                response = self._route(request)
+                if request.startswith(b"HEAD"):
+                    response = response[:response.index(b"\r\n\r\n") + 4]
+                writer.write(response)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            self._clients.discard(task)
+            writer.close()
+
+    # Method to pick the response for a request line
+    def _route(self, request):
+        parts = request.split()
+        if len(parts) < 2 or parts[0] not in (b"GET", b"HEAD"):
+            return build_response(405, "Method Not Allowed", b"", "text/plain")
+        path = parts[1].split(b"?")[0]
+        if path == b"/metrics":
+            self.scrapes += 1
+            return self._response
+        if path == b"/":
+            return build_response(200, "OK", b"sysmon exporter - see /metrics\n", "text/plain")
+        return build_response(404, "Not Found", b"", "text/plain")
+
+# =======================================================================================================================================================================
+# Helper Functions
+# =======================================================================================================================================================================
+
+# Function to build a complete HTTP/1.1 response as bytes
+def build_response(status, reason, body, content_type):
+    head = (f"HTTP/1.1 {status} {reason}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n")
+    return head.encode() + body
+
+# Function to split a "--serve" address such as ":9100" or "127.0.0.1:9100" into (host, port)
+def parse_address(text):
+    host, sep, port = text.rpartition(":")
+    if not sep or not port.isdigit() or not 0 < int(port) < 65536:
+        raise ValueError(f"invalid --serve address {text!r} (use [HOST]:PORT, e.g. :9100 or 127.0.0.1:9100)")
+    return host.strip("[]") or None, int(port)
+
+# Function to escape an OpenMetrics label value
+def label(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+# Function to render one sample (stats, health, trends and optional extras) as OpenMetrics text
+def render_metrics(stats, health, prev_stats=None, prev_health=None):
+    lines = []
+
+    def family(name, kind, help_text, samples):
+        lines.append(f"# TYPE {name} {kind}")
+        lines.append(f"# HELP {name} {help_text}")
+        suffix = "_total" if kind == "counter" else ""
+        for labels, value in samples:
+            lines.append(f"{name}{suffix}{labels} {value}")
+
+    family("sysmon_cpu_percent", "gauge", "Overall CPU usage in percent.", [("", stats.cpu)])
+    family("sysmon_memory_percent", "gauge", "Memory usage in percent.", [("", stats.mem)])
+    family("sysmon_disk_percent", "gauge", "Disk usage in percent (fullest mount with --all-mounts).", [("", stats.disk)])
+    family("sysmon_health_score", "gauge", "Health score from 0 (bad) to 100 (good).", [("", round(health, 2))])
+    family("sysmon_network_sent_bytes", "counter", "Bytes sent on all interfaces.", [("", stats.net_sent * 1024)])
+    family("sysmon_network_received_bytes", "counter", "Bytes received on all interfaces.", [("", stats.net_recv * 1024)])
+
+    if prev_stats is not None:
+        trends = [('{metric="cpu"}', round(stats.cpu - prev_stats.cpu, 2)),
+                  ('{metric="mem"}', round(stats.mem - prev_stats.mem, 2)),
+                  ('{metric="disk"}', round(stats.disk - prev_stats.disk, 2))]
+        if prev_health is not None:
+            trends.append(('{metric="health"}', round(health - prev_health, 2)))
+        family("sysmon_trend", "gauge", "Change since the previous sample.", trends)
+
+    if stats.per_core:
+        family("sysmon_core_cpu_percent", "gauge", "Per-core CPU usage in percent.",
+               [(f'{{core="{i}"}}', value) for i, value in enumerate(stats.per_core)])
+    if stats.mounts:
+        family("sysmon_mount_used_percent", "gauge", "Filesystem usage in percent.",
+               [(f'{{mountpoint="{label(m.mountpoint)}",fstype="{label(m.fstype)}"}}', m.percent) for m in stats.mounts])
+        family("sysmon_mount_stale", "gauge", "1 if the mount did not answer statvfs in time.",
+               [(f'{{mountpoint="{label(m.mountpoint)}"}}', int(m.stale)) for m in stats.mounts])
+    if stats.interfaces:
+        for field, help_text in (("rx_bytes", "Received bytes per second."), ("tx_bytes", "Sent bytes per second."),
+                                 ("rx_packets", "Received packets per second."), ("tx_packets", "Sent packets per second."),
+                                 ("rx_errors", "Receive errors per second."), ("tx_errors", "Transmit errors per second."),
+                                 ("rx_drops", "Received packets dropped per second."), ("tx_drops", "Sent packets dropped per second.")):
+            family(f"sysmon_interface_{field}_per_second", "gauge", help_text,
+                   [(f'{{interface="{label(r.name)}"}}', round(getattr(r, field), 2)) for r in stats.interfaces])
+
+    lines.append("# EOF")
+    return ("\n".join(lines) + "\n").encode()
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# =======================================================================================================================================================================
+#  File        : health.py
+#  Author      : Ionescu Robert-Constantin
+#  Date        : 2025-11-21
+#  Version     : 1.0
+#  Description : Configurable health engine for sysmon_cli - weight profiles, nonlinear penalty curves, and a vectorized batch rescore of existing logs.
+# =======================================================================================================================================================================
+#  Usage       : python3 sysmon_cli.py rescore system_log.csv --health-profile compute [--health-curve cpu=knee:80]
+# =======================================================================================================================================================================
+
+import gzip
+import math
+import os
+import shutil
+import tempfile
+from itertools import islice
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed for the batch (array) path
+    np = None
+
+# =======================================================================================================================================================================
+# TO DO SECTION / Development Steps / Requirements
+# =======================================================================================================================================================================
+
+# TODO - STEP1 - Weight profiles (default 40/40/20) plus ad-hoc "metric=weight" overrides; weights are relative and normalized
+# TODO - STEP2 - Penalty curves per metric: linear (the classic score), quadratic, knee (steeper above a threshold), exponential
+# TODO - STEP3 - One model, two paths: plain-Python scalar scoring per sample, NumPy scoring of whole columns
+# TODO - STEP4 - Rescore binary logs in place through a writable memory map, chunk by chunk
+# TODO - STEP5 - Rescore CSV / gzip logs chunk by chunk into a new file (atomic replace when rewriting in place)
+
+# =======================================================================================================================================================================
+# Constants / Variables / Classes
+# =======================================================================================================================================================================
+
+METRICS = ("cpu", "mem", "disk")
+PROFILES = {
+    "default": {"cpu": 0.4, "mem": 0.4, "disk": 0.2},
+    "compute": {"cpu": 0.6, "mem": 0.3, "disk": 0.1},
+    "memory":  {"cpu": 0.3, "mem": 0.6, "disk": 0.1},
+    "storage": {"cpu": 0.2, "mem": 0.3, "disk": 0.5},
+}
+DEFAULT_CHUNK_ROWS = 100_000
+KNEE_SLOPE = 3.0                # penalty slope above the knee (1.0 below it)
+EXP_SHAPE = 3.0
+
+# Penalty curves map a usage percentage (0-100) to a penalty (0-100 at full usage); __call__ is scalar, array() is vectorized
+
+# Penalty equal to usage - the classic score
+class LinearCurve:
+    name = "linear"
+
+    def __call__(self, value):
+        return value
+
+    def array(self, values):
+        return values
+
+# Gentle at low usage, full penalty at 100 %
+class QuadraticCurve:
+    name = "quadratic"
+
+    def __call__(self, value):
+        return value * value / 100
+
+    def array(self, values):
+        return values * values / 100
+
+# Linear up to a threshold, steeper above it
+class KneeCurve:
+    # Method to set the usage level where the penalty starts rising `slope` times faster
+    def __init__(self, threshold, slope=KNEE_SLOPE):
+        if not 0 <= threshold <= 100 or slope <= 0:
+            raise ValueError("knee threshold must be 0-100 and slope positive")
+        self.threshold = threshold
+        self.slope = slope
+        self.name = f"knee:{threshold:g}:{slope:g}"
+
+    def __call__(self, value):
+        excess = value - self.threshold
+        return value if excess <= 0 else self.threshold + excess * self.slope
+
+    def array(self, values):
+        return np.where(values > self.threshold, self.threshold + (values - self.threshold) * self.slope, values)
+
+# Exponential penalty, 0 at idle and 100 at full usage
+class ExpCurve:
+    # Method to set the curvature (higher = gentler at low usage, steeper near 100 %)
+    def __init__(self, shape=EXP_SHAPE):
+        if shape <= 0:
+            raise ValueError("exp shape must be positive")
+        self.shape = shape
+        self.scale = 100 / math.expm1(shape)
+        self.name = f"exp:{shape:g}"
+
+    def __call__(self, value):
+        return self.scale * math.expm1(self.shape * value / 100)
+
+    def array(self, values):
+        return self.scale * np.expm1(self.shape * values / 100)
+
+# Weighted health model: health = 100 - sum(weight * penalty(usage)), clamped to 0-100
+class HealthModel:
+    # Method to normalize the weights and pick a curve per metric (linear when not given)
+    def __init__(self, weights=None, curves=None):
+        weights = dict(PROFILES["default"] if weights is None else weights)
+        unknown = set(weights) - set(METRICS)
+        if unknown or any(weight < 0 for weight in weights.values()):
+            raise ValueError(f"weights must be non-negative and for {', '.join(METRICS)}")
+        total = sum(weights.values())
+        if total <= 0:
+            raise ValueError("at least one health weight must be positive")
+        self.weights = {metric: weights.get(metric, 0.0) / total for metric in METRICS}
+        self.curves = {metric: (curves or {}).get(metric) or LinearCurve() for metric in METRICS}
+        self._terms = [(metric, weight, self.curves[metric]) for metric, weight in self.weights.items() if weight]
+
+    # Method to score one sample given as {metric: percent}
+    def score(self, values):
+        penalty = 0.0
+        for metric, weight, curve in self._terms:
+            penalty += curve(values[metric]) * weight
+        return max(0, min(100, 100 - penalty))
+
+    # Method to score whole columns ({metric: array}) in one vectorized pass
+    def score_columns(self, columns):
+        penalty = 0.0
+        for metric, weight, curve in self._terms:
+            penalty = penalty + curve.array(np.asarray(columns[metric], dtype=np.float64)) * weight
+        return np.clip(100 - penalty, 0, 100)
+
+    # Method to describe the model (for JSON output / logs)
+    def describe(self):
+        return {metric: {"weight": round(self.weights[metric], 4), "curve": self.curves[metric].name} for metric in METRICS}
+
+# =======================================================================================================================================================================
+# Helper Functions
+# =======================================================================================================================================================================
+
+# Function to build a penalty curve from a spec: linear, quadratic, knee:THRESHOLD[:SLOPE] or exp[:SHAPE]
+def parse_curve(spec):
+    name, *params = spec.split(":")
+    try:
+        params = [float(p) for p in params]
+    except ValueError:
+        raise ValueError(f"invalid curve parameters in {spec!r}") from None
+    if name == "linear" and not params:
+        return LinearCurve()
+    if name == "quadratic" and not params:
+        return QuadraticCurve()
+    if name == "knee" and 1 <= len(params) <= 2:
+        return KneeCurve(*params)
+    if name == "exp" and len(params) <= 1:
+        return ExpCurve(*params)
+    raise ValueError(f"unknown health curve {spec!r} (use linear, quadratic, knee:THRESHOLD[:SLOPE] or exp[:SHAPE])")
+
+# Function to parse "metric=value" specs into a dict, checking the metric names
+def parse_assignments(specs, convert, what):
+    result = {}
+    for spec in specs or []:
+        metric, _, value = spec.partition("=")
+        if metric not in METRICS or not value:
+            raise ValueError(f"invalid {what} {spec!r} (use METRIC=VALUE with one of {', '.join(METRICS)})")
+        result[metric] = convert(value)
+    return result
+
+# Function to build a model from a profile name plus "metric=weight" and "metric=curve" overrides
+def create_model(profile="default", weights=None, curves=None):
+    if profile not in PROFILES:
+        raise ValueError(f"unknown health profile {profile!r} (choose from {', '.join(PROFILES)})")
+    return HealthModel({**PROFILES[profile], **parse_assignments(weights, float, "health weight")},
+                       parse_assignments(curves, parse_curve, "health curve"))
+
+# Function to recompute the health column of a binary log in place (writable memory map, one chunk at a time)
+def rescore_binary(path, model, chunk_rows=DEFAULT_CHUNK_ROWS):
+    from binlog import open_binary_log
+    log = open_binary_log(path, mode="r+")
+    records = log.records
+    for start in range(0, len(records), chunk_rows):
+        block = records[start:start + chunk_rows]
+        block["health"] = model.score_columns({metric: block[metric] for metric in METRICS})
+    if len(records):
+        records.flush()
+    return len(records)
+
+# Function to recompute the health column of a CSV log (plain or .gz) into `output`; rows that do not parse are copied unchanged
+def rescore_csv(path, output, model, chunk_rows=DEFAULT_CHUNK_ROWS):
+    opener = gzip.open if path.endswith(".gz") else open
+    out_opener = gzip.open if output.endswith(".gz") else open
+    rows = 0
+    with opener(path, "rt", newline="") as src, out_opener(output, "wt", newline="") as dst:
+        first = src.readline()
+        header = first.rstrip("\r\n").split(",")
+        dst.write(first)
+        try:
+            columns = {metric: header.index(metric) for metric in METRICS}
+            target = header.index("health")
+        except ValueError:
+            raise ValueError(f"{path}: not a sysmon log (missing cpu / mem / disk / health columns)") from None
+        while True:
+            lines = list(islice(src, chunk_rows))
+            if not lines:
+                break
+            rows += rescore_lines(lines, dst, model, len(header), columns, target)
+    return rows
+
+# Function to rescore one chunk of CSV lines and write them out; returns how many rows were rescored
+def rescore_lines(lines, dst, model, width, columns, target):
+    fields = [line.rstrip("\r\n").split(",") for line in lines]
+    valid = [i for i, row in enumerate(fields) if len(row) == width]
+    try:
+        values = {metric: np.array([fields[i][c] for i in valid], dtype=np.float64) for metric, c in columns.items()}
+    except ValueError:  # repeated header or damaged row somewhere in the chunk: parse row by row
+        valid = [i for i in valid if parses(fields[i], columns.values())]
+        values = {metric: np.array([fields[i][c] for i in valid], dtype=np.float64) for metric, c in columns.items()}
+    health = np.round(model.score_columns(values), 2).tolist() if valid else []
+    for i, score in zip(valid, health):
+        fields[i][target] = repr(score)
+    dst.write("".join(",".join(row) + "\n" for row in fields))
+    return len(valid)
+
+# Function to check that the given cells of a CSV row are numbers
+def parses(row, columns):
+    try:
+        for c in columns:
+            float(row[c])
+    except ValueError:
+        return False
+    return True
+
+# Function to rescore a log of either format; without `output` the file is rewritten in place
+def rescore_log(path, model, output=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    from binlog import is_binary_log
+    if np is None:
+        raise ImportError("numpy is required to rescore logs")
+    if not path.endswith(".gz") and is_binary_log(path):
+        if output:
+            shutil.copyfile(path, output)
+            path = output
+        return rescore_binary(path, model, chunk_rows)
+    if output:
+        return rescore_csv(path, output, model, chunk_rows)
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp = tempfile.mkstemp(prefix=".rescore-", suffix=".gz" if path.endswith(".gz") else "", dir=directory)
+    os.close(fd)
+    try:
+        rows = rescore_csv(path, temp, model, chunk_rows)
+        shutil.copymode(path, temp)
+        os.replace(temp, path)
+    except BaseException:
+        os.unlink(temp)
+        raise
+    return rows
+
+# Function to run the rescore subcommand from parsed arguments
+def run(args, console):
+    model = create_model(args.health_profile, args.health_weight, args.health_curve)
+    if args.output and len(args.files) > 1:
+        raise SystemExit("--output needs exactly one input file")
+    total = 0
+    for path in args.files:
+        rows = rescore_log(path, model, args.output, args.chunk_rows)
+        total += rows
+        console.print(f"[bold green]Rescored[/bold green] {path}{' -> ' + args.output if args.output else ''}: {rows} rows")
+    weights = ", ".join(f"{m} {entry['weight']:g} ({entry['curve']})" for m, entry in model.describe().items())
+    console.print(f"[bold]Health model:[/bold] {weights} - {total} rows total")
+    return total
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# =======================================================================================================================================================================
+#  File        : liveview.py
+#  Author      : Ionescu Robert-Constantin
+#  Date        : 2025-11-17
+#  Version     : 1.0
+#  Description : Flicker-free live rendering for sysmon_cli - keeps the last frame and rewrites only the terminal lines that changed, at a capped frame rate.
+# =======================================================================================================================================================================
+#  Usage       : from liveview import LiveView
+# =======================================================================================================================================================================
+
+import time
+
+# =======================================================================================================================================================================
+# TO DO SECTION / Development Steps / Requirements
+# =======================================================================================================================================================================
+
+# TODO - STEP1 - Render rich renderables into a list of ANSI lines (console.capture), never clear the screen between frames
+# TODO - STEP2 - Diff against the previous frame and rewrite only the changed lines (cursor positioning + erase to end of line)
+# TODO - STEP3 - Cap the frame rate independently of the sampling / --interval rate - ticks between frames are not rendered at all
+# TODO - STEP4 - Redraw everything after a terminal resize, crop frames to the terminal height, hide the cursor while live
+# TODO - STEP5 - Fall back to plain printing when the output is not a terminal
+
+# =======================================================================================================================================================================
+# Constants / Variables / Classes
+# =======================================================================================================================================================================
+
+CLEAR_SCREEN = "\x1b[2J\x1b[H"
+CLEAR_BELOW = "\x1b[J"
+ERASE_LINE = "\x1b[K"
+HIDE_CURSOR = "\x1b[?25l"
+SHOW_CURSOR = "\x1b[?25h"
+
+# Persistent terminal view that only sends the lines that changed since the previous frame
+class LiveView:
+    # Method to initialize the view; max_fps caps how often frames are drawn
+    def __init__(self, console, max_fps=4.0, clock=time.monotonic):
+        self.console = console
+        self.min_period = 1.0 / max_fps if max_fps and max_fps > 0 else 0.0
+        self.clock = clock
+        self.frames = 0
+        self.bytes_written = 0
+        self._lines = None
+        self._size = None
+        self._last_draw = None
+
+    # Method to return True when enough time has passed to draw another frame (check before building the renderables)
+    def due(self):
+        return self._last_draw is None or self.clock() - self._last_draw >= self.min_period
+
+    # Method to draw a frame made of one or more renderables
+    def update(self, *renderables):
+        self._last_draw = self.clock()
+        self.frames += 1
+        if not self.console.is_terminal:
+            for renderable in renderables:
+                self.console.print(renderable)
+            return
+        self._write(self._diff(self._render(renderables)))
+
+    # Method to force a full redraw on the next frame (e.g. after something else printed to the terminal)
+    def invalidate(self):
+        self._lines = None
+
+    # Method to leave the cursor below the last frame and make it visible again
+    def close(self):
+        if self._lines is not None and self.console.is_terminal:
+            self._write(f"\x1b[{len(self._lines) + 1};1H{SHOW_CURSOR}")
+        self._lines = None
+
+    # Method to render renderables into ANSI lines, cropped to the terminal height
+    def _render(self, renderables):
+        with self.console.capture() as capture:
+            for renderable in renderables:
+                self.console.print(renderable)
+        lines = capture.get().split("\n")
+        if lines and lines[-1] == "":
+            lines.pop()
+        return lines[:max(1, self.console.size.height - 1)]
+
+    # Method to build the escape sequence that turns the previous frame into the new one
+    def _diff(self, lines):
+        size = self.console.size
+        previous = self._lines
+        if previous is None or size != self._size:
+            self._lines, self._size = lines, size
+            return HIDE_CURSOR + CLEAR_SCREEN + "\n".join(line + ERASE_LINE for line in lines)
+        out = []
+        for row, line in enumerate(lines):
+            if row >= len(previous) or previous[row] != line:
+                out.append(f"\x1b[{row + 1};1H{line}{ERASE_LINE}")
+        if len(lines) < len(previous):
+            out.append(f"\x1b[{len(lines) + 1};1H{CLEAR_BELOW}")
+        self._lines = lines
+        return "".join(out)
+
+    # Method to write raw escape sequences straight to the terminal
+    def _write(self, text):
+        if not text:
+            return
+        self.console.file.write(text)
+        self.console.file.flush()
+        self.bytes_written += len(text.encode())
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# =======================================================================================================================================================================
+#  File        : mounts.py
+#  Author      : Ionescu Robert-Constantin
+#  Date        : 2025-11-11
+#  Version     : 1.0
+#  Description : Multi-mount disk usage collector for sysmon_cli - cached mount list, statvfs on a daemon thread per mount with per-mount timeouts.
+# =======================================================================================================================================================================
+#  Usage       : from mounts import MountMonitor
+# =======================================================================================================================================================================
+
+import os
+import re
+import select
+from concurrent.futures import wait
+from dataclasses import dataclass
+
+from workers import DaemonWorker
+
+# =======================================================================================================================================================================
+# TO DO SECTION / Development Steps / Requirements
+# =======================================================================================================================================================================
+
+# TODO - STEP1 - Parse /proc/self/mountinfo into (mountpoint, fstype, device), keeping block-device and network filesystems only
+# TODO - STEP2 - Cache the mount list and reparse only when the kernel signals a change (poll POLLPRI on mountinfo)
+# TODO - STEP3 - Run statvfs for every mount on its own daemon thread and wait at most a per-mount timeout
+# TODO - STEP4 - Mark mounts that do not answer in time as stale (keep their last value) instead of blocking the loop
+# TODO - STEP5 - Never queue a second statvfs behind one that is still hung; a dead mount holds only its own thread and never delays exit
+
+# =======================================================================================================================================================================
+# Constants / Variables / Classes
+# =======================================================================================================================================================================
+
+MOUNTINFO = "/proc/self/mountinfo"
+FILESYSTEMS = "/proc/filesystems"
+NETWORK_FS = {"nfs", "nfs4", "cifs", "smb3", "smbfs", "ceph", "glusterfs", "9p", "sshfs", "fuseblk"}
+IGNORED_FS = {"squashfs"}      # read-only images (snaps, live media) are always 100% full
+
+@dataclass
+class MountUsage:
+    mountpoint: str
+    fstype: str
+    device: str
+    percent: float = 0.0
+    total: int = 0
+    used: int = 0
+    free: int = 0
+    stale: bool = False
+
+# Watches all mounted filesystems without letting a slow mount block the caller
+class MountMonitor:
+    # Method to initialize the monitor and the mount list cache (statvfs workers are started per mount on first use)
+    def __init__(self, timeout=1.0, mountinfo=MOUNTINFO, filesystems=FILESYSTEMS):
+        self.timeout = timeout
+        self.mountinfo = mountinfo
+        self.block_fs = read_block_filesystems(filesystems)
+        self.mounts = []
+        self._usage = {}
+        self._pending = {}
+        self._workers = {}
+        self._file = open(mountinfo, "rb")
+        self._poll = select.poll()
+        self._poll.register(self._file.fileno(), select.POLLPRI | select.POLLERR)
+        self.refresh()
+
+    # Method to reread the mount list (also called automatically when mountinfo changes)
+    def refresh(self):
+        self._file.seek(0)
+        mounts = parse_mountinfo(self._file.read().decode(errors="replace"), self.block_fs)
+        self.mounts = mounts
+        keep = {m.mountpoint for m in mounts}
+        self._usage = {mp: usage for mp, usage in self._usage.items() if mp in keep}
+        self._pending = {mp: future for mp, future in self._pending.items() if mp in keep}
+        for mp in [mp for mp in self._workers if mp not in keep]:
+            self._workers.pop(mp).close()
+
+    # Method to return True when the kernel reports a mount table change since the last read
+    def changed(self):
+        return bool(self._poll.poll(0))
+
+    # Method to collect usage for every mount, waiting at most `timeout` seconds in total
+    def collect(self):
+        if self.changed():
+            self.refresh()
+
+        started = {}
+        for mount in self.mounts:
+            future = self._pending.get(mount.mountpoint)
+            if future is None or future.done():
+                worker = self._workers.get(mount.mountpoint)
+                if worker is None:
+                    worker = self._workers[mount.mountpoint] = DaemonWorker(f"sysmon-statvfs:{mount.mountpoint}")
+                future = worker.submit(os.statvfs, mount.mountpoint)
+                self._pending[mount.mountpoint] = future
+            started[mount.mountpoint] = future
+
+        wait(list(started.values()), timeout=self.timeout)
+
+        results = []
+        for mount in self.mounts:
+            future = started[mount.mountpoint]
+            if future.done():
+                del self._pending[mount.mountpoint]
+                try:
+                    usage = usage_from_statvfs(mount, future.result())
+                except OSError:
+                    usage = self._stale(mount)
+                else:
+                    self._usage[mount.mountpoint] = usage
+            else:
+                usage = self._stale(mount)
+            results.append(usage)
+        return results
+
+    # Method to return the last known usage of a mount, flagged as stale
+    def _stale(self, mount):
+        previous = self._usage.get(mount.mountpoint)
+        if previous is None:
+            return MountUsage(mount.mountpoint, mount.fstype, mount.device, stale=True)
+        return MountUsage(previous.mountpoint, previous.fstype, previous.device, previous.percent,
+                          previous.total, previous.used, previous.free, stale=True)
+
+    # Method to stop the workers without waiting for hung statvfs calls
+    def close(self):
+        for worker in self._workers.values():
+            worker.close()
+        self._workers = {}
+        self._file.close()
+
+# =======================================================================================================================================================================
+# Helper Functions
+# =======================================================================================================================================================================
+
+# Function to read the filesystem types that need a block device (no "nodev" flag)
+def read_block_filesystems(path=FILESYSTEMS):
+    try:
+        with open(path) as f:
+            return {line.split()[-1] for line in f if line.strip() and not line.startswith("nodev")}
+    except OSError:
+        return {"ext2", "ext3", "ext4", "xfs", "btrfs", "vfat", "exfat", "ntfs", "f2fs", "jfs", "reiserfs"}
+
+# Function to decode the octal escapes mountinfo uses for spaces etc. (e.g. "\040")
+def unescape(field):
+    return re.sub(r"\\([0-7]{3})", lambda match: chr(int(match.group(1), 8)), field)
+
+# Function to parse mountinfo text into MountUsage entries for block-device and network filesystems
+def parse_mountinfo(text, block_fs):
+    mounts = {}
+    for line in text.splitlines():
+        fields = line.split()
+        if "-" not in fields:
+            continue
+        sep = fields.index("-")
+        if sep + 2 >= len(fields) or len(fields) < 5:
+            continue
+        mountpoint = unescape(fields[4])
+        fstype, device = fields[sep + 1], fields[sep + 2]
+        if fstype in IGNORED_FS:
+            continue
+        if fstype in block_fs or fstype in NETWORK_FS or fstype.startswith("fuse."):
+            mounts[mountpoint] = MountUsage(mountpoint, fstype, unescape(device))
+    return list(mounts.values())
+
+# Function to turn a statvfs result into usage numbers (same formula as psutil.disk_usage)
+def usage_from_statvfs(mount, st):
+    total = st.f_blocks * st.f_frsize
+    free = st.f_bavail * st.f_frsize
+    used = (st.f_blocks - st.f_bfree) * st.f_frsize
+    total_user = used + free
+    percent = round(used / total_user * 100, 1) if total_user else 0.0
+    return MountUsage(mount.mountpoint, mount.fstype, mount.device, percent, total, used, free)
+
+# Function to pick the fullest mount (fresh values preferred) - feeds the health score
+def worst_mount(mounts):
+    fresh = [m for m in mounts if not m.stale] or mounts
+    return max(fresh, key=lambda m: m.percent, default=None)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# =======================================================================================================================================================================
+#  File        : ndjson.py
+#  Author      : Ionescu Robert-Constantin
+#  Date        : 2025-11-18
+#  Version     : 1.0
+#  Description : Compact NDJSON streaming output for sysmon_cli - one line per sample, reusable encoder (orjson when installed), batched stdout writes.
+# =======================================================================================================================================================================
+#  Usage       : from ndjson import NdjsonWriter
+# =======================================================================================================================================================================
+
+import json
+import os
+import sys
+import time
+
+try:
+    import orjson
+except ImportError:  # optional, the standard json module is used instead
+    orjson = None
+
+# =======================================================================================================================================================================
+# TO DO SECTION / Development Steps / Requirements
+# =======================================================================================================================================================================
+
+# TODO - STEP1 - Encode each sample as one compact line with an encoder built once (orjson if installed, else a reused json.JSONEncoder)
+# TODO - STEP2 - Batch encoded lines in a bytearray and write them to the binary stdout in one call
+# TODO - STEP3 - Flush every N lines or every T seconds, whichever comes first (N=1 for line-by-line consumers)
+# TODO - STEP4 - Handle a closed pipe (e.g. `| head`) cleanly: stop writing, silence stdout, let the monitor exit
+
+# =======================================================================================================================================================================
+# Constants / Variables / Classes
+# =======================================================================================================================================================================
+
+BACKENDS = ("auto", "orjson", "json")
+
+# Writes one JSON object per line to a binary stream, batching the writes
+class NdjsonWriter:
+    # Method to initialize the writer; stream defaults to the binary stdout
+    def __init__(self, stream=None, flush_lines=10, flush_interval=1.0, backend="auto", clock=time.monotonic):
+        self.stream = stream if stream is not None else sys.stdout.buffer
+        self.flush_lines = max(1, flush_lines)
+        self.flush_interval = flush_interval
+        self.clock = clock
+        self.backend, self.encode = create_encoder(backend)
+        self.broken = False
+        self._pending = bytearray()
+        self._lines = 0
+        self._last_flush = clock()
+
+    # Method to queue one object as a line; returns False once the reader has gone away
+    def write(self, obj):
+        if self.broken:
+            return False
+        self._pending += self.encode(obj)
+        self._pending += b"\n"
+        self._lines += 1
+        if self._lines >= self.flush_lines or self.clock() - self._last_flush >= self.flush_interval:
+            self.flush()
+        return not self.broken
+
+    # Method to write all pending lines in one call
+    def flush(self):
+        self._last_flush = self.clock()
+        if self.broken or not self._pending:
+            return
+        try:
+            self.stream.write(self._pending)
+            self.stream.flush()
+        except BrokenPipeError:
+            self._broken_pipe()
+        self._pending.clear()
+        self._lines = 0
+
+    # Method to flush what is left
+    def close(self):
+        self.flush()
+
+    # Method to stop writing after the reader closed the pipe (also keeps Python quiet when it flushes stdout at exit)
+    def _broken_pipe(self):
+        self.broken = True
+        try:
+            if self.stream is sys.stdout.buffer:
+                devnull = os.open(os.devnull, os.O_WRONLY)
+                os.dup2(devnull, sys.stdout.fileno())
+                os.close(devnull)
+        except (OSError, ValueError, AttributeError):
+            pass
+
+# =======================================================================================================================================================================
+# Helper Functions
+# =======================================================================================================================================================================
+
+# Function to build the compact encoder once - returns (backend name, obj -> bytes)
+def create_encoder(backend="auto"):
+    if backend not in BACKENDS:
+        raise ValueError(f"backend must be one of {BACKENDS}")
+    if backend == "orjson" and orjson is None:
+        raise ValueError("orjson is not installed (pip install orjson, or use --json-backend auto / json)")
+    if backend != "json" and orjson is not None:
+        return "orjson", orjson.dumps
+    encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+    return "json", lambda obj: encoder.encode(obj).encode()
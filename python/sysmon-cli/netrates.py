@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# =======================================================================================================================================================================
+#  File        : netrates.py
+#  Author      : Ionescu Robert-Constantin
+#  Date        : 2025-11-12
+#  Version     : 1.0
+#  Description : Per-interface network throughput for sysmon_cli - bytes/s, packets/s, errors and drops from /proc/net/dev deltas.
+# =======================================================================================================================================================================
+#  Usage       : from netrates import NetRateMonitor
+# =======================================================================================================================================================================
+
+import os
+import time
+from dataclasses import dataclass
+
+from procfs import ProcFile, PROC_ROOT
+
+# =======================================================================================================================================================================
+# TO DO SECTION / Development Steps / Requirements
+# =======================================================================================================================================================================
+
+# TODO - STEP1 - Keep /proc/net/dev open and reread it in place each tick (ProcFile from procfs.py)
+# TODO - STEP2 - Keep per-interface counter state in a dict keyed by name - only new interfaces allocate anything
+# TODO - STEP3 - Derive rates from counter deltas over time.monotonic(), not wall-clock time
+# TODO - STEP4 - Handle 32-bit counter wrap, and treat any other backwards jump as a reset (no bogus spike)
+# TODO - STEP5 - Report rx/tx bytes/s, packets/s, errors/s and drops/s per interface
+
+# =======================================================================================================================================================================
+# Constants / Variables / Classes
+# =======================================================================================================================================================================
+
+WRAP_32 = 1 << 32
+WRAP_NEAR = 1 << 28             # a 32-bit wrap goes from the last 256 Mi of the range to a value below 256 Mi; anything else is a reset
+# /proc/net/dev columns used (after "iface:"): rx bytes, packets, errs, drop ... tx bytes, packets, errs, drop
+COUNTER_COLUMNS = (0, 1, 2, 3, 8, 9, 10, 11)
+IGNORED_INTERFACES = {"lo"}
+
+@dataclass
+class InterfaceRate:
+    name: str
+    rx_bytes: float = 0.0       # per second
+    tx_bytes: float = 0.0
+    rx_packets: float = 0.0
+    tx_packets: float = 0.0
+    rx_errors: float = 0.0
+    tx_errors: float = 0.0
+    rx_drops: float = 0.0
+    tx_drops: float = 0.0
+    reset: bool = False         # counters went backwards (interface reset) during this interval
+
+# Computes per-interface rates incrementally from /proc/net/dev
+class NetRateMonitor:
+    # Method to open /proc/net/dev and take the baseline sample
+    def __init__(self, proc_root=PROC_ROOT, ignore=IGNORED_INTERFACES, clock=time.monotonic):
+        self.ignore = set(ignore)
+        self.clock = clock
+        self._netdev = ProcFile(os.path.join(proc_root, "net", "dev"))
+        self._prev = {}
+        self._prev_time = None
+        self.collect()
+
+    # Method to read all counters and return a list of InterfaceRate (empty on the first call)
+    def collect(self):
+        now = self.clock()
+        counters = self._read()
+        elapsed = now - self._prev_time if self._prev_time is not None else 0.0
+        rates = []
+        for name, values in counters.items():
+            prev = self._prev.get(name)
+            if prev is None or elapsed <= 0:
+                continue
+            deltas = []
+            reset = False
+            for old, new in zip(prev, values):
+                delta = counter_delta(old, new)
+                if delta is None:
+                    reset = True
+                    delta = 0
+                deltas.append(delta / elapsed)
+            rates.append(InterfaceRate(name, deltas[0], deltas[4], deltas[1], deltas[5],
+                                       deltas[2], deltas[6], deltas[3], deltas[7], reset))
+        self._prev = counters
+        self._prev_time = now
+        return rates
+
+    # Method to parse /proc/net/dev into {interface: (counters...)}
+    def _read(self):
+        counters = {}
+        for line in self._netdev.read().split(b"\n")[2:]:
+            name, sep, rest = line.partition(b":")
+            if not sep:
+                continue
+            name = name.strip().decode()
+            if name in self.ignore:
+                continue
+            fields = rest.split()
+            counters[name] = tuple(int(fields[i]) for i in COUNTER_COLUMNS)
+        return counters
+
+    # Method to close /proc/net/dev
+    def close(self):
+        self._netdev.close()
+
+# =======================================================================================================================================================================
+# Helper Functions
+# =======================================================================================================================================================================
+
+# Function to compute a counter delta: handles 32-bit wrap, returns None when the counter was reset
+# (64-bit /proc counters do not wrap in practice, so a drop that does not start in the last WRAP_NEAR of the 32-bit range is a reset)
+def counter_delta(old, new):
+    if new >= old:
+        return new - old
+    if WRAP_32 - WRAP_NEAR <= old < WRAP_32 and new < WRAP_NEAR:
+        return new + WRAP_32 - old
+    return None
+
+# Function to format a bytes/s rate for display
+def format_rate(value):
+    for unit in ("B/s", "KB/s", "MB/s"):
+        if value < 1024:
+            return f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GB/s"
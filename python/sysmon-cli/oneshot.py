@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# =======================================================================================================================================================================
+#  File        : oneshot.py
+#  Author      : Ionescu Robert-Constantin
+#  Date        : 2025-11-28
+#  Version     : 1.0
+#  Description : Fast-start one-shot snapshot for sysmon_cli (--once) - one windowed sample straight from /proc, no rich / psutil / asyncio on the JSON path.
+# =======================================================================================================================================================================
+#  Usage       : python3 sysmon_cli.py --once --json [--window 0.2] [--once-budget 50]
+# =======================================================================================================================================================================
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+
+from procfs import ProcCollector, PROC_ROOT
+
+# =======================================================================================================================================================================
+# TO DO SECTION / Development Steps / Requirements
+# =======================================================================================================================================================================
+
+# TODO - STEP1 - sysmon_cli.py hands --once over before its own imports, so the hot path pays only for what this module imports
+# TODO - STEP2 - Prime /proc/stat, sleep for the measurement window, read again - CPU covers exactly the window
+# TODO - STEP3 - Memory, disk and network from the same ProcCollector (psutil only as a lazy fallback without /proc)
+# TODO - STEP4 - Default health inline; the health model (and numpy) is imported only for --health-* options; rich only for the table
+# TODO - STEP5 - Measure script start to output (minus the window) and warn on stderr when it exceeds the budget
+
+# =======================================================================================================================================================================
+# Constants / Variables / Classes
+# =======================================================================================================================================================================
+
+DEFAULT_WINDOW = 0.2            # seconds; /proc/stat counts in 10 ms jiffies, so shorter windows get coarse on small machines
+DEFAULT_BUDGET_MS = {"json": 50.0, "table": 150.0}   # script start to output, measurement window excluded (the table imports rich)
+
+# =======================================================================================================================================================================
+# Helper Functions
+# =======================================================================================================================================================================
+
+# Function to parse the options --once uses (loop-only options of the full CLI are accepted and ignored); builds the health model up front
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="sysmon_cli.py --once", description="One windowed sample, printed once")
+    parser.add_argument('--once', action='store_true')
+    parser.add_argument('--json', action='store_true', help='Output JSON instead of the table')
+    parser.add_argument('--per-core', action='store_true', help='Include per-core CPU usage')
+    parser.add_argument('--window', type=float, default=DEFAULT_WINDOW, help='CPU measurement window in seconds')
+    parser.add_argument('--once-budget', type=float, default=None, metavar='MS',
+                        help='Warn on stderr when start-up to output (window excluded) takes longer (default 50, 150 for the table)')
+    parser.add_argument('--disk-path', type=str, default='/', help='Filesystem whose usage is reported')
+    profile = parser.add_argument('--health-profile', type=str, default=None, help='Health weight profile')
+    parser.add_argument('--health-weight', action='append', default=None, metavar='METRIC=WEIGHT')
+    parser.add_argument('--health-curve', action='append', default=None, metavar='METRIC=CURVE')
+    args, _ = parser.parse_known_args(argv)     # e.g. --max-iterations 1 or --collector proc from a shared cron line
+    if args.window <= 0:
+        parser.error("--window must be positive")
+    args.model = None
+    if args.health_profile or args.health_weight or args.health_curve:
+        # health imports numpy, so the profile choices are only known (and checked) once a --health-* option asks for the model
+        from health import create_model, PROFILES
+        profile.choices = list(PROFILES)
+        args, _ = parser.parse_known_args(argv)
+        try:
+            args.model = create_model(args.health_profile or "default", args.health_weight, args.health_curve)
+        except ValueError as e:
+            parser.error(str(e))
+    return args
+
+# Function to take one sample over `window` seconds - (cpu, mem, disk, net_sent_kb, net_recv_kb, per_core)
+def take_sample(window=DEFAULT_WINDOW, per_core=False, disk_path="/", proc_root=PROC_ROOT):
+    try:
+        collector = ProcCollector(proc_root, disk_path)
+    except OSError:
+        return psutil_sample(window, per_core, disk_path)
+    try:
+        time.sleep(window)
+        cpu, mem, disk, sent, recv, cores = collector.read(per_core)
+    finally:
+        collector.close()
+    return cpu, mem, disk, sent // 1024, recv // 1024, cores
+
+# Function to take the same sample with psutil (no /proc, e.g. containers with a restricted procfs)
+def psutil_sample(window, per_core, disk_path):
+    import psutil
+    psutil.cpu_percent(interval=None)
+    cores = psutil.cpu_percent(interval=window, percpu=True) if per_core else None
+    cpu = psutil.cpu_percent(interval=None if per_core else window)
+    net = psutil.net_io_counters()
+    return (cpu, psutil.virtual_memory().percent, psutil.disk_usage(disk_path).percent,
+            net.bytes_sent // 1024, net.bytes_recv // 1024, cores)
+
+# Function to score the sample - default 40/40/20 inline, the health model only when asked for
+def score(args, cpu, mem, disk):
+    if args.model is not None:
+        return args.model.score({"cpu": cpu, "mem": mem, "disk": disk})
+    return max(0, min(100, 100 - (cpu * 0.4 + mem * 0.4 + disk * 0.2)))
+
+# Function to print the sample as a table (rich is imported here, never on the JSON path)
+def print_table(record):
+    from rich.console import Console
+    from rich.table import Table
+    table = Table(title="Linux System Monitor (once)", show_lines=True)
+    table.add_column("Metric", style="cyan", no_wrap=True)
+    table.add_column("Value", justify="right", style="magenta")
+    for key, label in (("cpu", "CPU (%)"), ("mem", "Memory (%)"), ("disk", "Disk (%)"), ("health", "Health Score"),
+                       ("net_sent_kb", "Net Sent (KB)"), ("net_recv_kb", "Net Recv (KB)")):
+        table.add_row(label, str(record[key]))
+    for i, value in enumerate(record.get("per_core") or []):
+        table.add_row(f"Core {i}", str(value))
+    Console().print(table)
+
+# Function to run --once: sample, print, check the start-up budget; returns the exit status
+def run(argv, started):
+    args = parse_args(argv)
+    cpu, mem, disk, sent, recv, cores = take_sample(args.window, args.per_core, args.disk_path)
+    record = {
+        "timestamp": datetime.now().isoformat(),
+        "cpu": cpu,
+        "mem": mem,
+        "disk": disk,
+        "health": round(score(args, cpu, mem, disk), 2),
+        "net_sent_kb": sent,
+        "net_recv_kb": recv,
+    }
+    if cores is not None:
+        record["per_core"] = cores
+    record["window"] = args.window
+    record["startup_ms"] = round((time.perf_counter() - started - args.window) * 1000, 1)
+    if args.json:
+        sys.stdout.write(json.dumps(record) + "\n")
+        sys.stdout.flush()
+    else:
+        print_table(record)
+    elapsed_ms = (time.perf_counter() - started - args.window) * 1000
+    budget = DEFAULT_BUDGET_MS["json" if args.json else "table"] if args.once_budget is None else args.once_budget
+    if elapsed_ms > budget:
+        sys.stderr.write(f"sysmon_cli --once: {elapsed_ms:.1f} ms to output, over the {budget:g} ms budget\n")
+    return 0
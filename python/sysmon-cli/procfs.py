@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# =======================================================================================================================================================================
+#  File        : procfs.py
+#  Author      : Ionescu Robert-Constantin
+#  Date        : 2025-11-03
+#  Version     : 1.0
+#  Description : Direct /proc collector backend for sysmon_cli - keeps /proc files open and parses them in a single pass per tick.
+# =======================================================================================================================================================================
+#  Usage       : from procfs import ProcCollector
+# =======================================================================================================================================================================
+
+import os
+
+# =======================================================================================================================================================================
+# TO DO SECTION / Development Steps / Requirements
+# =======================================================================================================================================================================
+
+# TODO - STEP1 - Keep /proc/stat, /proc/meminfo and /proc/net/dev open for the lifetime of the collector
+# TODO - STEP2 - Reread each file with seek(0) + readinto() into a reused buffer (grow only when a file outgrows it)
+# TODO - STEP3 - Parse each file in a single pass, stopping as soon as the needed fields are found
+# TODO - STEP4 - Compute CPU percentages from /proc/stat deltas (same busy/idle split as psutil)
+# TODO - STEP5 - Return plain numbers so sysmon_cli can build its SystemStats without a circular import
+
+# =======================================================================================================================================================================
+# Constants / Variables / Classes
+# =======================================================================================================================================================================
+
+PROC_ROOT = "/proc"
+INITIAL_BUFFER_SIZE = 16 * 1024
+MEMINFO_KEYS = {b"MemTotal", b"MemAvailable", b"MemFree", b"Buffers", b"Cached"}
+
+# A /proc file that stays open and is reread into the same buffer on every tick
+class ProcFile:
+    # Method to open the file unbuffered and allocate the reusable buffer
+    def __init__(self, path, size=INITIAL_BUFFER_SIZE):
+        self.path = path
+        self._file = open(path, "rb", buffering=0)
+        self._buf = bytearray(size)
+        self._view = memoryview(self._buf)
+
+    # Method to reread the whole file, returning its current content as bytes
+    def read(self):
+        self._file.seek(0)
+        length = 0
+        while True:
+            if length == len(self._buf):
+                self._grow()
+            n = self._file.readinto(self._view[length:])
+            if not n:
+                break
+            length += n
+        return bytes(self._view[:length])
+
+    # Method to double the buffer when the file no longer fits
+    def _grow(self):
+        self._view.release()
+        self._buf.extend(bytes(len(self._buf)))
+        self._view = memoryview(self._buf)
+
+    # Method to close the underlying file descriptor
+    def close(self):
+        self._view.release()
+        self._file.close()
+
+# Collects CPU, memory, disk and network counters straight from /proc
+class ProcCollector:
+    # Method to open the /proc files and prime the CPU counters
+    def __init__(self, proc_root=PROC_ROOT, disk_path="/"):
+        self.disk_path = disk_path
+        self._stat = ProcFile(os.path.join(proc_root, "stat"))
+        self._meminfo = ProcFile(os.path.join(proc_root, "meminfo"))
+        self._netdev = ProcFile(os.path.join(proc_root, "net", "dev"))
+        self._prev_cpu = None
+        self._prev_cores = []
+        self.read_cpu(per_core=True)
+
+    # Method to read every metric once, returning (cpu, mem, disk, net_sent_bytes, net_recv_bytes, per_core)
+    def read(self, per_core=False):
+        cpu, cores = self.read_cpu(per_core)
+        mem = self.read_mem()
+        disk = self.read_disk()
+        sent, recv = self.read_net()
+        return cpu, mem, disk, sent, recv, cores
+
+    # Method to compute overall (and optionally per-core) CPU usage from /proc/stat deltas
+    def read_cpu(self, per_core=False):
+        total_times = None
+        core_times = []
+        for line in self._stat.read().split(b"\n"):
+            if not line.startswith(b"cpu"):
+                break
+            times = cpu_times(line)
+            if line[3:4] == b" ":
+                total_times = times
+                if not per_core:
+                    break
+            else:
+                core_times.append(times)
+
+        cpu = cpu_percent(self._prev_cpu, total_times)
+        self._prev_cpu = total_times
+        if not per_core:
+            return cpu, None
+
+        prev_cores = self._prev_cores
+        cores = [cpu_percent(prev_cores[i] if i < len(prev_cores) else None, times)
+                 for i, times in enumerate(core_times)]
+        self._prev_cores = core_times
+        return cpu, cores
+
+    # Method to compute memory usage (%) from MemTotal / MemAvailable
+    def read_mem(self):
+        fields = {}
+        for line in self._meminfo.read().split(b"\n"):
+            key, _, rest = line.partition(b":")
+            if key in MEMINFO_KEYS:
+                fields[key] = int(rest.split()[0])
+                if len(fields) == len(MEMINFO_KEYS):
+                    break
+
+        total = fields.get(b"MemTotal", 0)
+        if not total:
+            return 0.0
+        available = fields.get(b"MemAvailable")
+        if available is None:
+            available = fields.get(b"MemFree", 0) + fields.get(b"Buffers", 0) + fields.get(b"Cached", 0)
+        return round((total - available) / total * 100, 1)
+
+    # Method to compute disk usage (%) with the same formula as psutil.disk_usage()
+    def read_disk(self):
+        st = os.statvfs(self.disk_path)
+        used = (st.f_blocks - st.f_bfree) * st.f_frsize
+        avail = st.f_bavail * st.f_frsize
+        total_user = used + avail
+        return round(used / total_user * 100, 1) if total_user else 0.0
+
+    # Method to sum sent/received bytes over all interfaces in /proc/net/dev
+    def read_net(self):
+        sent = recv = 0
+        for line in self._netdev.read().split(b"\n")[2:]:
+            _, sep, counters = line.partition(b":")
+            if not sep:
+                continue
+            fields = counters.split()
+            recv += int(fields[0])
+            sent += int(fields[8])
+        return sent, recv
+
+    # Method to close all open /proc files
+    def close(self):
+        for proc_file in (self._stat, self._meminfo, self._netdev):
+            proc_file.close()
+
+# =======================================================================================================================================================================
+# Helper Functions
+# =======================================================================================================================================================================
+
+# Function to split a /proc/stat cpu line into (busy, total) jiffies
+def cpu_times(line):
+    values = [int(v) for v in line.split()[1:]]
+    # user nice system idle iowait irq softirq steal [guest guest_nice] - guest time is already counted in user/nice
+    total = sum(values[:8])
+    idle = values[3] + (values[4] if len(values) > 4 else 0)
+    return total - idle, total
+
+# Function to turn two (busy, total) samples into a usage percentage
+def cpu_percent(prev, current):
+    if prev is None or current is None:
+        return 0.0
+    busy_delta = current[0] - prev[0]
+    total_delta = current[1] - prev[1]
+    if total_delta <= 0:
+        return 0.0
+    return round(max(0.0, min(100.0, busy_delta / total_delta * 100)), 1)
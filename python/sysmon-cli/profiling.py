@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# =======================================================================================================================================================================
+#  File        : profiling.py
+#  Author      : Ionescu Robert-Constantin
+#  Date        : 2025-11-16
+#  Version     : 1.0
+#  Description : Loop timing instrumentation for sysmon_cli - per-stage durations, tick jitter and missed deadlines in fixed-bucket histograms.
+# =======================================================================================================================================================================
+#  Usage       : from profiling import LoopProfiler
+# =======================================================================================================================================================================
+
+import time
+from bisect import bisect_left
+
+# =======================================================================================================================================================================
+# TO DO SECTION / Development Steps / Requirements
+# =======================================================================================================================================================================
+
+# TODO - STEP1 - Fixed, preallocated log2 buckets from 1 µs to ~33 s - recording is one bisect and two additions
+# TODO - STEP2 - Time each loop stage (collect, health, render / JSON, export, log) with perf_counter laps
+# TODO - STEP3 - Record tick jitter (wake-up lateness) and count missed deadlines and skipped ticks instead of dropping them silently
+# TODO - STEP4 - Time every scheduled collector read so a slow collector shows up by name
+# TODO - STEP5 - Summarize count / mean / p50 / p95 / p99 / max per histogram for the exit report and JSON output
+
+# =======================================================================================================================================================================
+# Constants / Variables / Classes
+# =======================================================================================================================================================================
+
+BUCKET_BOUNDS = tuple(1e-6 * 2 ** k for k in range(26))   # upper bounds in seconds: 1 µs, 2 µs, ... ~33.5 s (+ overflow)
+
+# Histogram with fixed upper bounds - constant memory, no per-sample allocation
+class Histogram:
+    # Method to initialize empty buckets
+    def __init__(self, bounds=BUCKET_BOUNDS):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    # Method to record one duration in seconds
+    def record(self, value):
+        self.buckets[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    # Method to estimate a percentile (0-100) as the upper bound of the bucket that contains it
+    def percentile(self, q):
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= rank:
+                return min(self.bounds[i], self.max) if i < len(self.bounds) else self.max
+        return self.max
+
+    # Method to summarize the histogram in milliseconds
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50) * 1000, 3),
+            "p95_ms": round(self.percentile(95) * 1000, 3),
+            "p99_ms": round(self.percentile(99) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+# Per-stage timings, tick jitter and deadline counters for the monitor loop
+class LoopProfiler:
+    # Method to initialize the profiler; a disabled profiler makes every call a cheap no-op
+    def __init__(self, enabled=True, clock=time.perf_counter):
+        self.enabled = enabled
+        self.clock = clock
+        self.stages = {}
+        self.jitter = Histogram()
+        self.ticks = 0
+        self.missed = 0          # ticks that started after their deadline
+        self.skipped = 0         # whole intervals lost to overruns
+        self._mark = 0.0
+
+    # Method to start timing a new tick
+    def begin(self):
+        if self.enabled:
+            self._mark = self.clock()
+
+    # Method to record the time since the previous lap (or begin()) under a stage name
+    def lap(self, stage):
+        if not self.enabled:
+            return
+        now = self.clock()
+        self.record(stage, now - self._mark)
+        self._mark = now
+
+    # Method to record a duration for a stage measured elsewhere (e.g. a collector read)
+    def record(self, stage, seconds):
+        if not self.enabled:
+            return
+        histogram = self.stages.get(stage)
+        if histogram is None:
+            histogram = self.stages[stage] = Histogram()
+        histogram.record(seconds)
+
+    # Method to record how late (seconds after its deadline) a tick started
+    def tick(self, lateness):
+        if not self.enabled:
+            return
+        self.ticks += 1
+        self.jitter.record(max(0.0, lateness))
+
+    # Method to count a deadline that was missed because the previous tick overran
+    def overrun(self, skipped):
+        if not self.enabled:
+            return
+        self.missed += 1
+        self.skipped += skipped
+
+    # Method to summarize everything recorded so far
+    def summary(self):
+        return {
+            "ticks": self.ticks,
+            "missed_deadlines": self.missed,
+            "skipped_ticks": self.skipped,
+            "jitter": self.jitter.summary(),
+            "stages": {name: histogram.summary() for name, histogram in self.stages.items()},
+        }
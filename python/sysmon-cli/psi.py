@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# =======================================================================================================================================================================
+#  File        : psi.py
+#  Author      : Ionescu Robert-Constantin
+#  Date        : 2025-11-26
+#  Version     : 1.0
+#  Description : Pressure Stall Information for sysmon_cli - CPU / memory / IO stall averages and stall-time rates, system-wide and per cgroup.
+# =======================================================================================================================================================================
+#  Usage       : from psi import PressureMonitor
+# =======================================================================================================================================================================
+
+import os
+import time
+from dataclasses import dataclass
+
+from procfs import ProcFile, PROC_ROOT
+
+# =======================================================================================================================================================================
+# TO DO SECTION / Development Steps / Requirements
+# =======================================================================================================================================================================
+
+# TODO - STEP1 - Keep /proc/pressure/{cpu,memory,io} open and reread them in place each tick (ProcFile from procfs.py)
+# TODO - STEP2 - Parse the "some" / "full" lines: avg10 / avg60 / avg300 (%) and the total stall time (microseconds)
+# TODO - STEP3 - Stall rate = total stall time delta / elapsed time, so the figure covers exactly the last tick (avg10 lags)
+# TODO - STEP4 - Same parser for the per-cgroup cpu.pressure / memory.pressure / io.pressure files (see cgroups.py)
+# TODO - STEP5 - PSI health mode: score stall time instead of utilization - a busy CPU that nobody waits for costs nothing
+
+# =======================================================================================================================================================================
+# Constants / Variables / Classes
+# =======================================================================================================================================================================
+
+PRESSURE_DIR = "pressure"
+RESOURCES = ("cpu", "memory", "io")
+HEALTH_METRICS = {"cpu": "cpu", "memory": "mem", "io": "disk"}   # PSI resource -> health model metric
+# Stall % (of the "some" line) that counts as fully unhealthy; memory stalls hurt sooner than CPU or IO queueing
+CRITICAL_STALL = {"cpu": 50.0, "memory": 25.0, "io": 50.0}
+
+@dataclass
+class Pressure:
+    resource: str
+    some_avg10: float = 0.0     # % of time at least one task stalled, kernel running averages
+    some_avg60: float = 0.0
+    some_avg300: float = 0.0
+    some_percent: float = 0.0   # % of the last interval at least one task stalled (from the total counter)
+    full_avg10: float = 0.0     # % of time all non-idle tasks stalled at once
+    full_avg60: float = 0.0
+    full_avg300: float = 0.0
+    full_percent: float = 0.0
+
+# Reads system-wide pressure for every resource the kernel reports
+class PressureMonitor:
+    # Method to open the /proc/pressure files (raises OSError when the kernel has no PSI) and take the baseline sample
+    def __init__(self, proc_root=PROC_ROOT, resources=RESOURCES, clock=time.monotonic):
+        self.clock = clock
+        self._files = {}
+        for resource in resources:
+            try:
+                self._files[resource] = ProcFile(os.path.join(proc_root, PRESSURE_DIR, resource))
+            except OSError:
+                continue            # resource not reported by this kernel
+        if not self._files:
+            raise OSError(f"no pressure information in {os.path.join(proc_root, PRESSURE_DIR)} (kernel without CONFIG_PSI or psi=0)")
+        self._prev = {}
+        self._prev_time = None
+        self.collect()
+
+    # Method to read every resource and return {resource: Pressure} (rates are 0 on the first call)
+    def collect(self):
+        now = self.clock()
+        elapsed = now - self._prev_time if self._prev_time is not None else 0.0
+        result = {}
+        totals = {}
+        for resource, file in self._files.items():
+            lines = parse_pressure(file.read())
+            totals[resource] = stall_totals(lines)
+            result[resource] = pressure_from(resource, lines, self._prev.get(resource), totals[resource], elapsed)
+        self._prev = totals
+        self._prev_time = now
+        return result
+
+    # Method to close the pressure files
+    def close(self):
+        for file in self._files.values():
+            file.close()
+
+# =======================================================================================================================================================================
+# Helper Functions
+# =======================================================================================================================================================================
+
+# Function to parse a pressure file into {"some": (avg10, avg60, avg300, total_us), "full": (...)}
+def parse_pressure(data):
+    lines = {}
+    for line in data.split(b"\n"):
+        kind, _, rest = line.partition(b" ")
+        if not rest:
+            continue
+        values = [field.partition(b"=")[2] for field in rest.split()]
+        lines[kind.decode()] = (float(values[0]), float(values[1]), float(values[2]), int(values[3]))
+    return lines
+
+# Function to pick the (some, full) total stall counters from parsed lines
+def stall_totals(lines):
+    return tuple(lines[kind][3] if kind in lines else 0 for kind in ("some", "full"))
+
+# Function to convert a stall counter delta (microseconds) over `elapsed` seconds into a percentage of time
+def stall_percent(old, new, elapsed):
+    if old is None or elapsed <= 0 or new < old:
+        return 0.0
+    return round(min(100.0, (new - old) / (elapsed * 1e4)), 2)
+
+# Function to build a Pressure from parsed lines and the previous (some, full) totals
+def pressure_from(resource, lines, prev, totals, elapsed):
+    some = lines.get("some", (0.0, 0.0, 0.0, 0))
+    full = lines.get("full", (0.0, 0.0, 0.0, 0))
+    prev_some, prev_full = prev if prev is not None else (None, None)
+    return Pressure(resource, *some[:3], stall_percent(prev_some, totals[0], elapsed),
+                    *full[:3], stall_percent(prev_full, totals[1], elapsed))
+
+# Function to scale a stall % to a health model input (0-100, 100 = critical stall for that resource)
+def stall_score(resource, percent):
+    return min(100.0, percent / CRITICAL_STALL[resource] * 100)
+
+# Function to turn system-wide pressure into health model inputs - "some" stall time over the last tick
+def pressure_values(pressure):
+    values = {"cpu": 0.0, "mem": 0.0, "disk": 0.0}
+    for resource, entry in (pressure or {}).items():
+        values[HEALTH_METRICS[resource]] = stall_score(resource, entry.some_percent)
+    return values
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# =======================================================================================================================================================================
+#  File        : replay.py
+#  Author      : Ionescu Robert-Constantin
+#  Date        : 2025-11-22
+#  Version     : 1.0
+#  Description : Replay of recorded sysmon_cli logs - streams CSV / gzip / binary logs through the live pipeline at N x real time or as fast as possible.
+# =======================================================================================================================================================================
+#  Usage       : python3 sysmon_cli.py --replay system_log.csv --speed 100x [--alerts] [--live | --ndjson]
+# =======================================================================================================================================================================
+
+import asyncio
+import csv
+import gzip
+import time
+from datetime import datetime
+
+from binlog import is_binary_log, open_binary_log
+
+# =======================================================================================================================================================================
+# TO DO SECTION / Development Steps / Requirements
+# =======================================================================================================================================================================
+
+# TODO - STEP1 - Stream samples row by row from CSV (plain or .gz) and chunk by chunk from binary logs - never load a whole file
+# TODO - STEP2 - Yield scheduler-style snapshots carrying the recorded timestamp, so health / trends / display / JSON / alerts run unchanged
+# TODO - STEP3 - Pace samples at N x the recorded rate against absolute deadlines, or not at all with --speed max
+# TODO - STEP4 - Expose the recorded time as a clock so rate-based detectors see the original time base, not the replay speed
+# TODO - STEP5 - Report how many samples were replayed and the pipeline throughput
+
+# =======================================================================================================================================================================
+# Constants / Variables / Classes
+# =======================================================================================================================================================================
+
+CHUNK_ROWS = 10_000
+YIELD_EVERY = 1000              # at max speed, give other tasks (exporter, collectors) a turn every N samples
+
+# Plays one or more logs (e.g. rotated segments, in order) as a stream of snapshots
+class Replayer:
+    # Method to initialize the replay; speed is a real-time multiplier, None for as fast as possible
+    def __init__(self, paths, speed=None):
+        self.paths = [paths] if isinstance(paths, str) else list(paths)
+        self.speed = speed
+        self.samples = 0
+        self.first = None
+        self.time = None            # recorded timestamp of the current sample (epoch seconds)
+        self.started = None
+        self.finished = None
+
+    # Method to return the recorded time of the current sample (used as the anomaly detector clock)
+    def now(self):
+        return self.time if self.time is not None else 0.0
+
+    # Method to yield one snapshot per recorded sample, paced against absolute deadlines
+    async def ticks(self):
+        loop = asyncio.get_running_loop()
+        self.started = time.perf_counter()
+        anchor = None
+        try:
+            for path in self.paths:
+                for ts, cpu, mem, disk, sent, recv in iter_samples(path):
+                    if self.speed:
+                        if anchor is None or ts < self.time:  # first sample, or the clock jumped back between segments
+                            anchor = (loop.time(), ts)
+                        delay = anchor[0] + (ts - anchor[1]) / self.speed - loop.time()
+                        if delay > 0:
+                            await asyncio.sleep(delay)
+                    elif self.samples % YIELD_EVERY == 0:
+                        await asyncio.sleep(0)
+                    if self.first is None:
+                        self.first = ts
+                    self.time = ts
+                    self.samples += 1
+                    yield {"cpu": (cpu, None), "mem": mem, "disk": disk, "net": (sent, recv), "timestamp": ts}
+        finally:
+            self.finished = time.perf_counter()
+
+    # Method to summarize the replay (recorded span, wall time, throughput)
+    def summary(self):
+        elapsed = (self.finished or time.perf_counter()) - (self.started or time.perf_counter())
+        result = {"samples": self.samples, "elapsed": round(elapsed, 3),
+                  "samples_per_second": round(self.samples / elapsed, 1) if elapsed > 0 else None}
+        if self.first is not None:
+            result["start"] = datetime.fromtimestamp(self.first).isoformat(sep=" ")
+            result["end"] = datetime.fromtimestamp(self.time).isoformat(sep=" ")
+        return result
+
+# =======================================================================================================================================================================
+# Helper Functions
+# =======================================================================================================================================================================
+
+# Function to parse a --speed value: "100x", "100", "0.5x" or "max" (returns None for max)
+def parse_speed(text):
+    text = str(text).strip().lower()
+    if text == "max":
+        return None
+    try:
+        speed = float(text[:-1] if text.endswith("x") else text)
+    except ValueError:
+        raise ValueError(f"invalid replay speed {text!r} (use e.g. 100x, 0.5x or max)") from None
+    if speed <= 0:
+        raise ValueError("replay speed must be positive")
+    return speed
+
+# Function to stream (timestamp, cpu, mem, disk, net_sent, net_recv) tuples from a log of either format
+def iter_samples(path):
+    if not path.endswith(".gz") and is_binary_log(path):
+        return iter_binary_samples(path)
+    return iter_csv_samples(path)
+
+# Function to stream samples from a CSV log (plain or .gz), skipping repeated headers and damaged rows
+def iter_csv_samples(path):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        try:
+            columns = [header.index(name) for name in ("timestamp", "cpu", "mem", "disk", "net_sent", "net_recv")]
+        except ValueError:
+            raise ValueError(f"{path}: not a sysmon log") from None
+        width = len(header)
+        ts_col, cpu_col, mem_col, disk_col, sent_col, recv_col = columns
+        for row in reader:
+            if len(row) != width:
+                continue
+            try:
+                yield (datetime.fromisoformat(row[ts_col]).timestamp(), float(row[cpu_col]), float(row[mem_col]),
+                       float(row[disk_col]), int(float(row[sent_col])), int(float(row[recv_col])))
+            except ValueError:
+                continue
+
+# Function to stream samples from a binary log, one memory-mapped chunk at a time
+def iter_binary_samples(path, chunk_rows=CHUNK_ROWS):
+    log = open_binary_log(path)
+    for start in range(0, len(log), chunk_rows):
+        block = log.records[start:start + chunk_rows]
+        yield from zip(block["timestamp"].tolist(), *(block[field].astype(float).round(2).tolist()
+                                                      for field in ("cpu", "mem", "disk")),
+                       block["net_sent"].tolist(), block["net_recv"].tolist())
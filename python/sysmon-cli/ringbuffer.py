@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# =======================================================================================================================================================================
+#  File        : ringbuffer.py
+#  Author      : Ionescu Robert-Constantin
+#  Date        : 2025-11-04
+#  Version     : 1.0
+#  Description : Fixed-size numeric ring buffer and background sampler - decouples the sampling rate from the render rate in sysmon_cli.
+# =======================================================================================================================================================================
+#  Usage       : from ringbuffer import RingBuffer, Sampler
+# =======================================================================================================================================================================
+
+import threading
+import time
+from array import array
+
+# =======================================================================================================================================================================
+# TO DO SECTION / Development Steps / Requirements
+# =======================================================================================================================================================================
+
+# TODO - STEP1 - Preallocate one array('d') column per metric, overwrite the oldest sample when full
+# TODO - STEP2 - Summarize the newest N samples as (min, mean, max) per metric without copying the whole buffer
+# TODO - STEP3 - Run a drift-free sampler thread at 10-100 Hz that appends into the ring buffer
+# TODO - STEP4 - Let the render loop read the window of samples collected since its previous read
+
+# =======================================================================================================================================================================
+# Constants / Variables / Classes
+# =======================================================================================================================================================================
+
+FIELDS = ("cpu", "mem", "disk", "net_sent", "net_recv")
+
+# Preallocated, array-backed ring buffer of numeric samples (one column per field)
+class RingBuffer:
+    # Method to allocate all columns up front
+    def __init__(self, capacity, fields=FIELDS):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.fields = tuple(fields)
+        self.count = 0      # total samples ever written
+        self._head = 0      # next write position
+        self._columns = [array("d", bytes(8 * capacity)) for _ in self.fields]
+        self._lock = threading.Lock()
+
+    # Method to return the number of samples currently held
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    # Method to write one sample (values in field order), overwriting the oldest when full
+    def append(self, values):
+        with self._lock:
+            head = self._head
+            for column, value in zip(self._columns, values):
+                column[head] = value
+            self._head = (head + 1) % self.capacity
+            self.count += 1
+
+    # Method to return the newest n values of one field, oldest first
+    def tail(self, field, n=None):
+        with self._lock:
+            return self._tail(self._columns[self.fields.index(field)], self._clip(n))
+
+    # Method to summarize the newest n samples as {field: (min, mean, max)} plus the sample count
+    def summary(self, n=None):
+        with self._lock:
+            n = self._clip(n)
+            if n == 0:
+                return None
+            result = {"samples": n}
+            for name, column in zip(self.fields, self._columns):
+                values = self._tail(column, n)
+                result[name] = (min(values), sum(values) / n, max(values))
+            return result
+
+    # Method to limit a requested window to what the buffer actually holds
+    def _clip(self, n):
+        held = min(self.count, self.capacity)
+        return held if n is None else max(0, min(n, held))
+
+    # Method to slice the newest n values out of a column (handles wrap-around)
+    def _tail(self, column, n):
+        start = self._head - n
+        if start >= 0:
+            return column[start:self._head]
+        return column[start:] + column[:self._head]
+
+# Background thread that samples at a fixed rate into a RingBuffer
+class Sampler(threading.Thread):
+    # Method to initialize the sampler; read_sample() must return an object with the buffer's fields as attributes
+    def __init__(self, read_sample, rate_hz, buffer):
+        super().__init__(name="sysmon-sampler", daemon=True)
+        if rate_hz <= 0:
+            raise ValueError("rate_hz must be positive")
+        self.read_sample = read_sample
+        self.period = 1.0 / rate_hz
+        self.buffer = buffer
+        self.latest = None
+        self._last_read = 0
+        self._stop_event = threading.Event()
+
+    # Method to take the first sample synchronously so a window is available immediately
+    def start(self):
+        self._sample_once()
+        super().start()
+
+    # Method to sample until stopped, sleeping to the next deadline (skipping missed ones)
+    def run(self):
+        next_time = time.monotonic()
+        while not self._stop_event.is_set():
+            next_time += self.period
+            sleep_time = next_time - time.monotonic()
+            if sleep_time > 0:
+                if self._stop_event.wait(sleep_time):
+                    break
+            else:
+                next_time = time.monotonic()
+            self._sample_once()
+
+    # Method to read one sample and store it in the ring buffer
+    def _sample_once(self):
+        sample = self.read_sample()
+        self.latest = sample
+        self.buffer.append([getattr(sample, name) for name in self.buffer.fields])
+
+    # Method to summarize the samples taken since the previous call (at least the newest one)
+    def window(self):
+        count = self.buffer.count
+        new = count - self._last_read
+        self._last_read = count
+        return self.buffer.summary(max(1, new))
+
+    # Method to stop the sampler thread and wait for it to exit
+    def stop(self):
+        self._stop_event.set()
+        if self.is_alive():
+            self.join()
+
+# =======================================================================================================================================================================
+# Helper Functions
+# =======================================================================================================================================================================
+
+# Function to size the ring buffer so it holds at least two render intervals of samples
+def ring_capacity(rate_hz, interval):
+    return max(1, int(rate_hz * interval * 2) + 1)
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# =======================================================================================================================================================================
+#  File        : rrd.py
+#  Author      : Ionescu Robert-Constantin
+#  Date        : 2025-11-10
+#  Version     : 1.0
+#  Description : Round-robin (RRD-style) storage for sysmon_cli - raw samples plus 1-minute and 1-hour rollups in one fixed-size, preallocated file.
+# =======================================================================================================================================================================
+#  Usage       : from rrd import RoundRobinStore
+# =======================================================================================================================================================================
+
+import math
+import mmap
+import os
+import struct
+
+# =======================================================================================================================================================================
+# TO DO SECTION / Development Steps / Requirements
+# =======================================================================================================================================================================
+
+# TODO - STEP1 - Lay out a header, one descriptor per tier and one circular row array per tier in a single file
+# TODO - STEP2 - Preallocate the whole file up front (fallocate where available) so it never grows after creation
+# TODO - STEP3 - Write raw samples into the raw tier, overwriting the oldest row when it wraps
+# TODO - STEP4 - Roll each sample incrementally into the open 1-minute / 1-hour slot (min, max, avg, last) - no rescans
+# TODO - STEP5 - Update rows in place through mmap; reopen an existing file and continue where it stopped
+# TODO - STEP6 - Provide a reader that returns each tier's rows in time order
+
+# =======================================================================================================================================================================
+# Constants / Variables / Classes
+# =======================================================================================================================================================================
+
+MAGIC = b"SYSMRRD\x00"
+VERSION = 1
+HEADER = struct.Struct("<8sHHH")           # magic, version, tier count, metric count (padded to HEADER_SIZE)
+HEADER_SIZE = 64
+TIER = struct.Struct("<dIIdQ")             # step seconds (0 = raw), rows, head row, open slot start, rows ever written
+METRICS = ("cpu", "mem", "disk", "health", "net_sent", "net_recv")
+CONSOLIDATIONS = ("min", "max", "avg", "last")
+
+DEFAULT_TIERS = (("raw", 0), ("1min", 60), ("1h", 3600))
+
+# Fixed-size round-robin store with raw, 1-minute and 1-hour tiers
+class RoundRobinStore:
+    # Method to open (or create and preallocate) the store; rows maps tier name -> row count
+    def __init__(self, path, rows, tiers=DEFAULT_TIERS, metrics=METRICS):
+        self.path = path
+        self.tier_names = [name for name, _ in tiers]
+        self.steps = [float(step) for _, step in tiers]
+        self.rows = [int(rows[name]) for name in self.tier_names]
+        if min(self.rows) < 1:
+            raise ValueError("every tier needs at least one row")
+        self.metrics = tuple(metrics)
+        self.row = struct.Struct("<dd" + "d" * len(CONSOLIDATIONS) * len(self.metrics))
+        self.size = self._layout()
+
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if exists:
+                self._check_existing()
+            else:
+                self._preallocate()
+            self._map = mmap.mmap(self._fd, self.size)
+        except Exception:
+            os.close(self._fd)
+            raise
+        if not exists:
+            self._write_header()
+        self._state = [list(TIER.unpack_from(self._map, self._tier_offset(i))) for i in range(len(self.steps))]
+
+    # Method to store one sample (values in metric order) in every tier
+    def update(self, ts, values):
+        for i, step in enumerate(self.steps):
+            state = self._state[i]
+            if step == 0:
+                self._advance(i, ts)
+                self._write_row(i, ts, 1, values)
+                continue
+            slot = math.floor(ts / step) * step
+            if state[4] == 0 or slot > state[3]:
+                self._advance(i, slot)
+                self._write_row(i, slot, 1, values)
+            else:
+                self._merge_row(i, values)  # same slot (or clock stepped back): fold into the open slot
+
+    # Method to return a tier's rows in time order as (timestamp, count, {metric: {min, max, avg, last}})
+    def fetch(self, tier):
+        i = self.tier_names.index(tier)
+        _, rows, head, _, written = self._state[i]
+        count = min(written, rows)
+        result = []
+        for k in range(count):
+            index = (head - count + 1 + k) % rows
+            data = self.row.unpack_from(self._map, self._row_offset(i, index))
+            metrics = {}
+            for m, name in enumerate(self.metrics):
+                chunk = data[2 + m * len(CONSOLIDATIONS): 2 + (m + 1) * len(CONSOLIDATIONS)]
+                metrics[name] = dict(zip(CONSOLIDATIONS, chunk))
+            result.append((data[0], int(data[1]), metrics))
+        return result
+
+    # Method to push the mapped pages to disk
+    def flush(self):
+        self._map.flush()
+
+    # Method to flush and close the store
+    def close(self):
+        if self._map is None:
+            return
+        self._map.flush()
+        self._map.close()
+        os.close(self._fd)
+        self._map = None
+
+    # Method to compute tier offsets and the total file size
+    def _layout(self):
+        offset = HEADER_SIZE + TIER.size * len(self.steps)
+        self._offsets = []
+        for rows in self.rows:
+            self._offsets.append(offset)
+            offset += rows * self.row.size
+        return offset
+
+    # Method to reserve the full file size on disk
+    def _preallocate(self):
+        if hasattr(os, "posix_fallocate"):
+            try:
+                os.posix_fallocate(self._fd, 0, self.size)
+                return
+            except OSError:
+                pass  # e.g. tmpfs / filesystems without fallocate support
+        os.ftruncate(self._fd, self.size)
+
+    # Method to verify that an existing file has exactly the requested layout
+    def _check_existing(self):
+        if os.fstat(self._fd).st_size != self.size:
+            raise ValueError(f"{self.path}: existing round-robin store has a different size/layout")
+        header = os.pread(self._fd, HEADER_SIZE + TIER.size * len(self.steps), 0)
+        magic, version, tiers, metrics = HEADER.unpack_from(header)
+        if magic != MAGIC or version != VERSION or tiers != len(self.steps) or metrics != len(self.metrics):
+            raise ValueError(f"{self.path}: not a compatible round-robin store")
+        for i, (step, rows) in enumerate(zip(self.steps, self.rows)):
+            stored_step, stored_rows = TIER.unpack_from(header, HEADER_SIZE + i * TIER.size)[:2]
+            if stored_step != step or stored_rows != rows:
+                raise ValueError(f"{self.path}: tier {self.tier_names[i]} layout differs from the requested one")
+
+    # Method to write the header and empty tier descriptors into a new file
+    def _write_header(self):
+        self._map[:HEADER_SIZE] = HEADER.pack(MAGIC, VERSION, len(self.steps), len(self.metrics)).ljust(HEADER_SIZE, b"\x00")
+        for i, (step, rows) in enumerate(zip(self.steps, self.rows)):
+            TIER.pack_into(self._map, self._tier_offset(i), step, rows, 0, 0.0, 0)
+
+    # Method to move a tier's head to the next row (the oldest one once the tier is full)
+    def _advance(self, i, slot):
+        state = self._state[i]
+        if state[4]:
+            state[2] = (state[2] + 1) % state[1]
+        state[3] = slot
+        state[4] += 1
+        TIER.pack_into(self._map, self._tier_offset(i), *state)
+
+    # Method to write a fresh row at a tier's head
+    def _write_row(self, i, ts, count, values):
+        data = [ts, count]
+        for value in values:
+            data += (value, value, value, value)
+        self.row.pack_into(self._map, self._row_offset(i, self._state[i][2]), *data)
+
+    # Method to fold one sample into the open row of a rollup tier
+    def _merge_row(self, i, values):
+        offset = self._row_offset(i, self._state[i][2])
+        data = list(self.row.unpack_from(self._map, offset))
+        count = data[1] + 1
+        data[1] = count
+        for m, value in enumerate(values):
+            base = 2 + m * len(CONSOLIDATIONS)
+            data[base] = min(data[base], value)
+            data[base + 1] = max(data[base + 1], value)
+            data[base + 2] += (value - data[base + 2]) / count
+            data[base + 3] = value
+        self.row.pack_into(self._map, offset, *data)
+
+    # Method to return the byte offset of a tier descriptor
+    def _tier_offset(self, i):
+        return HEADER_SIZE + i * TIER.size
+
+    # Method to return the byte offset of a row in a tier
+    def _row_offset(self, i, index):
+        return self._offsets[i] + index * self.row.size
+
+# =======================================================================================================================================================================
+# Helper Functions
+# =======================================================================================================================================================================
+
+# Function to parse a duration such as "90", "30m", "12h" or "7d" into seconds
+def parse_duration(text):
+    units = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+    text = str(text).strip().lower()
+    try:
+        if text and text[-1] in units:
+            return float(text[:-1]) * units[text[-1]]
+        return float(text)
+    except ValueError:
+        raise ValueError(f"invalid duration {text!r} (expected e.g. 90, 30m, 12h or 7d)") from None
+
+# Function to turn retention periods into row counts for each tier
+def tier_rows(interval, raw_retention, minute_retention, hour_retention):
+    return {
+        "raw": max(1, math.ceil(raw_retention / interval)),
+        "1min": max(1, math.ceil(minute_retention / 60)),
+        "1h": max(1, math.ceil(hour_retention / 3600)),
+    }
+
+# Function to read the row counts stored in an existing store's header ({tier: rows}); None when there is no store yet
+def stored_rows(path, tiers=DEFAULT_TIERS):
+    try:
+        with open(path, "rb") as f:
+            header = f.read(HEADER_SIZE + TIER.size * len(tiers))
+    except FileNotFoundError:
+        return None
+    if not header:
+        return None
+    if len(header) < HEADER_SIZE + TIER.size * len(tiers):
+        raise ValueError(f"{path}: not a compatible round-robin store")
+    magic, version, count, _ = HEADER.unpack_from(header)
+    if magic != MAGIC or version != VERSION or count != len(tiers):
+        raise ValueError(f"{path}: not a compatible round-robin store")
+    rows = {}
+    for i, (name, step) in enumerate(tiers):
+        stored_step, stored = TIER.unpack_from(header, HEADER_SIZE + i * TIER.size)[:2]
+        if stored_step != step:
+            raise ValueError(f"{path}: tier {name} has a {stored_step:g} s step, not {step} s")
+        rows[name] = stored
+    return rows
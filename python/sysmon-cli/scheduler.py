@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# =======================================================================================================================================================================
+#  File        : scheduler.py
+#  Author      : Ionescu Robert-Constantin
+#  Date        : 2025-11-15
+#  Version     : 1.0
+#  Description : Asyncio multi-rate collector scheduler for sysmon_cli - every collector runs on its own period and publishes into a shared latest-state snapshot.
+# =======================================================================================================================================================================
+#  Usage       : from scheduler import Collector, Scheduler
+# =======================================================================================================================================================================
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from workers import DaemonWorker
+
+# =======================================================================================================================================================================
+# TO DO SECTION / Development Steps / Requirements
+# =======================================================================================================================================================================
+
+# TODO - STEP1 - Give every collector its own period (CPU 1 s, memory 5 s, disk 60 s, network 1 s by default)
+# TODO - STEP2 - Run each collector in its own task with absolute deadlines, skipping ticks it overran
+# TODO - STEP3 - Run blocking collectors (statvfs, process scans) on their own daemon thread so a slow one never delays the others or exit
+# TODO - STEP4 - Publish results into a shared latest-state snapshot; a failing collector keeps its last value
+# TODO - STEP5 - Let consumers (display, JSON, logs, exporter) subscribe to the snapshot at their own interval
+# TODO - STEP6 - Retime at run time: scale every period, wake sleeping collectors so a shorter period applies at once (see adaptive.py)
+
+# =======================================================================================================================================================================
+# Constants / Variables / Classes
+# =======================================================================================================================================================================
+
+DEFAULT_PERIODS = {"cpu": 1.0, "mem": 5.0, "disk": 60.0, "net": 1.0}
+
+@dataclass
+class Collector:
+    name: str
+    period: float               # seconds between reads
+    read: Callable              # returns the value stored under `name` in the snapshot
+    blocking: bool = True       # run on a worker thread instead of on the event loop
+
+# Latest value of every collector, shared by all consumers
+class LatestState:
+    # Method to initialize an empty state
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self.values = {}
+        self.updated = {}
+        self.errors = {}
+        self.version = 0
+
+    # Method to store a collector result
+    def set(self, name, value):
+        self.values[name] = value
+        self.updated[name] = self.clock()
+        self.errors.pop(name, None)
+        self.version += 1
+
+    # Method to return a copy of the current values (consumers never see a half-updated dict)
+    def snapshot(self):
+        return dict(self.values)
+
+# Runs collectors at independent rates on one event loop
+class Scheduler:
+    # Method to initialize the scheduler; on_error(name, exception) is called when a read fails
+    def __init__(self, collectors, on_error=None, profiler=None):
+        self.collectors = list(collectors)
+        for collector in self.collectors:
+            if collector.period <= 0:
+                raise ValueError(f"collector {collector.name}: period must be positive")
+        self.on_error = on_error
+        self.profiler = profiler
+        self.state = LatestState()
+        self.base_periods = {collector.name: collector.period for collector in self.collectors}
+        self.runs = {collector.name: 0 for collector in self.collectors}
+        self._workers = {}
+        self._tasks = []
+        self._first_round = {}
+        self._sleeping = set()
+
+    # Method to start every collector and wait (at most `timeout` seconds) until each has reported once
+    async def start(self, timeout=None):
+        loop = asyncio.get_running_loop()
+        self._first_round = {collector.name: loop.create_future() for collector in self.collectors}
+        # one daemon worker per blocking collector: each has at most one read in flight, so a hung one cannot starve the rest
+        self._workers = {collector.name: DaemonWorker(f"sysmon-{collector.name}") for collector in self.collectors if collector.blocking}
+        self._tasks = [asyncio.create_task(self._run(collector), name=f"sysmon-{collector.name}")
+                       for collector in self.collectors]
+        if self._first_round:
+            await asyncio.wait(list(self._first_round.values()), timeout=timeout)
+
+    # Method to yield a snapshot every `interval` seconds (absolute deadlines, missed ticks are skipped and reported to the profiler);
+    # `interval` may be a callable, read again after every tick
+    async def subscribe(self, interval):
+        loop = asyncio.get_running_loop()
+        profiler = self.profiler
+        next_time = loop.time()
+        while True:
+            yield self.state.snapshot()
+            step = interval() if callable(interval) else interval
+            next_time += step
+            delay = next_time - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                lateness = loop.time() - next_time
+            else:
+                lateness = -delay
+                if profiler:
+                    profiler.overrun(int(lateness // step))
+                next_time = loop.time()
+            if profiler:
+                profiler.tick(lateness)
+
+    # Method to set every collector period to its initial period times `scale`; sleeping collectors re-check their deadline at once
+    def retime(self, scale):
+        if scale <= 0:
+            raise ValueError("scale must be positive")
+        for collector in self.collectors:
+            collector.period = self.base_periods[collector.name] * scale
+        for future in list(self._sleeping):
+            resolve(future, True)
+
+    # Method to cancel the collector tasks without waiting for reads still stuck in a worker thread
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for worker in self._workers.values():
+            worker.close()
+        self._workers = {}
+
+    # Method to read one collector on its own period until cancelled
+    async def _run(self, collector):
+        loop = asyncio.get_running_loop()
+        next_time = loop.time()
+        while True:
+            await self._read(collector)
+            first = self._first_round.get(collector.name)
+            if first is not None and not first.done():
+                first.set_result(None)
+            tick = next_time
+            next_time = tick + collector.period
+            while (delay := next_time - loop.time()) > 0:
+                if not await self._sleep(delay):
+                    break
+                next_time = min(next_time, tick + collector.period)  # retimed: a shorter period brings the next read forward
+            else:
+                next_time = loop.time()  # the read overran its period: skip the missed ticks
+
+    # Method to sleep for `delay` seconds; returns True if retime() cut the sleep short
+    async def _sleep(self, delay):
+        future = asyncio.get_running_loop().create_future()
+        handle = future.get_loop().call_later(delay, resolve, future, False)
+        self._sleeping.add(future)
+        try:
+            return await future
+        finally:
+            handle.cancel()
+            self._sleeping.discard(future)
+
+    # Method to read one collector and publish the result (errors keep the previous value)
+    async def _read(self, collector):
+        started = time.perf_counter()
+        try:
+            if collector.blocking:
+                value = await asyncio.wrap_future(self._workers[collector.name].submit(collector.read))
+            else:
+                value = collector.read()
+        except Exception as e:
+            self.state.errors[collector.name] = e
+            if self.on_error:
+                self.on_error(collector.name, e)
+            return
+        finally:
+            if self.profiler:
+                self.profiler.record(f"read:{collector.name}", time.perf_counter() - started)
+        self.runs[collector.name] += 1
+        self.state.set(collector.name, value)
+
+# =======================================================================================================================================================================
+# Helper Functions
+# =======================================================================================================================================================================
+
+# Function to complete a sleep future unless it is already done (timer and retime() may race)
+def resolve(future, value):
+    if not future.done():
+        future.set_result(value)
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# =======================================================================================================================================================================
+#  File        : shm.py
+#  Author      : Ionescu Robert-Constantin
+#  Date        : 2025-11-27
+#  Version     : 1.0
+#  Description : Shared-memory publication of the latest sysmon_cli sample - fixed layout, seqlock-protected, with a small reader API for local consumers.
+# =======================================================================================================================================================================
+#  Usage       : from shm import SampleReader; reader = SampleReader("sysmon"); sample = reader.read()
+# =======================================================================================================================================================================
+
+import os
+import struct
+import time
+from collections import namedtuple
+from multiprocessing import resource_tracker, shared_memory
+
+# =======================================================================================================================================================================
+# TO DO SECTION / Development Steps / Requirements
+# =======================================================================================================================================================================
+
+# TODO - STEP1 - Fixed little-endian layout: 64-byte header (magic, version, payload size, writer pid, sequence), one sample, trailer sequence
+# TODO - STEP2 - Seqlock writer: sequence goes odd, payload + trailer are written, sequence goes even - no locks, readers never block the writer
+# TODO - STEP3 - Reader copies the sample straight out of the mapping and retries while a write is in progress or the copy was torn
+# TODO - STEP4 - Take over a segment left behind by a dead writer, refuse one owned by a live monitor
+# TODO - STEP5 - Readers attach without registering the segment with the resource tracker (it would unlink it when they exit)
+
+# =======================================================================================================================================================================
+# Constants / Variables / Classes
+# =======================================================================================================================================================================
+
+DEFAULT_NAME = "sysmon"
+MAGIC = b"SYSMONS\x00"
+VERSION = 1
+HEADER = struct.Struct("<8sHHI")          # magic, version, payload size, writer pid (0 once the writer has stopped)
+SEQUENCE = struct.Struct("<Q")            # even = stable, odd = write in progress; 0 in both copies = nothing published yet
+SEQUENCE_OFFSET = 16
+HEADER_SIZE = 64
+FIELDS = ("timestamp", "cpu", "mem", "disk", "health", "net_sent", "net_recv", "interval")
+PAYLOAD = struct.Struct("<dddddQQd")      # epoch seconds, 4 x percentages, 2 x KB counters, sampling interval (64 bytes)
+TRAILER_OFFSET = HEADER_SIZE + PAYLOAD.size
+SEGMENT_SIZE = TRAILER_OFFSET + SEQUENCE.size
+READ_TIMEOUT = 0.1
+
+Sample = namedtuple("Sample", ("sequence",) + FIELDS)
+
+# Publishes the latest sample into a named shared-memory segment
+class SamplePublisher:
+    # Method to create the segment (or take over one left by a dead writer) and write the header
+    def __init__(self, name=DEFAULT_NAME):
+        self.name = name
+        try:
+            self._shm = shared_memory.SharedMemory(name, create=True, size=SEGMENT_SIZE)
+        except FileExistsError:
+            self._shm = attach(name)
+            owner = writer_pid(self._shm.buf) if self._shm.size >= SEGMENT_SIZE else 0
+            if self._shm.size < SEGMENT_SIZE or (owner and owner != os.getpid() and pid_alive(owner)):
+                self._shm.close()
+                raise FileExistsError(f"shared memory segment {name!r} is in use"
+                                      f"{f' by pid {owner}' if owner else ''} - choose another --shm name")
+            adopt(self._shm)
+        self._buf = self._shm.buf
+        self._sequence = 0
+        SEQUENCE.pack_into(self._buf, SEQUENCE_OFFSET, 0)
+        SEQUENCE.pack_into(self._buf, TRAILER_OFFSET, 0)
+        HEADER.pack_into(self._buf, 0, MAGIC, VERSION, PAYLOAD.size, os.getpid())
+
+    # Method to publish one sample (timestamp, cpu, mem, disk, health, net_sent, net_recv, interval)
+    def publish(self, values):
+        sequence = self._sequence + 2
+        SEQUENCE.pack_into(self._buf, SEQUENCE_OFFSET, sequence - 1)
+        PAYLOAD.pack_into(self._buf, HEADER_SIZE, *values)
+        SEQUENCE.pack_into(self._buf, TRAILER_OFFSET, sequence)
+        SEQUENCE.pack_into(self._buf, SEQUENCE_OFFSET, sequence)
+        self._sequence = sequence
+
+    # Method to mark the writer as gone and remove the segment (readers keep their mapping of the last sample)
+    def close(self):
+        HEADER.pack_into(self._buf, 0, MAGIC, VERSION, PAYLOAD.size, 0)
+        self._buf = None
+        self._shm.close()
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+
+# Reads the latest published sample without syscalls or parsing
+class SampleReader:
+    # Method to attach to a published segment (FileNotFoundError when no monitor publishes under that name)
+    def __init__(self, name=DEFAULT_NAME):
+        self.name = name
+        self._shm = attach(name)
+        magic, version, size, _ = HEADER.unpack_from(self._shm.buf, 0)
+        if magic != MAGIC or version != VERSION or size != PAYLOAD.size or self._shm.size < SEGMENT_SIZE:
+            self._shm.close()
+            raise ValueError(f"shared memory segment {name!r} is not a sysmon sample (version {version})")
+        self._buf = self._shm.buf
+
+    # Method to return the latest Sample, None before the first publish; retries while a write is in progress
+    def read(self, timeout=READ_TIMEOUT):
+        deadline = None
+        while True:
+            sequence = SEQUENCE.unpack_from(self._buf, SEQUENCE_OFFSET)[0]
+            # struct writes byte by byte, so a carry (0x..ff -> 0x..00) can briefly read as 0; the trailer is final by then
+            if sequence == 0 and SEQUENCE.unpack_from(self._buf, TRAILER_OFFSET)[0] == 0:
+                return None
+            if not sequence & 1:
+                values = PAYLOAD.unpack_from(self._buf, HEADER_SIZE)
+                if (SEQUENCE.unpack_from(self._buf, TRAILER_OFFSET)[0] == sequence
+                        and SEQUENCE.unpack_from(self._buf, SEQUENCE_OFFSET)[0] == sequence):
+                    return Sample(sequence // 2, *values)
+            now = time.monotonic()
+            if deadline is None:
+                deadline = now + timeout
+            elif now >= deadline:
+                raise TimeoutError(f"no consistent sample in segment {self.name!r} within {timeout} s (writer stalled mid-update?)")
+            time.sleep(0)
+
+    # Method to tell whether the publishing monitor is still running
+    def alive(self):
+        pid = writer_pid(self._buf)
+        return bool(pid) and pid_alive(pid)
+
+    # Method to detach from the segment
+    def close(self):
+        self._buf = None
+        self._shm.close()
+
+# =======================================================================================================================================================================
+# Helper Functions
+# =======================================================================================================================================================================
+
+# Function to attach to an existing segment without handing it to the resource tracker (which would unlink it on exit)
+def attach(name):
+    try:
+        return shared_memory.SharedMemory(name, track=False)
+    except TypeError:  # Python < 3.13 registers every attach; skip it (unregistering would also drop the writer's own entry)
+        pass
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name)
+    finally:
+        resource_tracker.register = register
+
+# Function to hand a taken-over segment back to the resource tracker, so it is removed if this writer dies
+def adopt(shm):
+    if getattr(shm, "_track", True):
+        resource_tracker.register(shm._name, "shared_memory")
+
+# Function to read the writer pid from the header
+def writer_pid(buf):
+    magic, _, _, pid = HEADER.unpack_from(buf, 0)
+    return pid if magic == MAGIC else 0
+
+# Function to check whether a process exists
+def pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:  # exists, owned by another user
+        pass
+    return True
+
+# Function to read the latest sample of a segment once (attach, read, detach)
+def read_sample(name=DEFAULT_NAME, timeout=READ_TIMEOUT):
+    reader = SampleReader(name)
+    try:
+        return reader.read(timeout)
+    finally:
+        reader.close()
@@ -9,15 +9,49 @@
 #  Usage       : python3 sysmon_cli.py
 # =======================================================================================================================================================================
 
-import psutil
+import sys
 import time
+STARTED = time.perf_counter()
+SUBCOMMANDS = ("analyze", "rescore", "collect")
+# --once counts only before a subcommand word ("sysmon_cli.py analyze ... --once" is left to the analyze parser)
+if __name__ == "__main__" and "--once" in sys.argv[1:next((i for i, arg in enumerate(sys.argv) if arg in SUBCOMMANDS), None)]:
+    # one-shot snapshots skip every import below (rich, psutil, asyncio, numpy...) - see oneshot.py
+    from oneshot import run as run_once
+    sys.exit(run_once(sys.argv[1:], STARTED))
+
+import psutil
 import argparse
+import asyncio
 import csv
 import json
-from dataclasses import dataclass
+import os
+from dataclasses import dataclass, asdict
 from datetime import datetime
 from rich.console import Console
 from rich.table import Table
+from procfs import ProcCollector
+from ringbuffer import RingBuffer, Sampler, ring_capacity
+from csvlog import CsvLogger, LOG_HEADER, INTERVAL_LOG_HEADER, MOUNT_LOG_HEADER, CGROUP_LOG_HEADER, DISKIO_LOG_HEADER, PRESSURE_LOG_HEADER
+from binlog import BinaryLogger
+from rrd import RoundRobinStore, parse_duration, stored_rows, tier_rows
+from mounts import MountMonitor, worst_mount
+from netrates import NetRateMonitor, format_rate
+from topproc import TopProcesses
+from exporter import MetricsServer, parse_address, render_metrics
+from scheduler import Collector, Scheduler, DEFAULT_PERIODS
+from profiling import LoopProfiler
+from liveview import LiveView
+from ndjson import NdjsonWriter, create_encoder
+from agent import AgentSender, DEFAULT_LISTEN, resolve_endpoint
+from anomaly import AnomalyDetector, AlertDispatcher, parse_hook, parse_rate_limits
+from health import create_model, PROFILES
+from replay import Replayer, parse_speed
+from cores import CoreSampler, CoreSample, DEFAULT_TOP_CORES, core_grid, core_view, grid_columns
+from cgroups import CgroupMonitor, busiest
+from diskio import DiskIOMonitor, busiest_util
+from psi import PressureMonitor, RESOURCES as PRESSURE_RESOURCES, pressure_values
+from shm import SamplePublisher, DEFAULT_NAME as SHM_NAME
+from adaptive import AdaptiveInterval, DEFAULT_HIGH, DEFAULT_LOW, DEFAULT_SETTLE, DEFAULT_STABLE
 
 # =======================================================================================================================================================================
 # TO DO SECTION / Requirements
@@ -50,6 +84,32 @@ from rich.table import Table
 #                   - --max-runtime : stop after N seconds
 #                   - --json : output JSON instead of table
 #                   - --per-core : show per-core CPU usage
+#                   - --collector : metrics backend (psutil or proc)
+#                   - --sample-rate : background sampling rate in Hz (decoupled from --interval)
+#                   - --log-flush-rows / --log-flush-secs / --log-fsync : CSV batching and durability
+#                   - --log-max-bytes / --log-max-age / --log-no-compress : CSV rotation
+#                   - --log-format : csv or binary (fixed-width records, see binlog.py)
+#                   - analyze FILE... : offline windowed statistics over recorded logs
+#                   - --rrd / --rrd-raw / --rrd-minutes / --rrd-hours : fixed-size round-robin storage and retention
+#                   - --all-mounts / --mount-timeout : monitor every mounted filesystem
+#                   - --net-rates : per-interface throughput
+#                   - --top N : heaviest processes by CPU and RSS
+#                   - --serve [HOST]:PORT : OpenMetrics endpoint
+#                   - --cpu-period / --mem-period / --disk-period / --net-period : per-collector read periods
+#                   - --profile : loop timing histograms
+#                   - --live / --max-fps : flicker-free incremental rendering with a frame rate cap
+#                   - --ndjson / --ndjson-flush-lines / --ndjson-flush-secs / --json-backend : compact streaming output
+#                   - --agent ADDR / --source NAME and `collect --listen ADDR` : agent / collector mode
+#                   - --alerts / --alert-hook / --alert-z / --alert-alpha / --alert-cooldown / --alert-rate : anomaly alerts
+#                   - --health-profile / --health-weight / --health-curve and `rescore FILE...` : health model and log backfill
+#                   - --replay FILE / --speed Nx|max : feed a recorded log through the pipeline instead of live metrics
+#                   - --top-cores K : hottest cores listed with --per-core
+#                   - --cgroups / --cgroup-root / --cgroup-depth / --cgroup-top : per-cgroup (container) metrics
+#                   - --disk-io / --disk-io-health : per-device I/O throughput, IOPS, await and utilization
+#                   - --psi / --health-source usage|psi : pressure stall information and stall-driven health
+#                   - --shm [NAME] : publish the latest sample in shared memory for local readers
+#                   - --once / --window / --once-budget : fast-start one-shot snapshot for cron jobs and probes
+#                   - --adaptive / --fast-interval / --slow-interval / --adaptive-high / --adaptive-low : health-driven sampling interval
 #
 # TODO - STEP6 - Program Flow:
 #                   - Initialize console and optional CSV file
@@ -62,6 +122,87 @@ from rich.table import Table
 #                       - Sleep until next interval
 #                   - Stop conditions: max iterations or max runtime
 #                   - Handle KeyboardInterrupt to exit gracefully
+# TODO - STEP7 - Direct /proc collector backend:
+#                   - Keep /proc/stat, /proc/meminfo, /proc/net/dev open and reread them in place (see procfs.py)
+#                   - Fall back to psutil if /proc is unavailable or a read fails
+# TODO - STEP8 - High-frequency sampling:
+#                   - Sample at 10-100 Hz into a preallocated ring buffer (see ringbuffer.py)
+#                   - Render / log min, mean and max over the window at the slower --interval rate
+# TODO - STEP9 - Buffered CSV logging:
+#                   - Keep the log open, batch rows, flush by count / time with an explicit fsync policy (see csvlog.py)
+#                   - Rotate by size / age, gzip rotated segments in the background, header once per segment
+# TODO - STEP10 - Binary log format:
+#                   - Append fixed-width records (timestamp, cpu, mem, disk, health, net_sent, net_recv) after a small header
+#                   - Read back through a memory-mapped reader with zero-copy NumPy columns (see binlog.py)
+# TODO - STEP11 - Offline analysis subcommand:
+#                   - Stream huge logs in chunks, per-window min / max / mean / p50 / p95 / p99 and health summaries (see analyze.py)
+# TODO - STEP12 - Round-robin storage:
+#                   - Keep raw samples for a short window, roll them up into 1-minute / 1-hour min / max / avg / last (see rrd.py)
+#                   - One preallocated file per store, so disk usage never grows
+# TODO - STEP13 - Multi-mount disk monitoring:
+#                   - Cache the mount list, refresh it only when /proc/self/mountinfo changes (see mounts.py)
+#                   - statvfs on a daemon thread per mount with timeouts - hung NFS / FUSE mounts are marked stale, never block
+#                   - Per-mount rows in the table, JSON and a <logfile>_mounts.csv log; the health score uses the worst mount
+# TODO - STEP14 - Per-interface network rates:
+#                   - bytes/s, packets/s, errors and drops from /proc/net/dev deltas on monotonic time (see netrates.py)
+#                   - Handle counter wrap and interface resets
+# TODO - STEP15 - Top-N processes:
+#                   - Cache name / cmdline / user per (pid, starttime), read only /proc/<pid>/stat per tick (see topproc.py)
+#                   - Bounded heaps pick the top N by CPU and by RSS
+# TODO - STEP16 - Prometheus / OpenMetrics exporter:
+#                   - Render each sample once, serve the cached body from an asyncio HTTP server (see exporter.py)
+#                   - Scrapes never trigger collection, so cpu_percent deltas stay tied to --interval
+# TODO - STEP17 - Multi-rate collector scheduler:
+#                   - One asyncio task per collector with its own period (CPU 1 s, memory 5 s, disk 60 s, network 1 s)
+#                   - Blocking collectors (disk, mounts, processes) run on daemon threads; one slow collector never delays the others or exit
+#                   - Display, JSON, logs and the exporter read the shared latest-state snapshot every --interval (see scheduler.py)
+# TODO - STEP18 - Loop timing instrumentation (--profile):
+#                   - Per-stage durations (collect, health, render / JSON, export, log) and per-collector read times
+#                   - Tick jitter, missed deadlines and skipped ticks in fixed-bucket histograms (see profiling.py)
+#                   - Printed on exit and included in JSON output
+# TODO - STEP19 - Flicker-free live rendering (--live):
+#                   - Keep the last frame, rewrite only the lines that changed, never clear the screen (see liveview.py)
+#                   - Cap frames per second independently of --interval; skipped ticks do not build tables at all
+# TODO - STEP20 - NDJSON streaming (--ndjson):
+#                   - One compact line per sample through an encoder built once (orjson when installed, see ndjson.py)
+#                   - Batched stdout writes flushed by line count / time, clean exit when the reader closes the pipe
+# TODO - STEP21 - Agent / collector mode:
+#                   - --agent sends a compact binary datagram per sample over UDP or a Unix socket (see agent.py)
+#                   - `collect` merges many agents into one table, NDJSON stream or CSV log with per-source ring buffers and staleness
+# TODO - STEP22 - Streaming anomaly detection:
+#                   - EWMA mean / variance z-scores and rate-of-change detectors per metric, O(1) time and memory (see anomaly.py)
+#                   - Hysteresis and cooldown so one incident fires once; hooks: exec command, webhook, append to file
+# TODO - STEP23 - Configurable health engine:
+#                   - Weight profiles and nonlinear penalty curves (linear, quadratic, knee, exponential) instead of fixed 40/40/20 (see health.py)
+#                   - `rescore` recomputes the health column of existing logs in vectorized chunks (binary logs in place via memmap)
+# TODO - STEP24 - Log replay (--replay / --speed):
+#                   - Stream recorded CSV / gzip / binary logs through the same health, display, JSON, log and alert pipeline (see replay.py)
+#                   - N x real time or as fast as possible; samples keep their recorded timestamps; throughput reported at the end
+# TODO - STEP25 - Per-core view for many-core machines:
+#                   - Overall and per-core CPU from one /proc/stat delta pass into preallocated arrays (see cores.py)
+#                   - Heatmap grid instead of one row per core, top-K hottest cores, NUMA node aggregates, user / system / iowait / steal
+# TODO - STEP26 - cgroup v2 container metrics (--cgroups):
+#                   - Walk /sys/fs/cgroup once, rescan only on inotify mkdir / rmdir events (see cgroups.py)
+#                   - Per cgroup: CPU cores / % of limit, memory % of memory.max, IO bytes/s and IOPS, throttling, health score
+#                   - Busiest cgroups in the table, all of them in JSON and in <logfile>_cgroups.csv
+# TODO - STEP27 - Block device I/O (--disk-io):
+#                   - One /proc/diskstats read per tick for all devices, whole disks only (no partitions / loop / ram) (see diskio.py)
+#                   - Per device: read / write bytes/s, IOPS, await, utilization and queue depth in the table, JSON and <logfile>_diskio.csv
+#                   - --disk-io-health : health disk term = max(space used %, busiest device utilization %)
+# TODO - STEP28 - Pressure Stall Information (--psi / --health-source psi):
+#                   - /proc/pressure/{cpu,memory,io}: some / full avg10 / avg60 and stall % of the last tick (see psi.py)
+#                   - Per cgroup with --cgroups: cpu.pressure / memory.pressure / io.pressure stall %
+#                   - PSI health mode: score stall time instead of utilization (90 % CPU with no stalls is healthy)
+# TODO - STEP29 - Shared-memory publication (--shm [NAME]):
+#                   - Latest sample in a fixed-layout multiprocessing.shared_memory segment behind a seqlock (see shm.py)
+#                   - Local readers (dashboards, watchdogs) use shm.SampleReader - no polling of their own, no JSON parsing
+# TODO - STEP30 - Fast-start one-shot mode (--once):
+#                   - Handled before the module imports: only procfs / argparse / json on the JSON path (see oneshot.py)
+#                   - One CPU sample over a short --window, start-up to output time reported and checked against --once-budget
+# TODO - STEP31 - Adaptive sampling (--adaptive):
+#                   - Slow interval while health is high and steady, fast interval as soon as it falls or an alert fires (see adaptive.py)
+#                   - Hysteresis: back off only after a settle / stable time; collector periods are scaled with the interval
+#                   - The interval in effect is recorded in every logged sample (CSV / binary "interval" field, JSON, shared memory)
 
 # =======================================================================================================================================================================
 # Constants / Configuration / Data Structures
@@ -75,13 +216,73 @@ class SystemStats:
     net_sent: int
     net_recv: int
     per_core: list = None
+    mounts: list = None
+    interfaces: list = None
+    disks: list = None          # per-device I/O rates (--disk-io)
+    pressure: dict = None       # PSI per resource (--psi)
+    processes: dict = None
+    alerts: list = None
+    cgroups: list = None
+    cores: CoreSample = None    # per-core breakdown / NUMA data (--per-core with the /proc/stat core sampler)
+    timestamp: float = None     # epoch seconds of a recorded (replayed) sample; None for live samples
 
 # =======================================================================================================================================================================
 # Helper Functions
 # =======================================================================================================================================================================
 
+# Function to return when a sample was taken - the recorded time for replayed samples, otherwise now
+def sample_time(stats: SystemStats):
+    return datetime.now() if stats.timestamp is None else datetime.fromtimestamp(stats.timestamp)
+
+# Function to create the metrics backend - returns None for psutil (also used as fallback)
+def create_collector(name="psutil"):
+    if name == "proc":
+        try:
+            return ProcCollector()
+        except OSError as e:
+            console.print(f"[yellow]/proc collector unavailable ({e}), falling back to psutil[/yellow]")
+    return None
+
+# Function to create the shared-memory publisher - returns None (with a warning) when the segment cannot be created
+def create_publisher(name):
+    try:
+        return SamplePublisher(name)
+    except (OSError, ValueError) as e:
+        console.print(f"[yellow]Shared-memory publication unavailable ({e})[/yellow]")
+    return None
+
+# Function to create the PSI reader - returns None (with a warning) when the kernel has no pressure information
+def create_pressure_monitor():
+    try:
+        return PressureMonitor()
+    except OSError as e:
+        console.print(f"[yellow]Pressure information unavailable ({e}), health uses utilization[/yellow]")
+    return None
+
+# Function to create the cgroup collector - returns None (with a warning) when there is no cgroup v2 hierarchy
+def create_cgroup_monitor(options=None, model=None, pressure=False, psi_health=False):
+    try:
+        return CgroupMonitor(model=model, pressure=pressure, psi_health=psi_health, **(options or {}))
+    except OSError as e:
+        console.print(f"[yellow]cgroup metrics unavailable ({e})[/yellow]")
+    return None
+
+# Function to create the per-core sampler - returns None (plain per-core list) without /proc/stat or numpy
+def create_core_sampler(top_k=DEFAULT_TOP_CORES):
+    try:
+        return CoreSampler(top_k=top_k)
+    except (OSError, ImportError, ValueError) as e:
+        console.print(f"[yellow]Per-core sampler unavailable ({e}), using the plain per-core list[/yellow]")
+    return None
+
 # Function to retrieve current system stats
-def get_stats(per_core=False):
+def get_stats(per_core=False, collector=None):
+    if collector is not None:
+        try:
+            cpu, mem, disk, sent, recv, cores = collector.read(per_core)
+            return SystemStats(cpu, mem, disk, sent // 1024, recv // 1024, cores)
+        except (OSError, ValueError, IndexError) as e:
+            console.print(f"[yellow]/proc collector failed ({e}), using psutil for this sample[/yellow]")
     try:
         cpu = psutil.cpu_percent(interval=None)
         mem = psutil.virtual_memory().percent
@@ -93,11 +294,109 @@ def get_stats(per_core=False):
         console.print(f"[red]Error getting system stats: {e}[/red]")
         return SystemStats(0, 0, 0, 0, 0)
 
-# Function to calculate a simple health score (0–100)
-def calculate_health(cpu, mem, disk):
+# Function to pick the disk value scored by the health model - with --disk-io-health the busiest device utilization counts too
+def health_disk(stats: SystemStats, io_health=False):
+    return max(stats.disk, busiest_util(stats.disks)) if io_health else stats.disk
+
+# Function to attach per-mount usage to the stats - the fullest mount becomes the disk value used for health
+def apply_mounts(stats: SystemStats, mounts):
+    stats.mounts = mounts
+    worst = worst_mount(stats.mounts)
+    if worst is not None:
+        stats.disk = worst.percent
+    return stats
+
+# Function to build the scheduler collectors for CPU, memory, disk and network (each falls back to psutil if the /proc backend fails)
+def metric_collectors(periods, per_core=False, backend=None, disk=True, cores=None):
+    def fallback(method, *args):
+        if backend is not None:
+            try:
+                return getattr(backend, method)(*args)
+            except (OSError, ValueError, IndexError) as e:
+                console.print(f"[yellow]/proc collector failed ({e}), using psutil for this sample[/yellow]")
+        return None
+
+    def read_cpu():
+        if cores is not None:
+            try:
+                sample = cores.read()  # overall and per-core usage from the same /proc/stat pass
+                return sample.total, sample
+            except (OSError, ValueError) as e:
+                console.print(f"[yellow]Per-core sampler failed ({e}), using the plain per-core list[/yellow]")
+        result = fallback("read_cpu", per_core)
+        if result is not None:
+            return result
+        cpu = psutil.cpu_percent(interval=None)
+        return cpu, psutil.cpu_percent(interval=None, percpu=True) if per_core else None
+
+    def read_mem():
+        result = fallback("read_mem")
+        return result if result is not None else psutil.virtual_memory().percent
+
+    def read_disk():
+        result = fallback("read_disk")
+        return result if result is not None else psutil.disk_usage('/').percent
+
+    def read_net():
+        result = fallback("read_net")
+        if result is None:
+            net = psutil.net_io_counters()
+            result = net.bytes_sent, net.bytes_recv
+        return result[0] // 1024, result[1] // 1024
+
+    collectors = [
+        Collector("cpu", periods["cpu"], read_cpu, blocking=False),
+        Collector("mem", periods["mem"], read_mem, blocking=False),
+        Collector("net", periods["net"], read_net, blocking=False),
+    ]
+    if disk:
+        collectors.append(Collector("disk", periods["disk"], read_disk))  # statvfs can block on a slow filesystem
+    return collectors
+
+# Function to assemble a SystemStats from the scheduler's latest-state snapshot
+def snapshot_stats(snapshot):
+    cpu, cores = snapshot.get("cpu", (0.0, None))
+    sent, recv = snapshot.get("net", (0, 0))
+    sample = cores if isinstance(cores, CoreSample) else None
+    if sample is not None:
+        cores = sample.per_core()
+    stats = SystemStats(cpu, snapshot.get("mem", 0.0), snapshot.get("disk", 0.0), sent, recv, cores)
+    stats.cores = sample
+    stats.interfaces = snapshot.get("interfaces")
+    stats.disks = snapshot.get("diskio")
+    stats.pressure = snapshot.get("pressure")
+    stats.processes = snapshot.get("top")
+    stats.cgroups = snapshot.get("cgroups")
+    stats.timestamp = snapshot.get("timestamp")
+    if "mounts" in snapshot:
+        apply_mounts(stats, snapshot["mounts"])
+    return stats
+
+# Function to build a SystemStats from a sampler window (means for percentages, latest counters for network)
+def window_stats(window, latest: SystemStats):
+    return SystemStats(
+        round(window["cpu"][1], 1),
+        round(window["mem"][1], 1),
+        round(window["disk"][1], 1),
+        latest.net_sent,
+        latest.net_recv,
+        latest.per_core,
+    )
+
+# Function to calculate a simple health score (0–100); a health.HealthModel replaces the default 40/40/20 weights
+def calculate_health(cpu, mem, disk, model=None):
+    if model is not None:
+        return model.score({"cpu": cpu, "mem": mem, "disk": disk})
     health = 100 - (cpu * 0.4 + mem * 0.4 + disk * 0.2)
     return max(0, min(100, health))
 
+# Function to score one sample - stall time with the PSI health source (when pressure was read), otherwise utilization
+def stats_health(stats: SystemStats, model=None, io_health=False, psi_health=False):
+    if psi_health and stats.pressure:
+        values = pressure_values(stats.pressure)
+        return calculate_health(values["cpu"], values["mem"], values["disk"], model)
+    return calculate_health(stats.cpu, stats.mem, health_disk(stats, io_health), model)
+
 # Function to return a colored arrow showing trend
 def trend_symbol(current, previous, positive_is_good=False):
     """
@@ -115,10 +414,19 @@ def trend_symbol(current, previous, positive_is_good=False):
         return "[red]↑[/red]" if diff > 0 else "[green]↓[/green]"
 
 # Function to display system stats with rich table and trend indicators
-def display(stats: SystemStats, health, prev_stats=None, prev_health=None, per_core=False):
+def display(stats: SystemStats, health, prev_stats=None, prev_health=None, per_core=False, window=None, cgroup_top=10):
+    renderables = build_view(stats, health, prev_stats, prev_health, per_core, window, cgroup_top)
+    console.clear()
+    for renderable in renderables:
+        console.print(renderable)
+
+# Function to build the renderables for one tick: the stats table, plus the per-core, process and cgroup views when enabled
+def build_view(stats: SystemStats, health, prev_stats=None, prev_health=None, per_core=False, window=None, cgroup_top=10):
     table = Table(title="Linux System Monitor", show_lines=True)
     table.add_column("Resource", style="cyan", no_wrap=True)
     table.add_column("Usage", style="magenta", justify="right")
+    if window:
+        table.add_column(f"Min / Max ({window['samples']} samples)", style="magenta", justify="right")
 
     # Trends
     cpu_trend = trend_symbol(stats.cpu, getattr(prev_stats, 'cpu', None))
@@ -126,9 +434,12 @@ def display(stats: SystemStats, health, prev_stats=None, prev_health=None, per_c
     disk_trend = trend_symbol(stats.disk, getattr(prev_stats, 'disk', None))
     health_trend = trend_symbol(health, prev_health, positive_is_good=True)
 
-    table.add_row("CPU (%)", f"{color(stats.cpu, 80)} {cpu_trend}")
-    table.add_row("Memory (%)", f"{color(stats.mem, 80)} {mem_trend}")
-    table.add_row("Disk (%)", f"{color(stats.disk, 90)} {disk_trend}")
+    table.add_row("CPU (%)", f"{color(stats.cpu, 80)} {cpu_trend}", *window_range(window, "cpu", 80))
+    table.add_row("Memory (%)", f"{color(stats.mem, 80)} {mem_trend}", *window_range(window, "mem", 80))
+    table.add_row("Disk (%)", f"{color(stats.disk, 90)} {disk_trend}", *window_range(window, "disk", 90))
+    for mount in stats.mounts or []:
+        stale = " [yellow](stale)[/yellow]" if mount.stale else ""
+        table.add_row(f"  {mount.mountpoint}", f"{color(mount.percent, 90)}{stale}")
 
     # Health color
     if health > 70:
@@ -142,37 +453,220 @@ def display(stats: SystemStats, health, prev_stats=None, prev_health=None, per_c
     # Network info
     table.add_row("Net Sent (KB)", str(stats.net_sent))
     table.add_row("Net Recv (KB)", str(stats.net_recv))
+    for rate in stats.interfaces or []:
+        table.add_row(f"Net {rate.name}", interface_summary(rate))
 
-    # Per-core CPU usage
-    if per_core and stats.per_core:
-        for i, val in enumerate(stats.per_core):
-            table.add_row(f"Core {i}", color(val, 80))
+    # Block device I/O
+    for device in stats.disks or []:
+        table.add_row(f"IO {device.name}", device_summary(device))
 
-    console.clear()
-    console.print(table)
+    # Pressure stall information
+    for entry in (stats.pressure or {}).values():
+        table.add_row(f"Pressure {entry.resource}", pressure_summary(entry))
+
+    # CPU time split (per-core sampler)
+    if per_core and stats.cores is not None:
+        user, system, iowait, steal = stats.cores.total_breakdown
+        table.add_row("CPU user / sys / iowait / steal (%)", f"{user:.1f} / {system:.1f} / {iowait:.1f} / {steal:.1f}")
+
+    # Anomaly alerts raised / resolved on this tick
+    for alert in stats.alerts or []:
+        style = "red" if alert.state == "firing" else "green"
+        table.add_row(f"Alert ({alert.detector})", f"[{style}]{alert.message}[/{style}]")
+
+    # Per-core CPU usage: heatmap grid (plus top-K / NUMA tables with the per-core sampler) instead of one row per core
+    renderables = [table]
+    if per_core and stats.cores is not None:
+        renderables += core_view(stats.cores, console.width)
+    elif per_core and stats.per_core:
+        renderables.append(core_grid(range(len(stats.per_core)), stats.per_core, grid_columns(console.width)))
+    if stats.processes:
+        renderables.append(process_table(stats.processes))
+    if stats.cgroups:
+        renderables.append(cgroup_table(stats.cgroups, cgroup_top))
+    return renderables
+
+# Function to build the top-N process table (by CPU and by RSS side by side)
+def process_table(processes):
+    table = Table(title="Top Processes", show_lines=False)
+    table.add_column("PID", justify="right", style="cyan")
+    table.add_column("User")
+    table.add_column("Name (by CPU)", no_wrap=True)
+    table.add_column("CPU (%)", justify="right", style="magenta")
+    table.add_column("PID", justify="right", style="cyan")
+    table.add_column("Name (by RSS)", no_wrap=True)
+    table.add_column("RSS (MB)", justify="right", style="magenta")
+    by_cpu, by_rss = processes["cpu"], processes["rss"]
+    for i in range(max(len(by_cpu), len(by_rss))):
+        row = []
+        if i < len(by_cpu):
+            p = by_cpu[i]
+            row += [str(p.pid), p.user, p.name, color(p.cpu, 80)]
+        else:
+            row += ["", "", "", ""]
+        if i < len(by_rss):
+            p = by_rss[i]
+            row += [str(p.pid), p.name, f"{p.rss / 1048576:.1f}"]
+        table.add_row(*row)
+    return table
+
+# Function to build the cgroup table (busiest by CPU % of limit first)
+def cgroup_table(cgroups, limit=10):
+    table = Table(title=f"Cgroups (top {min(limit, len(cgroups))} of {len(cgroups)})", show_lines=False)
+    table.add_column("Cgroup", style="cyan", no_wrap=True, overflow="ellipsis", max_width=48)
+    pressure = cgroups[0].cpu_pressure is not None
+    columns = ("CPU (cores)", "CPU (% limit)", "Memory (%)", "IO read", "IO write", "IOPS", "Throttled (%)")
+    for column in columns + (("Stall cpu / mem / io (%)",) if pressure else ()) + ("Health",):
+        table.add_column(column, justify="right", style="magenta")
+    for c in busiest(cgroups, limit):
+        stalls = (f"{c.cpu_pressure:.1f} / {c.mem_pressure:.1f} / {c.io_pressure:.1f}",) if pressure else ()
+        table.add_row(c.path, f"{c.cpu_cores:.2f}", color(c.cpu_percent, 80), color(c.mem_percent, 80),
+                      format_rate(c.read_bps), format_rate(c.write_bps), f"{c.iops:.0f}", color(c.throttled_percent, 20),
+                      *stalls, f"{c.health:.1f}")
+    return table
+
+# Function to format the window min / max cell for a metric (empty when not sampling)
+def window_range(window, field, limit):
+    if not window:
+        return ()
+    low, _, high = window[field]
+    return (f"{color(round(low, 1), limit)} / {color(round(high, 1), limit)}",)
+
+# Function to format one interface's rates for the table (errors / drops only when present)
+def interface_summary(rate):
+    text = f"↓ {format_rate(rate.rx_bytes)} ({rate.rx_packets:.0f} pkt/s)  ↑ {format_rate(rate.tx_bytes)} ({rate.tx_packets:.0f} pkt/s)"
+    errors = rate.rx_errors + rate.tx_errors
+    drops = rate.rx_drops + rate.tx_drops
+    if errors or drops:
+        text += f"  [red]err {errors:.1f}/s drop {drops:.1f}/s[/red]"
+    if rate.reset:
+        text += "  [yellow](reset)[/yellow]"
+    return text
 
 # Function to display health score coloring
 def color(value, limit):
     return f"[red]{value}[/red]" if value > limit else str(value)
 
-# Function to append stats to CSV, creating headers if needed
+# Function to format one block device's I/O for the table
+def device_summary(device):
+    text = (f"R {format_rate(device.read_bps)} ({device.read_iops:.0f} IOPS)  W {format_rate(device.write_bps)} "
+            f"({device.write_iops:.0f} IOPS)  await {device.await_ms:.1f} ms  util {color(device.util, 80)}%  queue {device.queue:.2f}")
+    if device.reset:
+        text += "  [yellow](reset)[/yellow]"
+    return text
+
+# Function to format one resource's pressure for the table (stall % of the last tick, then the kernel averages)
+def pressure_summary(entry):
+    return (f"some {color(entry.some_percent, 10)}% (avg10 {entry.some_avg10:.2f} / avg60 {entry.some_avg60:.2f})  "
+            f"full {color(entry.full_percent, 5)}% (avg10 {entry.full_avg10:.2f} / avg60 {entry.full_avg60:.2f})")
+
+# Function to build one CSV log row (with the sampling interval as a trailing column when one is given)
+def log_row(stats: SystemStats, health, interval=None):
+    row = [sample_time(stats), stats.cpu, stats.mem, stats.disk, health, stats.net_sent, stats.net_recv]
+    return row if interval is None else row + [interval]
+
+# Function to build one binary log record (epoch timestamp instead of a datetime string)
+def binary_record(stats: SystemStats, health, interval=None):
+    record = (time.time() if stats.timestamp is None else stats.timestamp, stats.cpu, stats.mem, stats.disk, health, stats.net_sent, stats.net_recv)
+    return record if interval is None else record + (interval,)
+
+# Function to create the logger for the chosen format - returns (logger, row builder); interval=True adds the interval field
+def create_logger(logfile, log_format="csv", log_options=None, interval=False):
+    options = dict(log_options or {})
+    if log_format == "binary":
+        binary_options = {key: options[key] for key in ("flush_rows", "flush_interval", "fsync") if key in options}
+        return BinaryLogger(logfile, **binary_options, interval=interval), binary_record
+    return CsvLogger(logfile, header=INTERVAL_LOG_HEADER if interval else LOG_HEADER, **options), log_row
+
+# Function to open the round-robin store - an existing store keeps the layout in its header, a new one is sized from the retention periods
+# (`interval` is the shortest interval samples arrive at: the fast one with --adaptive)
+def create_store(path, interval, retention=("1h", "7d", "365d")):
+    raw, minutes, hours = (parse_duration(value) for value in retention)
+    return RoundRobinStore(path, stored_rows(path) or tier_rows(interval, raw, minutes, hours))
+
+# Function to build the value list stored in the round-robin tiers
+def store_values(stats: SystemStats, health):
+    return (stats.cpu, stats.mem, stats.disk, health, stats.net_sent, stats.net_recv)
+
+# Function to build the shared-memory sample (epoch timestamp, like the binary log, plus the interval in effect)
+def shm_values(stats: SystemStats, health, interval):
+    return (time.time() if stats.timestamp is None else stats.timestamp, stats.cpu, stats.mem, stats.disk, health,
+            stats.net_sent, stats.net_recv, interval)
+
+# Function to derive the per-mount CSV log path from the main log path
+def mount_logfile(logfile):
+    root, _ = os.path.splitext(logfile)
+    return f"{root}_mounts.csv"
+
+# Function to derive the per-cgroup CSV log path from the main log path
+def cgroup_logfile(logfile):
+    root, _ = os.path.splitext(logfile)
+    return f"{root}_cgroups.csv"
+
+# Function to derive the PSI CSV log path from the main log path
+def pressure_logfile(logfile):
+    root, _ = os.path.splitext(logfile)
+    return f"{root}_pressure.csv"
+
+# Function to build the PSI CSV rows for one sample
+def pressure_rows(stats: SystemStats):
+    now = sample_time(stats)
+    return [[now, p.resource, p.some_avg10, p.some_avg60, p.some_percent, p.full_avg10, p.full_avg60, p.full_percent]
+            for p in (stats.pressure or {}).values()]
+
+# Function to derive the per-device I/O CSV log path from the main log path
+def diskio_logfile(logfile):
+    root, _ = os.path.splitext(logfile)
+    return f"{root}_diskio.csv"
+
+# Function to build the per-device I/O CSV rows for one sample
+def diskio_rows(stats: SystemStats):
+    now = sample_time(stats)
+    return [[now, d.name, round(d.read_bps, 1), round(d.write_bps, 1), d.read_iops, d.write_iops, d.await_ms, d.util, d.queue,
+             int(d.reset)] for d in stats.disks or []]
+
+# Function to build the per-cgroup CSV rows for one sample
+def cgroup_rows(stats: SystemStats):
+    now = sample_time(stats)
+    return [[now, c.path, c.cpu_cores, c.cpu_percent, c.mem_bytes, c.mem_percent, round(c.read_bps, 1), round(c.write_bps, 1),
+             c.iops, c.throttled_percent, c.health, c.cpu_pressure, c.mem_pressure, c.io_pressure, *cgroup_averages(c)]
+            for c in stats.cgroups or []]
+
+# Function to list a cgroup's PSI kernel averages in CSV column order (blank without --psi)
+def cgroup_averages(usage):
+    if not usage.pressure:
+        return [None] * 4 * len(PRESSURE_RESOURCES)
+    entries = [usage.pressure[resource] for resource in PRESSURE_RESOURCES]
+    return [value for p in entries for value in (p.some_avg10, p.some_avg60, p.full_avg10, p.full_avg60)]
+
+# Function to build the per-mount CSV rows for one sample
+def mount_rows(stats: SystemStats):
+    now = sample_time(stats)
+    return [[now, m.mountpoint, m.fstype, m.percent, m.used, m.total, int(m.stale)] for m in stats.mounts or []]
+
+# Function to append a single row to CSV, creating headers if needed (one-off writes; main() uses CsvLogger)
 def log_stats(file_path, stats: SystemStats, health):
-    header = ["timestamp", "cpu", "mem", "disk", "health", "net_sent", "net_recv"]
-    file_exists = False
-    try:
-        file_exists = open(file_path).readable()
-    except FileNotFoundError:
-        pass
-        with open(file_path, 'a', newline='') as f:
-            writer = csv.writer(f)
-            if not file_exists or f.tell() == 0:
-                writer.writerow(header)
-                writer.writerow([datetime.now(), stats.cpu, stats.mem, stats.disk, health, stats.net_sent, stats.net_recv])
+    with open(file_path, 'a', newline='') as f:
+        writer = csv.writer(f)
+        if f.tell() == 0:
+            writer.writerow(LOG_HEADER)
+        writer.writerow(log_row(stats, health))
 
 # Function to print system stats in JSON format (with trends)
-def output_json(stats: SystemStats, health, prev_stats=None, prev_health=None):
+def output_json(stats: SystemStats, health, prev_stats=None, prev_health=None, window=None, profile=None, sampling=None):
+    print(json.dumps(json_record(stats, health, prev_stats, prev_health, window, profile, sampling), indent=2))
+
+# Function to convert {resource: Pressure} into JSON objects keyed by resource (None stays None)
+def pressure_json(pressure):
+    if pressure is None:
+        return None
+    return {resource: {key: value for key, value in asdict(entry).items() if key != "resource"}
+            for resource, entry in pressure.items()}
+
+# Function to build the JSON object for one sample (shared by --json and --ndjson)
+def json_record(stats: SystemStats, health, prev_stats=None, prev_health=None, window=None, profile=None, sampling=None):
     json_obj = {
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": sample_time(stats).isoformat(),
         "cpu": stats.cpu,
         "mem": stats.mem,
         "disk": stats.disk,
@@ -193,51 +687,370 @@ def output_json(stats: SystemStats, health, prev_stats=None, prev_health=None):
     if trends:
         json_obj["trends"] = trends
 
-    print(json.dumps(json_obj, indent=2))
+    # Per-core usage
+    if stats.per_core:
+        json_obj["per_core"] = stats.per_core
+    if stats.cores is not None:
+        json_obj["cores"] = stats.cores.summary()
+
+    # Per-mount usage
+    if stats.mounts:
+        json_obj["mounts"] = [
+            {"mountpoint": m.mountpoint, "fstype": m.fstype, "percent": m.percent,
+             "used": m.used, "total": m.total, "stale": m.stale}
+            for m in stats.mounts
+        ]
+
+    # Per-interface network rates
+    if stats.interfaces:
+        json_obj["interfaces"] = [
+            {"name": r.name, "rx_bytes_per_s": round(r.rx_bytes, 1), "tx_bytes_per_s": round(r.tx_bytes, 1),
+             "rx_packets_per_s": round(r.rx_packets, 1), "tx_packets_per_s": round(r.tx_packets, 1),
+             "rx_errors_per_s": round(r.rx_errors, 2), "tx_errors_per_s": round(r.tx_errors, 2),
+             "rx_drops_per_s": round(r.rx_drops, 2), "tx_drops_per_s": round(r.tx_drops, 2), "reset": r.reset}
+            for r in stats.interfaces
+        ]
+
+    # Per-device I/O
+    if stats.disks:
+        json_obj["disks"] = [
+            {"name": d.name, "read_bytes_per_s": round(d.read_bps, 1), "write_bytes_per_s": round(d.write_bps, 1),
+             "read_iops": d.read_iops, "write_iops": d.write_iops, "await_ms": d.await_ms, "util": d.util,
+             "queue": d.queue, "reset": d.reset}
+            for d in stats.disks
+        ]
+
+    # Pressure stall information
+    if stats.pressure:
+        json_obj["pressure"] = pressure_json(stats.pressure)
+
+    # Per-cgroup usage
+    if stats.cgroups:
+        json_obj["cgroups"] = [{**asdict(c), "pressure": pressure_json(c.pressure)} for c in stats.cgroups]
+
+    # Top processes
+    if stats.processes:
+        json_obj["top"] = {
+            key: [{"pid": p.pid, "name": p.name, "user": p.user, "cmdline": p.cmdline, "cpu": p.cpu, "rss": p.rss}
+                  for p in procs]
+            for key, procs in stats.processes.items()
+        }
+
+    # Sampler window
+    if window:
+        json_obj["window"] = {"samples": window["samples"]}
+        for field in ("cpu", "mem", "disk"):
+            low, mean, high = window[field]
+            json_obj["window"][field] = {"min": low, "mean": round(mean, 2), "max": high}
+
+    # Anomaly alerts
+    if stats.alerts:
+        json_obj["alerts"] = [asdict(alert) for alert in stats.alerts]
+
+    # Adaptive sampling mode and the interval in effect
+    if sampling:
+        json_obj["sampling"] = sampling
+
+    # Loop timing (--profile)
+    if profile:
+        json_obj["profile"] = profile
+
+    return json_obj
+
+# Function to print an error without corrupting the live view (the next frame is redrawn in full)
+def report_error(message, view=None):
+    console.print(f"[red]{message}[/red]")
+    if view:
+        view.invalidate()
+
+# Function to print the --replay summary on exit (samples, recorded span, throughput)
+def print_replay(replayer, json_output=False):
+    summary = replayer.summary()
+    if json_output:
+        print(json.dumps({"replay": summary}, indent=2))
+        return
+    span = f" ({summary['start']} → {summary['end']})" if "start" in summary else ""
+    console.print(f"[bold green]Replayed {summary['samples']} samples{span} in {summary['elapsed']:.2f} s"
+                  f" - {summary['samples_per_second'] or 0:,.0f} samples/s[/bold green]")
+
+# Function to print the --profile report on exit (table, or JSON with --json)
+def print_profile(profiler, json_output=False):
+    summary = profiler.summary()
+    if json_output:
+        print(json.dumps({"profile": summary}, indent=2))
+        return
+    table = Table(title="Loop Timing (ms)", show_lines=False)
+    table.add_column("Stage", style="cyan", no_wrap=True)
+    for column in ("Count", "Mean", "p50", "p95", "p99", "Max"):
+        table.add_column(column, justify="right", style="magenta")
+    rows = [("tick jitter", summary["jitter"])] + list(summary["stages"].items())
+    for name, h in rows:
+        table.add_row(name, str(h["count"]), f"{h['mean_ms']:.3f}", f"{h['p50_ms']:.3f}", f"{h['p95_ms']:.3f}",
+                      f"{h['p99_ms']:.3f}", f"{h['max_ms']:.3f}")
+    console.print(table)
+    missed = summary["missed_deadlines"]
+    style = "red" if missed else "green"
+    console.print(f"[{style}]Ticks: {summary['ticks']}  missed deadlines: {missed}  skipped ticks: {summary['skipped_ticks']}[/{style}]")
 
 # =======================================================================================================================================================================
 # Main function / Control loop
 # =======================================================================================================================================================================
 
-def main(interval=2, log=False, logfile="system_log.csv", max_iterations=None, max_runtime=None, json_output=False, per_core=False):
+def main(interval=2, log=False, logfile="system_log.csv", max_iterations=None, max_runtime=None, json_output=False, per_core=False,
+         collector="psutil", sample_rate=None, log_options=None, log_format="csv", rrd_file=None,
+         rrd_retention=("1h", "7d", "365d"), all_mounts=False, mount_timeout=1.0,
+         net_rates=False, top=None, serve=None, periods=None, profile=False, live=False, max_fps=4.0,
+         ndjson=False, ndjson_options=None, agent=None, source=None, alerts=False, alert_options=None, alert_hooks=None,
+         health_model=None, replay=None, speed=None, top_cores=DEFAULT_TOP_CORES,
+         cgroups=False, cgroup_options=None, disk_io=False, disk_io_health=False, psi=False, health_source="usage",
+         shm=None, adaptive=False, adaptive_options=None):
+    asyncio.run(monitor(interval, log, logfile, max_iterations, max_runtime, json_output, per_core, collector,
+                        sample_rate, log_options, log_format, rrd_file, rrd_retention, all_mounts, mount_timeout,
+                        net_rates, top, serve, periods, profile, live, max_fps, ndjson, ndjson_options, agent, source,
+                        alerts, alert_options, alert_hooks, health_model, replay, speed, top_cores, cgroups, cgroup_options,
+                        disk_io, disk_io_health, psi, health_source, shm, adaptive, adaptive_options))
+
+# Function to run the monitor on the asyncio collector scheduler - every metric has its own period, consumers read the latest snapshot
+async def monitor(interval, log, logfile, max_iterations, max_runtime, json_output, per_core, collector,
+                  sample_rate, log_options, log_format, rrd_file, rrd_retention, all_mounts, mount_timeout,
+                  net_rates, top, serve, periods, profile=False, live=False, max_fps=4.0,
+                  ndjson=False, ndjson_options=None, agent=None, source=None, alerts=False, alert_options=None,
+                  alert_hooks=None, health_model=None, replay=None, speed=None, top_cores=DEFAULT_TOP_CORES,
+                  cgroups=False, cgroup_options=None, disk_io=False, disk_io_health=False, psi=False,
+                  health_source="usage", shm=None, adaptive=False, adaptive_options=None):
+    stream = None
+    if ndjson:
+        console.stderr = True  # stdout carries only the NDJSON stream
+        stream = NdjsonWriter(**(ndjson_options or {}))
     console.print("[bold blue]Starting Linux System Monitor CLI[/bold blue]")
     if log:
         console.print(f"[bold green]Logging enabled:[/bold green] {logfile}")
 
+    replayer = Replayer(replay, speed) if replay else None
+    if replayer:
+        # recorded samples replace every live source
+        sample_rate, all_mounts, net_rates, top, cgroups, disk_io, psi = None, False, False, None, False, False, False
+        health_source = "usage"
+        adaptive = False  # samples keep their recorded spacing
+        console.print(f"[bold green]Replaying:[/bold green] {', '.join(replayer.paths)} "
+                      f"({f'{speed:g}x' if speed else 'max speed'})")
+
+    periods = {**DEFAULT_PERIODS, **(periods or {})}
+    pacer = AdaptiveInterval(interval, **(adaptive_options or {})) if adaptive else None
+    logger, make_row = create_logger(logfile, log_format, log_options, pacer is not None) if log else (None, None)
+    # raw tier sized for the fastest rate samples can arrive at, so --rrd-raw is a lower bound on what it keeps
+    store = create_store(rrd_file, pacer.intervals["fast"] if pacer else interval, rrd_retention) if rrd_file else None
+    mount_monitor = MountMonitor(timeout=mount_timeout) if all_mounts else None
+    net_monitor = NetRateMonitor() if net_rates else None
+    diskio_monitor = DiskIOMonitor() if disk_io or disk_io_health else None
+    psi_health = health_source == "psi"
+    pressure_monitor = create_pressure_monitor() if psi or psi_health else None
+    top_processes = TopProcesses(top) if top else None
+    cgroup_options = dict(cgroup_options or {})
+    cgroup_top = cgroup_options.pop("top", 10)
+    cgroup_monitor = create_cgroup_monitor(cgroup_options, health_model, pressure_monitor is not None,
+                                           psi_health and pressure_monitor is not None) if cgroups else None
+    sender = AgentSender(agent, source) if agent else None
+    publisher = create_publisher(shm) if shm else None
+    detector = None
+    if alerts or alert_hooks:
+        # replayed samples are scored on their recorded time base, whatever the replay speed
+        detector = AnomalyDetector(**(alert_options or {}), **({"clock": replayer.now} if replayer else {}))
+    dispatcher = AlertDispatcher([parse_hook(spec) for spec in alert_hooks]) if alert_hooks else None
+    server = None
+    mount_logger = None
+    cgroup_logger = None
+    diskio_logger = None
+    pressure_logger = None
+    if mount_monitor and log:
+        mount_logger = CsvLogger(mount_logfile(logfile), header=MOUNT_LOG_HEADER, **(log_options or {}))
+    if pressure_monitor and log:
+        pressure_logger = CsvLogger(pressure_logfile(logfile), header=PRESSURE_LOG_HEADER, **(log_options or {}))
+    if diskio_monitor and log:
+        diskio_logger = CsvLogger(diskio_logfile(logfile), header=DISKIO_LOG_HEADER, **(log_options or {}))
+    if cgroup_monitor and log:
+        cgroup_logger = CsvLogger(cgroup_logfile(logfile), header=CGROUP_LOG_HEADER, **(log_options or {}))
+    if store:
+        console.print(f"[bold green]Round-robin storage:[/bold green] {rrd_file} ({store.size // 1024} KB, fixed)")
     psutil.cpu_percent(interval=None)  # initialize non-blocking measurement
+    backend = create_collector(collector)
+    sampler = None
+    window = None
+    if sample_rate:
+        buffer = RingBuffer(ring_capacity(sample_rate, pacer.intervals["slow"] if pacer else interval))
+        sampler = Sampler(lambda: get_stats(per_core=per_core, collector=backend), sample_rate, buffer)
+        sampler.start()
+
+    # The sampler already reads CPU / memory / disk / network at its own rate; the scheduler runs everything else
+    core_sampler = create_core_sampler(top_cores) if per_core and not (sampler or replayer) else None
+    collectors = [] if sampler or replayer else metric_collectors(periods, per_core, backend, disk=not mount_monitor,
+                                                                   cores=core_sampler)
+    if mount_monitor:
+        collectors.append(Collector("mounts", periods["disk"], mount_monitor.collect))
+    if net_monitor:
+        collectors.append(Collector("interfaces", periods["net"], net_monitor.collect, blocking=False))
+    if pressure_monitor:
+        collectors.append(Collector("pressure", periods["cpu"], pressure_monitor.collect, blocking=False))
+    if diskio_monitor:
+        collectors.append(Collector("diskio", periods["cpu"], diskio_monitor.collect, blocking=False))
+    if top_processes:
+        collectors.append(Collector("top", interval, top_processes.collect))
+    if cgroup_monitor:
+        collectors.append(Collector("cgroups", periods["cpu"], cgroup_monitor.collect))
+    profiler = LoopProfiler(enabled=profile)
+    view = LiveView(console, max_fps) if live and not (json_output or stream) else None
+    scheduler = Scheduler(collectors, on_error=lambda name, e: report_error(f"Error reading {name}: {e}", view),
+                          profiler=profiler if profile else None)
+
     start_time = time.time()
     iteration = 0
-    next_time = start_time
     prev_stats = None
     prev_health = None
 
-    while True:
-        stats = get_stats(per_core=per_core)
-        health = calculate_health(stats.cpu, stats.mem, stats.disk)
-
-        if json_output:
-            output_json(stats, health, prev_stats, prev_health)
-        else:
-            display(stats, health, prev_stats, prev_health, per_core)
+    try:
+        if serve:
+            server = MetricsServer(*parse_address(serve))
+            await server.serve()
+            console.print(f"[bold green]Serving OpenMetrics:[/bold green] http://{server.host or '0.0.0.0'}:{server.port}/metrics")
+        await scheduler.start(timeout=max(mount_timeout, interval))
+        ticks = replayer.ticks() if replayer else scheduler.subscribe(lambda: pacer.interval if pacer else interval)
+        async for snapshot in ticks:
+            profiler.begin()
+            stats = snapshot_stats(snapshot)
+            if sampler:
+                window = sampler.window()
+                base = window_stats(window, sampler.latest)
+                stats.cpu, stats.mem, stats.net_sent, stats.net_recv, stats.per_core = (
+                    base.cpu, base.mem, base.net_sent, base.net_recv, base.per_core)
+                if not mount_monitor:
+                    stats.disk = base.disk
+            profiler.lap("collect")
+            health = stats_health(stats, health_model, disk_io_health, psi_health)
+            profiler.lap("health")
+            if detector:
+                stats.alerts = detector.check({"cpu": stats.cpu, "mem": stats.mem, "disk": stats.disk, "health": health},
+                                              stats.timestamp)
+                if dispatcher and stats.alerts:
+                    dispatcher.dispatch(stats.alerts)
+                profiler.lap("alerts")
+            # the interval this sample was taken at is the one logged with it; the next tick uses the updated one
+            sample_interval = pacer.interval if pacer else interval
+            sampling = pacer.summary() if pacer else None
+            if pacer and pacer.update(health, stats.alerts):
+                scheduler.retime(pacer.scale)
+                if not (json_output or stream or view):
+                    console.print(f"[yellow]Sampling {pacer.mode}: every {pacer.interval:g} s[/yellow]")
 
-        if log:
-            log_stats(logfile, stats, health)
+            if stream:
+                if not stream.write(json_record(stats, health, prev_stats, prev_health, window,
+                                                profiler.summary() if profile else None, sampling)):
+                    break  # the reader closed the pipe
+                profiler.lap("json")
+            elif json_output:
+                output_json(stats, health, prev_stats, prev_health, window, profiler.summary() if profile else None, sampling)
+                profiler.lap("json")
+            elif view:
+                if view.due():
+                    view.update(*build_view(stats, health, prev_stats, prev_health, per_core, window, cgroup_top))
+                    profiler.lap("render")
+            else:
+                display(stats, health, prev_stats, prev_health, per_core, window, cgroup_top)
+                profiler.lap("render")
 
-        prev_stats, prev_health = stats, health
-        iteration += 1
-        elapsed = time.time() - start_time
+            if server:
+                server.publish(render_metrics(stats, health, prev_stats, prev_health))
+                profiler.lap("export")
+            if sender:
+                sender.send(stats, health, stats.timestamp)
+                profiler.lap("agent")
+            if publisher:
+                publisher.publish(shm_values(stats, health, sample_interval))
+                profiler.lap("shm")
+            if logger:
+                logger.write(make_row(stats, health, sample_interval if pacer else None))
+            if mount_logger:
+                for row in mount_rows(stats):
+                    mount_logger.write(row)
+            if pressure_logger:
+                for row in pressure_rows(stats):
+                    pressure_logger.write(row)
+            if diskio_logger:
+                for row in diskio_rows(stats):
+                    diskio_logger.write(row)
+            if cgroup_logger:
+                for row in cgroup_rows(stats):
+                    cgroup_logger.write(row)
+            if store:
+                store.update(time.time() if stats.timestamp is None else stats.timestamp, store_values(stats, health))
+            if logger or mount_logger or pressure_logger or diskio_logger or cgroup_logger or store:
+                profiler.lap("log")
 
-        if max_iterations and iteration >= max_iterations:
-            console.print("[bold yellow]Max iterations reached. Stopping monitor.[/bold yellow]")
-            break
-        if max_runtime and elapsed >= max_runtime:
-            console.print("[bold yellow]Max runtime reached. Stopping monitor.[/bold yellow]")
-            break
+            prev_stats, prev_health = stats, health
+            iteration += 1
+            elapsed = time.time() - start_time
 
-        next_time += interval
-        sleep_time = next_time - time.time()
-        if sleep_time > 0:
-            time.sleep(sleep_time)
+            if max_iterations and iteration >= max_iterations:
+                if view:
+                    view.close()
+                console.print("[bold yellow]Max iterations reached. Stopping monitor.[/bold yellow]")
+                break
+            if max_runtime and elapsed >= max_runtime:
+                if view:
+                    view.close()
+                console.print("[bold yellow]Max runtime reached. Stopping monitor.[/bold yellow]")
+                break
+    finally:
+        if view:
+            view.close()
+        await scheduler.stop()
+        if replayer:
+            if stream:
+                stream.write({"replay": replayer.summary()})
+            else:
+                print_replay(replayer, json_output)
+        if profile:
+            if stream:
+                stream.write({"profile": profiler.summary()})
+            else:
+                print_profile(profiler, json_output)
+        if stream:
+            stream.close()
+        if sampler:
+            sampler.stop()
+        if logger:
+            logger.close()
+        if store:
+            store.close()
+        if mount_logger:
+            mount_logger.close()
+        if cgroup_logger:
+            cgroup_logger.close()
+        if cgroup_monitor:
+            cgroup_monitor.close()
+        if mount_monitor:
+            mount_monitor.close()
+        if net_monitor:
+            net_monitor.close()
+        if diskio_logger:
+            diskio_logger.close()
+        if pressure_logger:
+            pressure_logger.close()
+        if pressure_monitor:
+            pressure_monitor.close()
+        if diskio_monitor:
+            diskio_monitor.close()
+        if server:
+            server.stop()
+        if sender:
+            sender.close()
+        if publisher:
+            publisher.close()
+        if dispatcher:
+            dispatcher.close()
+        if core_sampler:
+            core_sampler.close()
+        if backend is not None:
+            backend.close()
 
 # =======================================================================================================================================================================
 # Script Entry / Code Section
@@ -249,22 +1062,266 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Linux System Monitor CLI (with full trend indicators)")
     parser.add_argument('--interval', type=float, default=2, help='Update interval in seconds')
     parser.add_argument('--log', action='store_true', help='Enable CSV logging')
-    parser.add_argument('--logfile', type=str, default="system_log.csv", help='CSV log file path')
+    parser.add_argument('--logfile', type=str, default=None,
+                        help='Log file path (default system_log.csv, or system_log.bin with --log-format binary)')
+    parser.add_argument('--log-format', choices=['csv', 'binary'], default='csv',
+                        help='Log format: csv, or binary fixed-width records readable with binlog.open_binary_log()')
+    parser.add_argument('--once', action='store_true',
+                        help='Print one sample and exit, with a fast start (handled by oneshot.py before the heavy imports)')
+    parser.add_argument('--window', type=float, default=0.2, help='With --once, CPU measurement window in seconds')
+    parser.add_argument('--once-budget', type=float, default=None, metavar='MS',
+                        help='With --once, warn on stderr when start-up to output (window excluded) takes longer (default 50, 150 for the table)')
+    parser.add_argument('--adaptive', action='store_true',
+                        help='Adapt the interval to health: slow while high and steady, fast when it falls or alerts fire (logged per sample)')
+    parser.add_argument('--fast-interval', type=float, default=None, help='With --adaptive, interval during incidents (default --interval / 4)')
+    parser.add_argument('--slow-interval', type=float, default=None, help='With --adaptive, interval while idle (default --interval * 5)')
+    parser.add_argument('--adaptive-high', type=float, default=DEFAULT_HIGH,
+                        help='With --adaptive, health at or above which a steady system is sampled slowly')
+    parser.add_argument('--adaptive-low', type=float, default=DEFAULT_LOW,
+                        help='With --adaptive, health below which sampling goes fast')
+    parser.add_argument('--adaptive-settle', type=float, default=DEFAULT_SETTLE,
+                        help='With --adaptive, seconds of calm before leaving fast sampling')
+    parser.add_argument('--adaptive-stable', type=float, default=DEFAULT_STABLE,
+                        help='With --adaptive, seconds of high, steady health before slowing down')
     parser.add_argument('--max-iterations', type=int, default=None, help='Stop after this many updates')
     parser.add_argument('--max-runtime', type=int, default=None, help='Stop after this many seconds')
     parser.add_argument('--json', action='store_true', help='Output in JSON format instead of table')
     parser.add_argument('--per-core', action='store_true', help='Show per-core CPU usage')
+    parser.add_argument('--top-cores', type=int, default=DEFAULT_TOP_CORES, metavar='K',
+                        help='With --per-core, list the K hottest cores with their user / system / iowait / steal split')
+    parser.add_argument('--cgroups', action='store_true',
+                        help='Per-cgroup (container) CPU, memory, IO, throttling and health from the cgroup v2 hierarchy')
+    parser.add_argument('--cgroup-root', type=str, default=None, help='cgroup v2 mount point (default: found in mountinfo)')
+    parser.add_argument('--cgroup-depth', type=int, default=None, help='Only track cgroups up to this depth below the root')
+    parser.add_argument('--cgroup-top', type=int, default=10, metavar='N', help='Cgroups shown in the table (JSON / logs get all)')
+    parser.add_argument('--collector', choices=['psutil', 'proc'], default='psutil',
+                        help='Metrics backend: psutil, or proc to read /proc directly (falls back to psutil)')
+    parser.add_argument('--sample-rate', type=float, default=None,
+                        help='Sample in the background at this rate (Hz) and report min/mean/max per interval')
+    parser.add_argument('--log-flush-rows', type=int, default=100, help='Flush the CSV log after this many rows')
+    parser.add_argument('--log-flush-secs', type=float, default=10, help='Flush the CSV log at least this often (seconds)')
+    parser.add_argument('--log-fsync', choices=['never', 'flush', 'rotate'], default='rotate',
+                        help='When to fsync the CSV log: never, after every flush, or when a segment is closed')
+    parser.add_argument('--log-max-bytes', type=int, default=None, help='Rotate the CSV log when it reaches this size')
+    parser.add_argument('--log-max-age', type=float, default=None, help='Rotate the CSV log after this many seconds')
+    parser.add_argument('--log-no-compress', action='store_true', help='Do not gzip rotated CSV segments')
+    parser.add_argument('--all-mounts', action='store_true',
+                        help='Monitor every mounted filesystem; health uses the fullest one')
+    parser.add_argument('--mount-timeout', type=float, default=1.0,
+                        help='Seconds to wait for statvfs before marking a mount stale')
+    parser.add_argument('--net-rates', action='store_true',
+                        help='Show per-interface bytes/s, packets/s, errors and drops')
+    parser.add_argument('--disk-io', action='store_true',
+                        help='Show per-device read / write bytes/s, IOPS, await, utilization and queue depth from /proc/diskstats')
+    parser.add_argument('--disk-io-health', action='store_true',
+                        help='Score the busiest device utilization in the health disk term when it exceeds space used (implies --disk-io)')
+    parser.add_argument('--psi', action='store_true',
+                        help='Show CPU / memory / IO pressure stall information (system-wide, and per cgroup with --cgroups)')
+    parser.add_argument('--top', type=int, default=None, metavar='N',
+                        help='Show the N heaviest processes by CPU and by RSS')
+    parser.add_argument('--cpu-period', type=float, default=DEFAULT_PERIODS['cpu'], help='Seconds between CPU reads')
+    parser.add_argument('--mem-period', type=float, default=DEFAULT_PERIODS['mem'], help='Seconds between memory reads')
+    parser.add_argument('--disk-period', type=float, default=DEFAULT_PERIODS['disk'],
+                        help='Seconds between disk usage reads (also --all-mounts)')
+    parser.add_argument('--net-period', type=float, default=DEFAULT_PERIODS['net'],
+                        help='Seconds between network reads (also --net-rates)')
+    parser.add_argument('--live', action='store_true',
+                        help='Flicker-free display: keep the screen and rewrite only the lines that changed')
+    parser.add_argument('--max-fps', type=float, default=4.0,
+                        help='With --live, draw at most this many frames per second (independent of --interval)')
+    parser.add_argument('--ndjson', action='store_true',
+                        help='Stream one compact JSON object per line to stdout (status messages go to stderr)')
+    parser.add_argument('--ndjson-flush-lines', type=int, default=10, help='Flush NDJSON output after this many lines')
+    parser.add_argument('--ndjson-flush-secs', type=float, default=1.0, help='Flush NDJSON output at least this often (seconds)')
+    parser.add_argument('--json-backend', choices=['auto', 'orjson', 'json'], default='auto',
+                        help='NDJSON encoder: orjson when installed (auto), or the standard json module')
+    parser.add_argument('--profile', action='store_true',
+                        help='Record per-stage timings, tick jitter and missed deadlines; print them on exit and add them to JSON')
+    parser.add_argument('--agent', type=str, default=None, metavar='ADDR',
+                        help='Also send every sample to a collector (udp://HOST:PORT or unix:///PATH)')
+    parser.add_argument('--source', type=str, default=None, help='Source name reported to the collector (default hostname)')
+    parser.add_argument('--alerts', action='store_true',
+                        help='Detect anomalies with per-metric EWMA z-scores and rate-of-change detectors')
+    parser.add_argument('--alert-hook', action='append', default=None, metavar='SPEC',
+                        help='Alert hook (implies --alerts, repeatable): exec:COMMAND, http://URL or file:PATH')
+    parser.add_argument('--alert-z', type=float, default=3.0, help='Z-score that raises an anomaly alert')
+    parser.add_argument('--alert-alpha', type=float, default=0.1, help='EWMA smoothing factor (0-1)')
+    parser.add_argument('--alert-cooldown', type=float, default=60.0, help='Minimum seconds between alerts of one kind per metric')
+    parser.add_argument('--alert-rate', action='append', default=None, metavar='METRIC=LIMIT',
+                        help='Rate-of-change trigger in units per second (repeatable), e.g. cpu=25 mem=5')
+    parser.add_argument('--health-profile', choices=list(PROFILES), default='default',
+                        help='Health weight profile (default: cpu 40 %%, memory 40 %%, disk 20 %%)')
+    parser.add_argument('--health-weight', action='append', default=None, metavar='METRIC=W',
+                        help='Override one health weight (repeatable), e.g. cpu=0.5; weights are relative')
+    parser.add_argument('--health-curve', action='append', default=None, metavar='METRIC=CURVE',
+                        help='Penalty curve per metric (repeatable): linear, quadratic, knee:T[:SLOPE] or exp[:SHAPE]')
+    parser.add_argument('--health-source', choices=['usage', 'psi'], default='usage',
+                        help='Score utilization (default) or pressure stall time (psi, implies --psi; cpu / mem / disk weights apply to cpu / memory / io stalls)')
+    parser.add_argument('--replay', action='extend', nargs='+', default=None, metavar='FILE',
+                        help='Feed recorded logs (CSV, .gz or binary, in time order) through the pipeline instead of live metrics')
+    parser.add_argument('--speed', type=str, default='1x',
+                        help="With --replay, play at this multiple of the recorded rate (e.g. 100x) or 'max' (default 1x)")
+    parser.add_argument('--serve', type=str, default=None, metavar='[HOST]:PORT',
+                        help='Expose the latest sample as OpenMetrics at http://HOST:PORT/metrics (e.g. :9100)')
+    parser.add_argument('--shm', nargs='?', const=SHM_NAME, default=None, metavar='NAME',
+                        help=f'Publish the latest sample in shared memory segment NAME (default {SHM_NAME}) for local readers (shm.SampleReader)')
+    parser.add_argument('--rrd', type=str, default=None,
+                        help='Keep raw / 1-minute / 1-hour rollups in this fixed-size round-robin file')
+    parser.add_argument('--rrd-raw', type=str, default='1h', help='Raw sample retention (e.g. 30m, 1h)')
+    parser.add_argument('--rrd-minutes', type=str, default='7d', help='1-minute rollup retention (e.g. 7d)')
+    parser.add_argument('--rrd-hours', type=str, default='365d', help='1-hour rollup retention (e.g. 365d)')
+    subparsers = parser.add_subparsers(dest='command')
+    analyze_parser = subparsers.add_parser('analyze', help='Compute windowed statistics over recorded logs (CSV, .gz or binary)')
+    analyze_parser.add_argument('files', nargs='+', help='Log files to analyze, in time order (e.g. rotated segments)')
+    analyze_parser.add_argument('--window', type=float, default=60, help='Window length in seconds')
+    analyze_parser.add_argument('--output', type=str, default=None, help="Write per-window CSV rows to this file ('-' for stdout; the summary then goes to stderr)")
+    analyze_parser.add_argument('--chunk-rows', type=int, default=100_000, help='Rows processed per chunk')
+    analyze_parser.add_argument('--json', action='store_true', help='Print the summary as JSON instead of a table')
+    rescore_parser = subparsers.add_parser('rescore', help='Recompute the health column of recorded logs with a new health model')
+    rescore_parser.add_argument('files', nargs='+', help='Log files to rescore in place (CSV, .gz or binary)')
+    rescore_parser.add_argument('--output', type=str, default=None, help='Write the rescored log here instead (one input file only)')
+    rescore_parser.add_argument('--health-profile', choices=list(PROFILES), default='default', help='Health weight profile')
+    rescore_parser.add_argument('--health-weight', action='append', default=None, metavar='METRIC=W',
+                                help='Override one health weight (repeatable), e.g. disk=0.5')
+    rescore_parser.add_argument('--health-curve', action='append', default=None, metavar='METRIC=CURVE',
+                                help='Penalty curve per metric (repeatable): linear, quadratic, knee:T[:SLOPE] or exp[:SHAPE]')
+    rescore_parser.add_argument('--chunk-rows', type=int, default=100_000, help='Rows processed per chunk')
+    collect_parser = subparsers.add_parser('collect', help='Aggregate samples sent by many agents (--agent) into one view')
+    collect_parser.add_argument('--listen', type=str, default=DEFAULT_LISTEN,
+                                help=f'Endpoint to receive on: udp://HOST:PORT or unix:///PATH (default {DEFAULT_LISTEN})')
+    collect_parser.add_argument('--interval', type=float, default=1.0, help='Table refresh / NDJSON flush interval in seconds')
+    collect_parser.add_argument('--stale-after', type=float, default=5.0, help='Mark a source stale after this many silent seconds')
+    collect_parser.add_argument('--history', type=int, default=60, help='Samples kept per source (ring buffer)')
+    collect_parser.add_argument('--ndjson', action='store_true', help='Stream every received sample as one JSON line')
+    collect_parser.add_argument('--ndjson-flush-lines', type=int, default=100, help='Flush NDJSON output after this many lines')
+    collect_parser.add_argument('--log', type=str, default=None, metavar='PATH', help='Log every received sample to this CSV file')
+    collect_parser.add_argument('--live', action='store_true', help='Flicker-free table (only changed lines are redrawn)')
+    collect_parser.add_argument('--max-runtime', type=float, default=None, help='Stop after this many seconds')
     args = parser.parse_args()
 
+    if args.command == 'analyze':
+        import analyze  # numpy is only needed for offline analysis
+        try:
+            analyze.run(args, console)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))   # missing file, not a sysmon log, --window 0 ...
+        raise SystemExit(0)
+    if args.command == 'rescore':
+        import health
+        try:
+            health.run(args, console)
+        except ValueError as e:
+            parser.error(str(e))
+        raise SystemExit(0)
+    if args.command == 'collect':
+        import agent
+        try:
+            agent.resolve_endpoint(args.listen)
+        except ValueError as e:
+            parser.error(str(e))
+        try:
+            agent.run(args, console)
+        except KeyboardInterrupt:
+            console.print("\n[bold red]Collector stopped by user[/bold red]")
+        raise SystemExit(0)
+
+    # zero or negative periods would divide by zero in the scheduler's lateness count and the RRD sizing
+    for option in ("interval", "cpu_period", "mem_period", "disk_period", "net_period"):
+        if getattr(args, option) <= 0:
+            parser.error(f"--{option.replace('_', '-')} must be positive")
+    if args.sample_rate is not None and args.sample_rate <= 0:
+        parser.error("--sample-rate must be positive")
+    # replay files are opened lazily by the tick loop - a missing one must not surface after the display has started
+    for path in args.replay or []:
+        if not os.path.isfile(path) or not os.access(path, os.R_OK):
+            parser.error(f"--replay {path}: not a readable file")
+
+    adaptive_options = {"fast": args.fast_interval, "slow": args.slow_interval, "high": args.adaptive_high,
+                        "low": args.adaptive_low, "settle": args.adaptive_settle, "stable": args.adaptive_stable}
+    logfile = args.logfile or ("system_log.bin" if args.log_format == "binary" else "system_log.csv")
+    try:
+        health_model = create_model(args.health_profile, args.health_weight, args.health_curve)
+        speed = parse_speed(args.speed)
+        fastest = args.interval
+        if args.adaptive:
+            pacer = AdaptiveInterval(args.interval, **adaptive_options)  # reject bad intervals / thresholds before starting
+            fastest = fastest if args.replay else pacer.intervals["fast"]
+        if args.serve:
+            parse_address(args.serve)
+        if args.agent:
+            resolve_endpoint(args.agent)
+        create_encoder(args.json_backend)  # --json-backend orjson without orjson installed
+        alert_rate_limits = parse_rate_limits(args.alert_rate)
+        for spec in args.alert_hook or []:
+            parse_hook(spec)
+        if args.log and args.log_format == "binary":
+            # an existing binary log with (or without) the interval field cannot take the other record layout
+            create_logger(logfile, "binary", interval=args.adaptive and not args.replay)[0].close()
+        if args.rrd:
+            # bad retention or a file that is not a compatible store: usage error instead of a traceback from the loop
+            create_store(args.rrd, fastest, (args.rrd_raw, args.rrd_minutes, args.rrd_hours)).close()
+    except ValueError as e:
+        parser.error(str(e))
     try:
         main(
             interval=args.interval,
             log=args.log,
-            logfile=args.logfile,
+            logfile=logfile,
+            log_format=args.log_format,
+            rrd_file=args.rrd,
+            rrd_retention=(args.rrd_raw, args.rrd_minutes, args.rrd_hours),
+            all_mounts=args.all_mounts,
+            mount_timeout=args.mount_timeout,
+            net_rates=args.net_rates,
+            disk_io=args.disk_io,
+            disk_io_health=args.disk_io_health,
+            psi=args.psi,
+            shm=args.shm,
+            adaptive=args.adaptive,
+            adaptive_options=adaptive_options,
+            top=args.top,
+            serve=args.serve,
+            profile=args.profile,
+            live=args.live,
+            ndjson=args.ndjson,
+            agent=args.agent,
+            alerts=args.alerts,
+            alert_hooks=args.alert_hook,
+            alert_options={
+                "alpha": args.alert_alpha,
+                "threshold": args.alert_z,
+                "cooldown": args.alert_cooldown,
+                "rate_limits": alert_rate_limits,
+            },
+            source=args.source,
+            health_model=health_model,
+            health_source=args.health_source,
+            replay=args.replay,
+            speed=speed,
+            ndjson_options={
+                "flush_lines": args.ndjson_flush_lines,
+                "flush_interval": args.ndjson_flush_secs,
+                "backend": args.json_backend,
+            },
+            max_fps=args.max_fps,
+            periods={"cpu": args.cpu_period, "mem": args.mem_period, "disk": args.disk_period, "net": args.net_period},
             max_iterations=args.max_iterations,
             max_runtime=args.max_runtime,
             json_output=args.json,
-            per_core=args.per_core
+            per_core=args.per_core,
+            top_cores=args.top_cores,
+            cgroups=args.cgroups,
+            cgroup_options={"root": args.cgroup_root, "max_depth": args.cgroup_depth, "top": args.cgroup_top},
+            collector=args.collector,
+            sample_rate=args.sample_rate,
+            log_options={
+                "flush_rows": args.log_flush_rows,
+                "flush_interval": args.log_flush_secs,
+                "fsync": args.log_fsync,
+                "max_bytes": args.log_max_bytes,
+                "max_age": args.log_max_age,
+                "compress": not args.log_no_compress,
+            }
         )
     except KeyboardInterrupt:
         console.print("\n[bold red]Monitor stopped by user[/bold red]")
\ No newline at end of file
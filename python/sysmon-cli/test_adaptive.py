@@ -0,0 +1,173 @@
+import asyncio
+import csv
+import gzip
+import os
+import subprocess
+import sys
+import pytest
+from adaptive import AdaptiveInterval
+from anomaly import Alert
+from binlog import open_binary_log, BinaryLogger, RECORD_SIZE
+from rrd import stored_rows
+from csvlog import INTERVAL_LOG_HEADER, LOG_HEADER
+from scheduler import Collector, Scheduler
+from sysmon_cli import SystemStats, create_logger, json_record
+
+def alert(state):
+    return Alert("cpu", "zscore", state, 95.0, 6.2, "2025-11-20T10:00:00", "cpu spike")
+
+def feed(pacer, health, samples, alerts=None):
+    """Feed the same health `samples` times, returning the modes seen after each one."""
+    return [pacer.update(health, alerts) and pacer.mode for _ in range(samples)]
+
+#=====================================================
+#Controller
+#=====================================================
+
+def test_slow_only_after_stable_time():
+    """High, steady health slows sampling after 60 s of it; a wobble restarts the count."""
+    pacer = AdaptiveInterval(2.0)
+    assert pacer.intervals == {"fast": 0.5, "normal": 2.0, "slow": 10.0}
+    feed(pacer, 95.0, 20)
+    pacer.update(88.0)
+    assert pacer.mode == "normal"
+    assert feed(pacer, 95.0, 31).index("slow") == 30 and pacer.scale == 5.0
+    assert pacer.update(88.0) is False and pacer.mode == "slow"   # inside the hysteresis band
+    assert pacer.update(84.0) is True and pacer.mode == "normal"
+
+def test_fast_on_low_health_drop_or_alert():
+    """Any of the three triggers switches to fast at once, from any mode."""
+    for trigger in ((50.0, None), (75.0, None), (95.0, [alert("resolved"), alert("firing")])):
+        pacer = AdaptiveInterval(2.0, settle=10.0)
+        feed(pacer, 95.0, 40)
+        assert pacer.mode == "slow"
+        assert pacer.update(*trigger) is True and pacer.interval == 0.5
+
+def test_first_sample_health_is_ignored():
+    """A 100 % CPU first reading does not start fast sampling; the same health later does, and so does an alert at once."""
+    pacer = AdaptiveInterval(2.0)
+    assert pacer.update(52.86) is False and pacer.mode == "normal"
+    assert pacer.update(52.86) is True and pacer.mode == "fast"
+    pacer = AdaptiveInterval(2.0)
+    assert pacer.update(95.0, [alert("firing")]) is True and pacer.mode == "fast"
+
+def test_resolved_alerts_do_not_go_fast():
+    """An alert clearing is the end of an incident, not the start of one."""
+    pacer = AdaptiveInterval(2.0)
+    feed(pacer, 95.0, 40)
+    assert pacer.update(95.0, [alert("resolved")]) is False and pacer.mode == "slow"
+
+def test_fast_backs_off_after_settle_time():
+    """Leaving fast needs health above low + margin for the settle time, measured at the fast rate."""
+    pacer = AdaptiveInterval(2.0, settle=30.0)
+    feed(pacer, 95.0, 2)
+    pacer.update(40.0)
+    feed(pacer, 62.0, 100)                  # above low, but inside the margin: stays fast
+    assert pacer.mode == "fast"
+    modes = feed(pacer, 70.0, 60)
+    assert modes.index("normal") == 59 and pacer.switches == {"fast": 1, "normal": 1, "slow": 0}
+
+def test_invalid_settings():
+    with pytest.raises(ValueError):
+        AdaptiveInterval(2.0, fast=3.0)
+    with pytest.raises(ValueError):
+        AdaptiveInterval(2.0, high=50.0, low=60.0)
+
+#=====================================================
+#Scheduling
+#=====================================================
+
+def test_subscribe_follows_a_changing_interval():
+    """A callable interval is read after every tick."""
+    async def scenario():
+        scheduler = Scheduler([])
+        loop = asyncio.get_running_loop()
+        intervals = iter([0.01, 0.01, 0.2])
+        stamps = []
+        async for _ in scheduler.subscribe(lambda: next(intervals)):
+            stamps.append(loop.time())
+            if len(stamps) == 3:
+                break
+        return stamps
+
+    stamps = asyncio.run(scenario())
+    assert stamps[2] - stamps[1] < 0.1
+
+def test_retime_wakes_a_sleeping_collector():
+    """Shortening the periods brings the next read forward instead of waiting out the old period."""
+    async def scenario():
+        scheduler = Scheduler([Collector("cpu", 10.0, lambda: 1, blocking=False)])
+        await scheduler.start()
+        await asyncio.sleep(0.02)
+        scheduler.retime(0.002)
+        await asyncio.sleep(0.1)
+        await scheduler.stop()
+        return scheduler
+
+    scheduler = asyncio.run(scenario())
+    assert scheduler.collectors[0].period == pytest.approx(0.02)
+    assert scheduler.runs["cpu"] >= 3
+
+#=====================================================
+#Logged Interval
+#=====================================================
+
+def test_interval_in_csv_json_and_binary_logs(tmp_path):
+    """Every logged sample carries the interval it was taken at; binary logs without it still read."""
+    stats = SystemStats(10.0, 20.0, 30.0, 1, 2, timestamp=1_700_000_000.0)
+    logger, make_row = create_logger(str(tmp_path / "log.csv"), interval=True)
+    logger.write(make_row(stats, 90.0, 0.5))
+    logger.close()
+    with open(tmp_path / "log.csv", newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == INTERVAL_LOG_HEADER and rows[1][-1] == "0.5"
+
+    logger, make_row = create_logger(str(tmp_path / "log.bin"), "binary", interval=True)
+    logger.write(make_row(stats, 90.0, 10.0))
+    logger.close()
+    log = open_binary_log(str(tmp_path / "log.bin"))
+    assert log["interval"].tolist() == [10.0] and log["cpu"].tolist() == [10.0]
+    with pytest.raises(ValueError):
+        BinaryLogger(str(tmp_path / "log.bin"))     # no silent mix of layouts in one file
+
+    logger, make_row = create_logger(str(tmp_path / "plain.bin"), "binary")
+    logger.write(make_row(stats, 90.0))
+    logger.close()
+    assert "interval" not in open_binary_log(str(tmp_path / "plain.bin")).columns and RECORD_SIZE == 40
+
+    pacer = AdaptiveInterval(2.0)
+    assert json_record(stats, 90.0, sampling=pacer.summary())["sampling"]["interval"] == 2.0
+
+def test_switching_csv_layout_starts_a_new_segment(tmp_path):
+    """A CSV log written without the interval column is set aside, not appended to with a different row width."""
+    stats = SystemStats(10.0, 20.0, 30.0, 1, 2, timestamp=1_700_000_000.0)
+    path = str(tmp_path / "log.csv")
+    logger, make_row = create_logger(path)
+    logger.write(make_row(stats, 90.0))
+    logger.close()
+    logger, make_row = create_logger(path, interval=True)
+    logger.write(make_row(stats, 90.0, 0.5))
+    logger.close()
+    with open(path, newline="") as f:
+        assert list(csv.reader(f))[0] == INTERVAL_LOG_HEADER
+    with gzip.open(logger.rotated[0] + ".gz", "rt", newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == LOG_HEADER and len(rows) == 2
+
+def test_binary_layout_mismatch_is_a_usage_error(tmp_path):
+    """--adaptive on a binary log written without the interval field is refused by argparse, before the monitor starts."""
+    path = str(tmp_path / "log.bin")
+    BinaryLogger(path).close()
+    result = subprocess.run([sys.executable, "sysmon_cli.py", "--adaptive", "--log", "--log-format", "binary", "--logfile", path,
+                             "--max-iterations", "1"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                            capture_output=True, text=True, timeout=30)
+    assert result.returncode == 2 and "without the interval field" in result.stderr and "Traceback" not in result.stderr
+
+def test_rrd_raw_tier_is_sized_for_the_fast_interval(tmp_path):
+    """--rrd-raw is the retention at the fastest rate: 1 h at 0.5 s needs 7200 rows, not the 1800 of a 2 s interval."""
+    path = str(tmp_path / "sysmon.rrd")
+    result = subprocess.run([sys.executable, "sysmon_cli.py", "--adaptive", "--interval", "2", "--rrd", path, "--rrd-raw", "1h",
+                             "--json", "--max-iterations", "1"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                            capture_output=True, text=True, timeout=30)
+    assert result.returncode == 0, result.stderr
+    assert stored_rows(path)["raw"] == 7200
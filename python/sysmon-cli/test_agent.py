@@ -0,0 +1,169 @@
+import asyncio
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+import pytest
+from rich.console import Console
+from agent import (AgentSender, Aggregator, PACKET, collect, decode_sample, encode_sample, listen, parse_endpoint,
+                   resolve_endpoint, source_table)
+from ndjson import NdjsonWriter
+from sysmon_cli import SystemStats
+
+def quiet_console():
+    return Console(file=io.StringIO(), width=200)
+
+#=====================================================
+#Wire format
+#=====================================================
+
+def test_encode_decode_roundtrip():
+    """One sample is a 54-byte header plus the source name."""
+    packet = encode_sample("board-07", 5, 1700000000.5, 12.5, 40.0, 60.0, 71.25, 1024, 2048)
+    assert len(packet) == PACKET.size + len("board-07") == 62
+    sample = decode_sample(packet)
+    assert (sample.source, sample.seq, sample.timestamp) == ("board-07", 5, 1700000000.5)
+    assert (sample.cpu, sample.health, sample.net_recv) == (12.5, 71.25, 2048)
+
+@pytest.mark.parametrize("data", [b"", b"x" * 60, encode_sample("a", 1, 0, 1, 2, 3, 4, 5, 6) + b"junk"])
+def test_decode_rejects_garbage(data):
+    with pytest.raises(ValueError):
+        decode_sample(data)
+
+def test_parse_endpoint():
+    assert parse_endpoint("udp://10.0.0.1:9200") == ("udp", ("10.0.0.1", 9200))
+    assert parse_endpoint(":9200") == ("udp", ("0.0.0.0", 9200))
+    assert parse_endpoint("unix:///run/sysmon.sock") == ("unix", "/run/sysmon.sock")
+    for bad in ("bogus", "udp://host:abc", ":70000"):
+        with pytest.raises(ValueError, match="invalid endpoint"):
+            parse_endpoint(bad)
+    with pytest.raises(ValueError, match="cannot resolve"):
+        resolve_endpoint("udp://nosuchhost.invalid:9200")
+
+def test_bad_endpoints_are_usage_errors():
+    """A malformed or unresolvable --agent / --listen endpoint is reported by argparse, before anything starts."""
+    for args in (["--agent", "bogus", "--max-iterations", "1"], ["--agent", "udp://nosuchhost.invalid:9200", "--max-iterations", "1"],
+                 ["collect", "--listen", "bogus", "--max-runtime", "1"]):
+        result = subprocess.run([sys.executable, "sysmon_cli.py", *args],
+                                cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, timeout=30)
+        assert result.returncode == 2 and "endpoint" in result.stderr and "Traceback" not in result.stderr
+
+#=====================================================
+#Aggregator
+#=====================================================
+
+def test_sequence_gaps_reorders_and_restarts():
+    now = [100.0]
+    aggregator = Aggregator(capacity=4, stale_after=5, clock=lambda: now[0])
+    for seq in (1, 2, 5):
+        aggregator.ingest(encode_sample("a", seq, seq, seq * 10, 0, 0, 90, 0, 0))
+    state = aggregator.states["a"]
+    assert state.lost == 2 and state.received == 3
+
+    assert aggregator.ingest(encode_sample("a", 4, 4, 0, 0, 0, 90, 0, 0)) is None   # late datagram
+    assert state.reordered == 1 and state.latest.seq == 5
+
+    aggregator.ingest(encode_sample("a", 1, 9, 1, 0, 0, 90, 0, 0, boot=7))          # agent restarted
+    assert state.restarts == 1 and state.latest.seq == 1
+    assert aggregator.ingest(encode_sample("a", 6, 6, 0, 0, 0, 90, 0, 0)) is None   # late, from the previous run
+
+    aggregator.ingest(b"garbage")
+    assert aggregator.invalid == 1
+    assert state.buffer.summary()["cpu"] == (1.0, (10 + 20 + 50 + 1) / 4, 50.0)
+
+    assert not aggregator.is_stale(state)
+    now[0] = 106.0
+    assert aggregator.is_stale(state)
+    assert "(stale)" in _render(source_table(aggregator))
+
+def test_sequence_wraps_at_32_bits():
+    aggregator = Aggregator()
+    aggregator.ingest(encode_sample("a", 2 ** 32 - 1, 0, 0, 0, 0, 0, 0, 0))
+    aggregator.ingest(encode_sample("a", 0, 0, 0, 0, 0, 0, 0, 0))
+    aggregator.ingest(encode_sample("a", 1, 0, 0, 0, 0, 0, 0, 0))
+    state = aggregator.states["a"]
+    assert (state.received, state.lost, state.restarts, state.reordered) == (3, 0, 0, 0)
+
+def test_restart_with_lost_first_datagram():
+    """A restarted agent is accepted at once even when its seq == 1 datagram never arrives."""
+    aggregator = Aggregator()
+    for seq in range(1000, 1010):
+        aggregator.ingest(encode_sample("a", seq, seq, 0, 0, 0, 90, 0, 0, boot=1))
+    accepted = [aggregator.ingest(encode_sample("a", seq, seq, 0, 0, 0, 90, 0, 0, boot=2)) for seq in range(2, 50)]
+    state = aggregator.states["a"]
+    assert all(accepted) and (state.restarts, state.reordered, state.lost) == (1, 0, 0)
+
+def test_sender_boot_id_changes_per_run():
+    first, second = AgentSender("udp://127.0.0.1:9"), AgentSender("udp://127.0.0.1:9")
+    assert first.boot != second.boot
+    first.close()
+    second.close()
+
+def _render(table):
+    console = Console(file=io.StringIO(), width=200)
+    console.print(table)
+    return console.file.getvalue()
+
+#=====================================================
+#Loopback
+#=====================================================
+
+def test_several_agents_over_udp_loopback():
+    """Several local agents stream to one collector; every source shows up with its latest values."""
+    async def scenario():
+        aggregator = Aggregator()
+        transport = await listen("udp://127.0.0.1:0", aggregator)
+        port = transport.get_extra_info("sockname")[1]
+        senders = [AgentSender(f"udp://127.0.0.1:{port}", f"board-{i}") for i in range(5)]
+        for tick in range(3):
+            for i, sender in enumerate(senders):
+                sender.send(SystemStats(i * 10 + tick, 20, 30, 1, 2), 80.0)
+            await asyncio.sleep(0.05)
+        for sender in senders:
+            sender.close()
+        transport.close()
+        return aggregator
+
+    aggregator = asyncio.run(scenario())
+    assert [s.source for s in aggregator.sources()] == [f"board-{i}" for i in range(5)]
+    assert all(s.received == 3 and s.lost == 0 for s in aggregator.sources())
+    assert aggregator.states["board-4"].latest.cpu == 42.0
+
+def test_unix_socket_collector_streams_ndjson(tmp_path):
+    path = str(tmp_path / "sysmon.sock")
+    out = io.BytesIO()
+    stream = NdjsonWriter(out, flush_lines=1000)
+
+    async def scenario():
+        task = asyncio.create_task(collect(f"unix://{path}", quiet_console(), interval=0.05, stream=stream, max_runtime=0.3))
+        await asyncio.sleep(0.05)
+        sender = AgentSender(f"unix://{path}", "container-1")
+        sender.send(SystemStats(5, 6, 7, 8, 9), 95.0)
+        sender.send(SystemStats(6, 6, 7, 8, 9), 94.0)
+        sender.close()
+        return await task
+
+    aggregator = asyncio.run(scenario())
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [line["cpu"] for line in lines] == [5.0, 6.0]
+    assert lines[0]["source"] == "container-1"
+    assert aggregator.states["container-1"].received == 2
+
+def test_sender_survives_missing_collector(tmp_path):
+    sender = AgentSender(f"unix://{tmp_path / 'nobody.sock'}", "a")
+    sender.send(SystemStats(1, 2, 3, 4, 5), 90)
+    assert sender.errors == 1 and sender.sent == 0
+    sender.close()
+
+def test_ingest_rate_hundreds_of_agents():
+    """Merging 500 agents x 20 samples stays far below one core's budget at 1 Hz."""
+    packets = [encode_sample(f"agent-{i:03d}", seq, seq, 10, 20, 30, 80, 1, 2) for seq in range(1, 21) for i in range(500)]
+    aggregator = Aggregator()
+    started = time.perf_counter()
+    for packet in packets:
+        aggregator.ingest(packet)
+    elapsed = time.perf_counter() - started
+    assert len(aggregator.states) == 500
+    assert elapsed / len(packets) < 100e-6
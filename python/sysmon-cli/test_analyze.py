@@ -0,0 +1,125 @@
+import csv
+import gzip
+import io
+import os
+import subprocess
+import sys
+import numpy as np
+import pytest
+from argparse import Namespace
+from rich.console import Console
+from analyze import WindowAggregator, analyze_logs, parse_csv_lines, run, sorted_percentile
+from binlog import BinaryLogger
+from csvlog import LOG_HEADER
+
+def read_windows(buffer):
+    buffer.seek(0)
+    return list(csv.DictReader(buffer))
+
+#=====================================================
+#Vectorized Math
+#=====================================================
+
+def test_sorted_percentile_matches_numpy():
+    """Run-wise percentiles should match np.percentile for each run."""
+    a, b = np.array([5.0, 1.0, 3.0, 2.0]), np.array([10.0, 30.0, 20.0])
+    ordered = np.concatenate([np.sort(a), np.sort(b)])
+    starts, counts = np.array([0, 4]), np.array([4, 3])
+    for q in (50, 95, 99):
+        expected = [np.percentile(a, q), np.percentile(b, q)]
+        assert sorted_percentile(ordered, starts, counts, q) == pytest.approx(expected)
+
+def test_windows_span_chunk_boundaries():
+    """Small chunks must give the same windows as one big chunk."""
+    ts = np.arange(250, dtype=float)
+    values = np.column_stack([ts % 17, ts % 5, ts % 3, 100 - ts % 11])
+    whole = WindowAggregator(60)
+    expected = whole.feed(ts, values)
+    last = whole.finish()
+
+    chunked = WindowAggregator(60)
+    results = [chunked.feed(ts[i:i + 7], values[i:i + 7]) for i in range(0, 250, 7)]
+    results = [r for r in results if r is not None] + [chunked.finish()]
+    p95 = np.concatenate([r["cpu_p95"] for r in results])
+    assert p95 == pytest.approx(np.append(expected["cpu_p95"], last["cpu_p95"]))
+    assert sum(int(r["samples"].sum()) for r in results) == 250
+    assert chunked._carry_ts.size == 0
+
+def test_parse_csv_lines_skips_repeated_headers():
+    """A header line in the middle of a chunk should fall back to the per-row parser."""
+    lines = ["2025-01-01 00:00:00,1,2,3,4,5,6\r\n", ",".join(LOG_HEADER) + "\r\n", "2025-01-01 00:00:01,7,8,9,10,11,12\r\n"]
+    stamps, values = parse_csv_lines(lines, 7, [1, 4])
+    assert len(stamps) == 2
+    assert values.tolist() == [[1, 4], [7, 10]]
+
+#=====================================================
+#End-to-end Analysis
+#=====================================================
+
+def test_analyze_csv_windows_match_numpy(tmp_path, make_rows, write_csv):
+    """Per-window stats from a streamed CSV should match direct NumPy results."""
+    rows = make_rows(300)
+    path = tmp_path / "log.csv"
+    write_csv(path, rows)
+    out = io.StringIO()
+    summary = analyze_logs([str(path)], window=60, output=out, chunk_rows=37)
+
+    windows = read_windows(out)
+    assert len(windows) == 5
+    first = np.array([r[1] for r in rows[:60]])
+    assert float(windows[0]["samples"]) == 60
+    assert float(windows[0]["cpu_max"]) == pytest.approx(first.max(), abs=0.01)
+    assert float(windows[0]["cpu_p99"]) == pytest.approx(np.percentile(first, 99), abs=0.01)
+    assert summary["rows"] == 300
+    assert summary["metrics"]["mem"]["mean"] == pytest.approx(np.mean([r[2] for r in rows]), abs=0.01)
+
+def test_analyze_health_summary(tmp_path, make_rows, write_csv):
+    """Health percentages should cover every sample."""
+    path = tmp_path / "log.csv"
+    write_csv(path, make_rows(200))
+    health = analyze_logs([str(path)], window=60)["health"]
+    assert health["ok_pct"] + health["warning_pct"] + health["critical_pct"] == pytest.approx(100)
+    assert "worst_window" in health
+
+def test_analyze_rotated_gzip_and_binary_segments(tmp_path, make_rows, write_csv):
+    """Gzipped CSV segments and binary logs should stream like plain CSV."""
+    rows = make_rows(120)
+    gz_path = tmp_path / "log.20250101.csv.gz"
+    write_csv(gz_path, rows[:60], opener=gzip.open)
+
+    bin_path = tmp_path / "log.bin"
+    logger = BinaryLogger(str(bin_path))
+    for row in rows[60:]:
+        logger.write((row[0].timestamp(),) + tuple(row[1:]))
+    logger.close()
+
+    out = io.StringIO()
+    summary = analyze_logs([str(gz_path), str(bin_path)], window=60, output=out)
+    windows = read_windows(out)
+    assert summary["rows"] == 120
+    assert [w["window_start"] for w in windows] == ["2025-01-01 00:00:00", "2025-01-01 00:01:00"]
+
+def test_window_must_be_positive():
+    with pytest.raises(ValueError):
+        WindowAggregator(0)
+
+def test_output_to_stdout_keeps_summary_off_stdout(tmp_path, capsys, make_rows, write_csv):
+    """With --output - stdout is pure CSV; the table / JSON summary goes to stderr."""
+    path = tmp_path / "log.csv"
+    write_csv(path, make_rows(120))
+    for json_output in (False, True):
+        run(Namespace(files=[str(path)], window=60, output="-", chunk_rows=100, json=json_output), Console(width=120))
+        out, err = capsys.readouterr()
+        assert [w["window_start"] for w in read_windows(io.StringIO(out))] == ["2025-01-01 00:00:00", "2025-01-01 00:01:00"]
+        assert ('"rows": 120' if json_output else "Health") in err
+
+def test_bad_input_is_a_usage_error(tmp_path):
+    """A missing file, a CSV that is not a sysmon log or --window 0 are reported by argparse, not as tracebacks."""
+    (tmp_path / "other.csv").write_text("a,b,c\n1,2,3\n")
+    (tmp_path / "log.csv").write_text(",".join(LOG_HEADER) + "\n")
+    cases = ((["missing.csv"], "missing.csv"), ([str(tmp_path / "other.csv")], "not a sysmon log"),
+             ([str(tmp_path / "log.csv"), "--window", "0"], "error:"))
+    for args, message in cases:
+        result = subprocess.run([sys.executable, "sysmon_cli.py", "analyze", *args], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                capture_output=True, text=True, timeout=30)
+        assert result.returncode == 2 and message in result.stderr and "Traceback" not in result.stderr
@@ -0,0 +1,140 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import pytest
+from anomaly import (Alert, AlertDispatcher, AnomalyDetector, EwmaDetector, ExecHook, FileHook, Hysteresis, RateDetector,
+                     WebhookHook, parse_hook, parse_rate_limits)
+from sysmon_cli import SystemStats, json_record
+
+def feed(detector, values, start=0.0, step=1.0):
+    alerts = []
+    for i, value in enumerate(values):
+        detector.clock = lambda t=start + i * step: t
+        alerts += detector.check(value)
+    return alerts
+
+def sample_alert():
+    return Alert("cpu", "zscore", "firing", 95.0, 6.2, "2025-11-20T10:00:00", "cpu spike")
+
+#=====================================================
+#Detectors
+#=====================================================
+
+def test_ewma_flags_spike_after_warmup():
+    """A steady, slightly noisy signal trains the EWMA; a spike gives a large z-score."""
+    ewma = EwmaDetector(alpha=0.1, threshold=3.0, warmup=10, cooldown=0)
+    transitions = [ewma.update(20 + (i % 3), i)[1] for i in range(30)]
+    assert transitions == [None] * 30
+    z, transition = ewma.update(90, 30)
+    assert z > 10 and transition == "firing"
+    assert ewma.update(90, 31)[1] is None  # still active, no repeat
+
+def test_no_alert_during_warmup():
+    ewma = EwmaDetector(warmup=10)
+    ewma.update(10, 0)
+    ewma.update(11, 1)
+    assert ewma.update(95, 2)[1] is None
+
+def test_hysteresis_and_cooldown():
+    level = Hysteresis(3.0, 2.0, cooldown=60)
+    assert level.update(3.5, 0) == "firing"
+    assert level.update(2.5, 1) is None        # between clear and trigger: still active
+    assert level.update(1.0, 2) == "resolved"
+    assert level.update(4.0, 10) is None       # inside cooldown: suppressed...
+    assert level.update(1.0, 11) is None       # ...and resolves silently
+    assert level.update(4.0, 70) == "firing"
+
+def test_rate_detector_uses_elapsed_time():
+    rate = RateDetector(limit=10, cooldown=0)
+    assert rate.update(20, 0.0) == (0.0, None)
+    assert rate.update(40, 4.0) == (5.0, None)          # +20 over 4 s
+    value, transition = rate.update(70, 5.0)            # +30 in 1 s
+    assert value == 30.0 and transition == "firing"
+
+def test_anomaly_detector_per_metric():
+    """Only the metric that jumps raises alerts; both detectors see the jump."""
+    detector = AnomalyDetector(warmup=5, cooldown=0)
+    feed(detector, [{"cpu": 10 + (i % 2), "mem": 40 + (i % 2), "disk": 50, "health": 80} for i in range(1000)])
+    alerts = feed(detector, [{"cpu": 99, "mem": 40, "disk": 50, "health": 80}], start=1000)
+    assert {(a.metric, a.detector, a.state) for a in alerts} == {("cpu", "zscore", "firing"), ("cpu", "rate", "firing")}
+    assert ("cpu", "rate") in detector.active
+
+def test_parse_rate_limits():
+    assert parse_rate_limits(["cpu=40", "mem=2.5"]) == {"cpu": 40.0, "mem": 2.5}
+    for bad in ("gpu=1", "cpu=abc", "cpu=", "cpu=-5"):
+        with pytest.raises(ValueError, match="invalid rate limit"):
+            parse_rate_limits([bad])
+
+def test_bad_alert_options_are_usage_errors():
+    """A bad --alert-rate or --alert-hook is reported by argparse, before the monitor starts."""
+    for args in (["--alert-rate", "cpu=abc"], ["--alert-hook", "smtp:ops@example.com"]):
+        result = subprocess.run([sys.executable, "sysmon_cli.py", "--alerts", *args, "--max-iterations", "1"],
+                                cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, timeout=30)
+        assert result.returncode == 2 and "error:" in result.stderr and "Traceback" not in result.stderr
+
+#=====================================================
+#Hooks
+#=====================================================
+
+def test_file_hook_appends_json_lines(tmp_path):
+    path = tmp_path / "alerts.ndjson"
+    hook = parse_hook(f"file:{path}")
+    assert isinstance(hook, FileHook)
+    hook(sample_alert())
+    hook(sample_alert())
+    lines = path.read_text().splitlines()
+    assert len(lines) == 2 and json.loads(lines[0])["metric"] == "cpu"
+
+def test_exec_hook_gets_env_and_stdin(tmp_path):
+    out = tmp_path / "out.txt"
+    script = f"import os,sys; open({str(out)!r},'w').write(os.environ['SYSMON_ALERT_METRIC'] + '|' + sys.stdin.read())"
+    hook = parse_hook(f"exec:{sys.executable} -c \"{script}\"")
+    assert isinstance(hook, ExecHook)
+    hook(sample_alert())
+    metric, payload = out.read_text().split("|", 1)
+    assert metric == "cpu" and json.loads(payload)["score"] == 6.2
+
+def test_webhook_posts_to_local_stand_in():
+    received = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            received.append(json.loads(self.rfile.read(int(self.headers["Content-Length"]))))
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        dispatcher = AlertDispatcher([WebhookHook(f"http://127.0.0.1:{server.server_port}/alerts")])
+        dispatcher.dispatch([sample_alert()])
+        dispatcher.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert received and received[0]["message"] == "cpu spike"
+    assert dispatcher.errors == 0
+
+def test_dispatcher_counts_hook_errors():
+    def broken(alert):
+        raise RuntimeError("boom")
+
+    dispatcher = AlertDispatcher([broken])
+    dispatcher.dispatch([sample_alert(), sample_alert()])
+    dispatcher.close()
+    assert dispatcher.errors == 2
+
+def test_unknown_hook():
+    with pytest.raises(ValueError):
+        parse_hook("smtp:ops@example.com")
+
+def test_alerts_in_json_record():
+    stats = SystemStats(95, 40, 50, 1, 2, alerts=[sample_alert()])
+    assert json_record(stats, 60)["alerts"][0]["detector"] == "zscore"
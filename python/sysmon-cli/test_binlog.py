@@ -0,0 +1,103 @@
+import os
+import numpy as np
+import pytest
+from binlog import BinaryLogger, is_binary_log, open_binary_log, HEADER_SIZE, RECORD_SIZE, FIELDS
+from sysmon_cli import SystemStats, binary_record, create_logger
+
+RECORDS = [
+    (1700000000.0, 10.5, 20.0, 30.0, 80.0, 100, 200),
+    (1700000001.0, 90.0, 25.0, 30.0, 55.0, 150, 260),
+]
+
+def write_log(path, records, **kwargs):
+    logger = BinaryLogger(str(path), **kwargs)
+    for record in records:
+        logger.write(record)
+    logger.close()
+
+#=====================================================
+#Writer Tests
+#=====================================================
+
+def test_file_layout_is_fixed_width(tmp_path):
+    """File size should be header + N fixed-width records."""
+    path = tmp_path / "log.bin"
+    write_log(path, RECORDS)
+    assert os.path.getsize(path) == HEADER_SIZE + 2 * RECORD_SIZE
+    assert RECORD_SIZE == 40
+
+def test_append_keeps_single_header(tmp_path):
+    """Reopening a log appends records without a second header."""
+    path = tmp_path / "log.bin"
+    write_log(path, RECORDS[:1])
+    write_log(path, RECORDS[1:])
+    assert len(open_binary_log(str(path))) == 2
+
+def test_torn_record_is_dropped_on_append(tmp_path):
+    """A partially written trailing record should be trimmed before appending."""
+    path = tmp_path / "log.bin"
+    write_log(path, RECORDS[:1])
+    with open(path, "ab") as f:
+        f.write(b"\x01\x02\x03")
+    write_log(path, RECORDS[1:])
+    log = open_binary_log(str(path))
+    assert len(log) == 2
+    assert log["cpu"][1] == pytest.approx(90.0)
+
+def test_rejects_foreign_file(tmp_path):
+    path = tmp_path / "log.bin"
+    path.write_bytes(b"timestamp,cpu,mem\n" * 10)
+    with pytest.raises(ValueError):
+        BinaryLogger(str(path))
+    with pytest.raises(ValueError):
+        open_binary_log(str(path))
+    assert not is_binary_log(str(path))
+    write_log(tmp_path / "real.bin", RECORDS)
+    assert is_binary_log(str(tmp_path / "real.bin"))
+
+def test_records_are_batched(tmp_path):
+    """Records should stay in memory until flush_rows is reached."""
+    path = tmp_path / "log.bin"
+    logger = BinaryLogger(str(path), flush_rows=2, flush_interval=3600)
+    logger.write(RECORDS[0])
+    assert os.path.getsize(path) == HEADER_SIZE
+    logger.write(RECORDS[1])
+    assert os.path.getsize(path) == HEADER_SIZE + 2 * RECORD_SIZE
+    logger.close()
+
+#=====================================================
+#Reader Tests
+#=====================================================
+
+def test_reader_columns_are_zero_copy_views(tmp_path):
+    """Columns should be views into the memory map, not copies."""
+    path = tmp_path / "log.bin"
+    write_log(path, RECORDS)
+    log = open_binary_log(str(path))
+    cpu = log["cpu"]
+    assert isinstance(log.records, np.memmap)
+    assert not cpu.flags.owndata
+    assert np.shares_memory(cpu, log.records)
+    assert list(log.columns) == list(FIELDS)
+    assert log["net_recv"].tolist() == [200, 260]
+    assert log["timestamp"][0] == 1700000000.0
+
+def test_reader_handles_empty_log(tmp_path):
+    path = tmp_path / "log.bin"
+    write_log(path, [])
+    assert len(open_binary_log(str(path))) == 0
+
+#=====================================================
+#sysmon_cli Integration
+#=====================================================
+
+def test_create_logger_binary(tmp_path):
+    """--log-format binary should produce records readable by the mmap reader."""
+    path = tmp_path / "log.bin"
+    logger, make_row = create_logger(str(path), "binary", {"flush_rows": 1, "max_bytes": 10})
+    logger.write(make_row(SystemStats(12, 34, 56, 7, 8), 70))
+    logger.close()
+    log = open_binary_log(str(path))
+    assert log["mem"][0] == pytest.approx(34)
+    assert log["health"][0] == pytest.approx(70)
+    assert make_row is binary_record
@@ -0,0 +1,145 @@
+import io
+import time
+import pytest
+from rich.console import Console
+import sysmon_cli
+from sysmon_cli import SystemStats, json_record
+from cgroups import CgroupMonitor, busiest, find_cgroup2_root, read_cpu_limit
+from csvlog import CGROUP_LOG_HEADER
+from health import HealthModel
+
+def make_cgroup(path, usage=0, periods=0, throttled=0, memory=0, memory_max="max", rbytes=0, wbytes=0, ios=0, cpu_max="max 100000"):
+    """Write the interface files of one cgroup directory."""
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "cpu.stat").write_text(f"usage_usec {usage}\nuser_usec {usage}\nsystem_usec 0\n"
+                                   f"nr_periods {periods}\nnr_throttled {throttled}\nthrottled_usec 0\n")
+    (path / "memory.current").write_text(f"{memory}\n")
+    (path / "memory.max").write_text(f"{memory_max}\n")
+    (path / "io.stat").write_text(f"8:0 rbytes={rbytes} wbytes={wbytes} rios={ios} wios={ios} dbytes=0 dios=0\n")
+    (path / "cpu.max").write_text(f"{cpu_max}\n")
+
+@pytest.fixture
+def root(tmp_path):
+    (tmp_path / "cgroup.controllers").write_text("cpu io memory\n")
+    (tmp_path / "cgroup.stat").write_text("nr_descendants 2\nnr_dying_descendants 0\n")
+    make_cgroup(tmp_path / "system.slice")
+    make_cgroup(tmp_path / "system.slice" / "app.service", cpu_max="200000 100000", memory_max=1000)
+    return tmp_path
+
+#=====================================================
+#Tree
+#=====================================================
+
+def test_scan_walks_the_tree_once(root, clock):
+    """Every cgroup below the root is tracked by its relative path; depth limits the walk."""
+    monitor = CgroupMonitor(str(root), clock=clock)
+    assert list(monitor.cgroups) == ["system.slice", "system.slice/app.service"]
+    assert monitor.cgroups["system.slice/app.service"].cpu_limit == 2.0
+    monitor.collect()
+    assert monitor.scans == 1
+    monitor.close()
+    shallow = CgroupMonitor(str(root), max_depth=1, clock=clock)
+    assert list(shallow.cgroups) == ["system.slice"]
+    shallow.close()
+
+def test_new_and_removed_cgroups_trigger_a_rescan(root, clock):
+    """A new cgroup is picked up on the next collect; a vanished one is dropped without an error."""
+    monitor = CgroupMonitor(str(root), clock=clock)
+    make_cgroup(root / "user.slice")
+    (root / "cgroup.stat").write_text("nr_descendants 3\nnr_dying_descendants 0\n")
+    assert {c.path for c in monitor.collect()} == {"system.slice", "system.slice/app.service", "user.slice"}
+    assert monitor.scans == 2
+    for name in ("cpu.stat", "memory.current", "memory.max", "io.stat", "cpu.max"):
+        (root / "user.slice" / name).unlink()
+    assert {c.path for c in monitor.collect()} == {"system.slice", "system.slice/app.service"}
+    monitor.close()
+
+def test_missing_hierarchy_raises(tmp_path):
+    """A directory without cgroup.controllers is not a cgroup2 root."""
+    with pytest.raises(OSError):
+        CgroupMonitor(str(tmp_path))
+
+def test_find_root_and_cpu_limit(tmp_path):
+    """The cgroup2 mount comes from mountinfo; cpu.max gives the limit in CPUs."""
+    mountinfo = tmp_path / "mountinfo"
+    mountinfo.write_text("25 30 0:22 / /sys/fs/cgroup/unified rw,nosuid - cgroup2 cgroup2 rw\n")
+    assert find_cgroup2_root(str(mountinfo)) == "/sys/fs/cgroup/unified"
+    (tmp_path / "cpu.max").write_text("50000 100000\n")
+    assert read_cpu_limit(str(tmp_path)) == 0.5
+
+#=====================================================
+#Rates and Health
+#=====================================================
+
+def test_rates_throttling_and_health(root, clock):
+    """Counter deltas over the elapsed time give cores, % of the CPU limit, IO rates and throttled periods."""
+    monitor = CgroupMonitor(str(root), model=HealthModel(), clock=clock)
+    monitor.collect()
+    clock.now += 2.0
+    make_cgroup(root / "system.slice" / "app.service", usage=3_000_000, periods=20, throttled=5, memory=500,
+                memory_max=1000, rbytes=4096, wbytes=8192, ios=10, cpu_max="200000 100000")
+    usage = {c.path: c for c in monitor.collect()}["system.slice/app.service"]
+    assert usage.cpu_cores == 1.5 and usage.cpu_percent == 75.0
+    assert usage.mem_percent == 50.0 and usage.mem_limit == 1000
+    assert (usage.read_bps, usage.write_bps, usage.iops) == (2048.0, 4096.0, 10.0)
+    assert usage.throttled_percent == 25.0
+    assert usage.health == round(HealthModel().score({"cpu": 75.0, "mem": 50.0, "disk": 25.0}), 1)
+    monitor.close()
+
+def test_hundreds_of_cgroups_stay_cheap(root, clock):
+    """300 cgroups are read in well under a 1 Hz tick."""
+    make_cgroup(root / "machine.slice")
+    for i in range(300):
+        make_cgroup(root / "machine.slice" / f"ctr-{i}.scope", usage=i * 1000)
+    monitor = CgroupMonitor(str(root), clock=time.monotonic)
+    started = time.perf_counter()
+    results = monitor.collect()
+    assert len(results) == 303
+    assert time.perf_counter() - started < 0.5
+    monitor.close()
+
+#=====================================================
+#Output
+#=====================================================
+
+def test_cgroups_reach_table_json_and_log_rows(root, clock):
+    """The busiest cgroups are shown; JSON and the cgroup log get every cgroup."""
+    monitor = CgroupMonitor(str(root), clock=clock)
+    stats = sysmon_cli.SystemStats(cpu=10.0, mem=20.0, disk=30.0, net_sent=0, net_recv=0)
+    stats.cgroups = monitor.collect()
+    stats.cgroups[1].cpu_percent = 90.0
+    assert busiest(stats.cgroups, 1)[0].path == "system.slice/app.service"
+    console = Console(file=io.StringIO(), width=200)
+    console.print(sysmon_cli.cgroup_table(stats.cgroups, 1))
+    assert "top 1 of 2" in console.file.getvalue() and "app.service" in console.file.getvalue()
+    record = sysmon_cli.json_record(stats, 90.0)
+    assert [c["path"] for c in record["cgroups"]] == ["system.slice", "system.slice/app.service"]
+    assert [row[1] for row in sysmon_cli.cgroup_rows(stats)] == ["system.slice", "system.slice/app.service"]
+    assert sysmon_cli.cgroup_logfile("logs/sysmon.csv") == "logs/sysmon_cgroups.csv"
+    monitor.close()
+
+def test_cgroup_pressure_and_psi_health(root, clock):
+    """With PSI the cgroup pressure files give stall % per resource, and psi_health scores them instead of usage."""
+    app = root / "system.slice" / "app.service"
+    for resource in ("cpu", "memory", "io"):
+        (app / f"{resource}.pressure").write_text("some avg10=0.00 avg60=0.00 avg300=0.00 total=0\n"
+                                                   "full avg10=0.00 avg60=0.00 avg300=0.00 total=0\n")
+    monitor = CgroupMonitor(str(root), clock=clock, psi_health=True)
+    monitor.collect()
+    clock.now += 1.0
+    make_cgroup(app, usage=1_900_000, cpu_max="200000 100000", memory_max=1000, memory=400)
+    (app / "memory.pressure").write_text("some avg10=9.00 avg60=2.00 avg300=0.50 total=250000\n"
+                                         "full avg10=4.00 avg60=1.00 avg300=0.20 total=100000\n")
+    usage = {c.path: c for c in monitor.collect()}["system.slice/app.service"]
+    assert usage.cpu_percent == 95.0
+    assert (usage.cpu_pressure, usage.mem_pressure, usage.io_pressure) == (0.0, 25.0, 0.0)
+    assert usage.health == round(HealthModel().score({"cpu": 0.0, "mem": 100.0, "disk": 0.0}), 1)
+    assert {c.path: c for c in monitor.collect()}["system.slice"].mem_pressure == 0.0
+    memory = usage.pressure["memory"]
+    assert (memory.some_avg10, memory.some_avg60, memory.full_avg10, memory.full_avg60) == (9.0, 2.0, 4.0, 1.0)
+
+    stats = SystemStats(1, 2, 3, 4, 5, cgroups=[usage])
+    assert json_record(stats, 90)["cgroups"][0]["pressure"]["memory"]["some_avg60"] == 2.0
+    row = dict(zip(CGROUP_LOG_HEADER, sysmon_cli.cgroup_rows(stats)[0]))
+    assert (row["mem_some_avg10"], row["mem_full_avg60"], row["cpu_some_avg10"]) == (9.0, 1.0, 0.0)
+    monitor.close()
@@ -0,0 +1,89 @@
+import io
+import pytest
+from rich.console import Console
+from cores import CoreSampler, core_view, parse_cpulist, numa_nodes
+
+def stat_text(cores):
+    """Build /proc/stat with the aggregate line first; each core is (user, nice, system, idle, iowait, irq, softirq, steal)."""
+    total = [sum(values) for values in zip(*cores)]
+    lines = ["cpu  " + " ".join(map(str, total)) + " 0 0"]
+    lines += [f"cpu{i} " + " ".join(map(str, values)) + " 0 0" for i, values in enumerate(cores)]
+    return "\n".join(lines) + "\nintr 1 2 3\nctxt 99\n"
+
+@pytest.fixture
+def roots(tmp_path):
+    proc, sys = tmp_path / "proc", tmp_path / "sys"
+    proc.mkdir()
+    for node, cpus in ((0, "0-1"), (1, "2-3")):
+        path = sys / "devices" / "system" / "node" / f"node{node}"
+        path.mkdir(parents=True)
+        (path / "cpulist").write_text(cpus + "\n")
+    (proc / "stat").write_text(stat_text([(0, 0, 0, 100, 0, 0, 0, 0)] * 4))
+    return proc, sys
+
+def advance(proc, deltas):
+    """Rewrite /proc/stat with every core advanced by its delta tuple from the initial counters."""
+    (proc / "stat").write_text(stat_text([tuple(d + b for d, b in zip(delta, (0, 0, 0, 100, 0, 0, 0, 0))) for delta in deltas]))
+
+#=====================================================
+#Sampling
+#=====================================================
+
+def test_one_pass_gives_total_cores_and_breakdown(roots):
+    """Overall and per-core usage come from the same delta; the split adds up to busy + iowait."""
+    proc, sys = roots
+    sampler = CoreSampler(str(proc), str(sys), top_k=2)
+    advance(proc, [(60, 0, 20, 20, 0, 0, 0, 0), (0, 0, 0, 100, 0, 0, 0, 0),
+                   (10, 0, 0, 40, 50, 0, 0, 0), (0, 0, 0, 50, 0, 0, 0, 50)])
+    sample = sampler.read()
+    assert sample.per_core() == [80.0, 0.0, 10.0, 50.0]
+    assert sample.total == pytest.approx((80 + 0 + 10 + 50) / 4, abs=0.1)
+    assert sample.breakdown[0].tolist() == pytest.approx([60, 20, 0, 0])
+    assert sample.breakdown[2].tolist() == pytest.approx([10, 0, 50, 0])
+    assert sample.breakdown[3].tolist() == pytest.approx([0, 0, 0, 50])
+    assert [entry["cpu"] for entry in sample.top()] == [0, 3]
+    sampler.close()
+
+def test_numa_aggregates(roots):
+    """Cores are grouped per node with mean / max busy."""
+    proc, sys = roots
+    sampler = CoreSampler(str(proc), str(sys))
+    advance(proc, [(100, 0, 0, 0, 0, 0, 0, 0), (0, 0, 0, 100, 0, 0, 0, 0),
+                   (50, 0, 0, 50, 0, 0, 0, 0), (50, 0, 0, 50, 0, 0, 0, 0)])
+    numa = sampler.read().numa()
+    assert [(n["node"], n["cores"], n["mean"], n["max"]) for n in numa] == [(0, 2, 50.0, 100.0), (1, 2, 50.0, 50.0)]
+    sampler.close()
+
+def test_cpu_hotplug_resets_counters(roots):
+    """When the set of CPUs changes the arrays are reallocated and that read reports 0 %."""
+    proc, sys = roots
+    sampler = CoreSampler(str(proc), str(sys))
+    (proc / "stat").write_text(stat_text([(500, 0, 0, 500, 0, 0, 0, 0)] * 2))
+    sample = sampler.read()
+    assert sample.per_core() == [0.0, 0.0] and sample.ids.tolist() == [0, 1]
+    sampler.close()
+
+def test_parse_cpulist_and_nodes(roots):
+    """Kernel CPU lists expand ranges; CPUs outside any node map to -1."""
+    assert parse_cpulist("0-2,8,10-11\n") == [0, 1, 2, 8, 10, 11]
+    assert numa_nodes([0, 3, 7], str(roots[1])).tolist() == [0, 1, -1]
+    assert numa_nodes([0], str(roots[0])) is None
+
+#=====================================================
+#Rendering
+#=====================================================
+
+def test_view_stays_compact_on_many_cores(tmp_path):
+    """256 cores render as a few grid lines plus a top-K table, not 256 rows."""
+    proc = tmp_path / "proc"
+    proc.mkdir()
+    (proc / "stat").write_text(stat_text([(0, 0, 0, 100, 0, 0, 0, 0)] * 256))
+    sampler = CoreSampler(str(proc), str(tmp_path / "nosys"), top_k=5)
+    (proc / "stat").write_text(stat_text([(i % 100, 0, 0, 200 - i % 100, 0, 0, 0, 0) for i in range(256)]))
+    console = Console(file=io.StringIO(), width=140)
+    for renderable in core_view(sampler.read(), console.width):
+        console.print(renderable)
+    output = console.file.getvalue()
+    assert len(output.splitlines()) < 25
+    assert "Hottest Cores (top 5)" in output
+    sampler.close()
@@ -0,0 +1,111 @@
+import csv
+import gzip
+import os
+import time
+import pytest
+from csvlog import CsvLogger, LOG_HEADER, gzip_file
+from sysmon_cli import SystemStats, log_stats, log_row
+
+def read_rows(path):
+    with open(path, newline="") as f:
+        return list(csv.reader(f))
+
+#=====================================================
+#Buffering / Flushing
+#=====================================================
+
+def test_rows_are_batched_until_flush_rows(tmp_path):
+    """Rows should stay in memory until the row threshold is reached."""
+    path = tmp_path / "log.csv"
+    logger = CsvLogger(str(path), flush_rows=3, flush_interval=3600)
+    logger.write([1, 2, 3, 4, 5, 6, 7])
+    logger.write([1, 2, 3, 4, 5, 6, 7])
+    assert read_rows(path) == [LOG_HEADER]
+    logger.write([1, 2, 3, 4, 5, 6, 7])
+    assert len(read_rows(path)) == 4
+    logger.close()
+
+def test_time_based_flush(tmp_path):
+    """A zero flush interval should flush on every write."""
+    path = tmp_path / "log.csv"
+    logger = CsvLogger(str(path), flush_rows=1000, flush_interval=0)
+    logger.write(["a"] * 7)
+    assert len(read_rows(path)) == 2
+    logger.close()
+
+def test_close_flushes_pending_rows(tmp_path):
+    path = tmp_path / "log.csv"
+    logger = CsvLogger(str(path), flush_rows=1000, flush_interval=3600)
+    logger.write(["a"] * 7)
+    logger.close()
+    assert len(read_rows(path)) == 2
+
+def test_header_written_once_when_appending(tmp_path):
+    """Reopening an existing log should not repeat the header."""
+    path = tmp_path / "log.csv"
+    for _ in range(2):
+        logger = CsvLogger(str(path))
+        logger.write(["a"] * 7)
+        logger.close()
+    rows = read_rows(path)
+    assert rows.count(LOG_HEADER) == 1
+    assert len(rows) == 3
+
+def test_invalid_fsync_policy(tmp_path):
+    with pytest.raises(ValueError):
+        CsvLogger(str(tmp_path / "log.csv"), fsync="sometimes")
+
+#=====================================================
+#Rotation / Compression
+#=====================================================
+
+def test_size_rotation_compresses_segments(tmp_path):
+    """Each rotated segment gets its own header and is gzipped in the background."""
+    path = tmp_path / "log.csv"
+    logger = CsvLogger(str(path), flush_rows=1, max_bytes=100)
+    for i in range(20):
+        logger.write([i] * 7)
+    logger.close()
+
+    assert logger.rotated
+    for rotated in logger.rotated:
+        assert not os.path.exists(rotated)
+        with gzip.open(rotated + ".gz", "rt", newline="") as f:
+            rows = list(csv.reader(f))
+        assert rows[0] == LOG_HEADER
+        assert rows.count(LOG_HEADER) == 1
+    assert read_rows(path)[0] == LOG_HEADER
+
+def test_age_rotation_without_compression(tmp_path):
+    path = tmp_path / "log.csv"
+    logger = CsvLogger(str(path), flush_rows=1, max_age=0.01, compress=False)
+    time.sleep(0.02)
+    logger.write(["a"] * 7)
+    time.sleep(0.02)
+    logger.write(["b"] * 7)
+    logger.close()
+    assert len(logger.rotated) == 2
+    assert all(os.path.exists(p) for p in logger.rotated)
+
+def test_gzip_file_removes_original(tmp_path):
+    path = tmp_path / "seg.csv"
+    path.write_text("x,y\n")
+    gz = gzip_file(str(path))
+    assert not path.exists()
+    with gzip.open(gz, "rt") as f:
+        assert f.read() == "x,y\n"
+
+#=====================================================
+#log_stats / log_row
+#=====================================================
+
+def test_log_stats_writes_header_and_rows(tmp_path):
+    """log_stats() should create the header once and append every row."""
+    path = tmp_path / "log.csv"
+    stats = SystemStats(10, 20, 30, 1, 2)
+    log_stats(str(path), stats, 80)
+    log_stats(str(path), stats, 80)
+    rows = read_rows(path)
+    assert rows[0] == LOG_HEADER
+    assert len(rows) == 3
+    assert len(log_row(stats, 80)) == len(LOG_HEADER)
@@ -0,0 +1,106 @@
+import pytest
+import sysmon_cli
+from diskio import DiskIOMonitor, is_partition, busiest_util, SECTOR_SIZE
+from netrates import WRAP_32
+from sysmon_cli import SystemStats, device_summary, diskio_rows, health_disk, json_record
+
+def line(major, minor, name, reads=0, read_sectors=0, read_ms=0, writes=0, write_sectors=0, write_ms=0, busy_ms=0, weighted_ms=0):
+    """One /proc/diskstats line with the discard / flush columns of recent kernels."""
+    return (f"{major:4} {minor:7} {name} {reads} 0 {read_sectors} {read_ms} {writes} 0 {write_sectors} {write_ms} "
+            f"0 {busy_ms} {weighted_ms} 0 0 0 0 0 0\n")
+
+def diskstats(sda=None, nvme=None):
+    return (line(7, 0, "loop0", reads=500)
+            + line(8, 0, "sda", **(sda or {}))
+            + line(8, 1, "sda1", reads=999)
+            + line(259, 0, "nvme0n1", **(nvme or {}))
+            + line(259, 1, "nvme0n1p1", reads=999))
+
+@pytest.fixture
+def roots(tmp_path):
+    proc, block = tmp_path / "proc", tmp_path / "block"
+    proc.mkdir()
+    for name in ("loop0", "sda", "nvme0n1"):
+        (block / name).mkdir(parents=True)
+    (proc / "diskstats").write_text(diskstats())
+    return proc, block
+
+#=====================================================
+#Rates
+#=====================================================
+
+def test_rates_await_and_utilization(roots, clock):
+    """Deltas over elapsed time give bytes/s, IOPS, await per request, % busy and queue depth."""
+    proc, block = roots
+    monitor = DiskIOMonitor(str(proc), str(block), clock=clock)
+    clock.now += 2.0
+    (proc / "diskstats").write_text(diskstats(sda=dict(reads=100, read_sectors=2048, read_ms=300, writes=300,
+                                                       write_sectors=4096, write_ms=500, busy_ms=1000, weighted_ms=3000)))
+    devices = {d.name: d for d in monitor.collect()}
+    assert set(devices) == {"sda", "nvme0n1"}
+    sda = devices["sda"]
+    assert sda.read_bps == 1024 * SECTOR_SIZE and sda.write_bps == 2048 * SECTOR_SIZE
+    assert (sda.read_iops, sda.write_iops) == (50.0, 150.0)
+    assert sda.await_ms == 2.0 and sda.util == 50.0 and sda.queue == 1.5
+    assert devices["nvme0n1"].util == 0.0 and devices["nvme0n1"].await_ms == 0.0
+    monitor.close()
+
+def test_wrap_reset_and_hot_added_disk(roots, clock):
+    """32-bit wraps are unwrapped, other backwards jumps flag a reset, new disks appear from the next tick."""
+    proc, block = roots
+    # nvme's 64-bit counter sits between 2**31 and 2**32 when it resets: a reset, not a wrap
+    (proc / "diskstats").write_text(diskstats(sda=dict(reads=WRAP_32 - 10), nvme=dict(reads=3_000_000_000)))
+    monitor = DiskIOMonitor(str(proc), str(block), clock=clock)
+    clock.now += 1.0
+    (block / "sdb").mkdir()
+    (proc / "diskstats").write_text(diskstats(sda=dict(reads=10), nvme=dict(reads=10)) + line(8, 16, "sdb"))
+    devices = {d.name: d for d in monitor.collect()}
+    assert devices["sda"].read_iops == 20.0 and not devices["sda"].reset
+    assert devices["nvme0n1"].reset and devices["nvme0n1"].read_iops == 0.0
+    assert "sdb" not in devices
+    clock.now += 1.0
+    assert "sdb" in {d.name for d in monitor.collect()}
+    monitor.close()
+
+def test_partition_names_without_sysfs(roots, clock):
+    """Without /sys/block the name decides: partitions and loop devices are dropped."""
+    proc, block = roots
+    monitor = DiskIOMonitor(str(proc), str(block / "missing"), clock=clock)
+    clock.now += 1.0
+    assert {d.name for d in monitor.collect()} == {"sda", "nvme0n1"}
+    assert is_partition("mmcblk0p1") and is_partition("vda2") and not is_partition("nvme1n1")
+    assert not is_partition("dm-0") and not is_partition("md127")
+    monitor.close()
+
+def test_dozens_of_devices_one_read(roots, clock):
+    """64 NVMe devices are all parsed from the single file read."""
+    proc, block = roots
+    names = [f"nvme{i}n1" for i in range(64)]
+    for name in names:
+        (block / name).mkdir(exist_ok=True)
+    (proc / "diskstats").write_text("".join(line(259, i, name) for i, name in enumerate(names)))
+    monitor = DiskIOMonitor(str(proc), str(block), clock=clock)
+    clock.now += 1.0
+    (proc / "diskstats").write_text("".join(line(259, i, name, writes=i, busy_ms=i * 10) for i, name in enumerate(names)))
+    devices = monitor.collect()
+    assert len(devices) == 64 and busiest_util(devices) == 63.0
+    monitor.close()
+
+#=====================================================
+#Output and Health
+#=====================================================
+
+def test_disks_reach_json_rows_table_and_health(roots, clock):
+    """Devices appear in JSON, the I/O log and the table; --disk-io-health scores the busiest device."""
+    proc, block = roots
+    monitor = DiskIOMonitor(str(proc), str(block), clock=clock)
+    clock.now += 1.0
+    (proc / "diskstats").write_text(diskstats(sda=dict(writes=10, write_ms=20, busy_ms=900)))
+    stats = SystemStats(10.0, 20.0, 30.0, 0, 0)
+    stats.disks = monitor.collect()
+    assert [d["name"] for d in json_record(stats, 90.0)["disks"]] == ["sda", "nvme0n1"]
+    assert [row[1] for row in diskio_rows(stats)] == ["sda", "nvme0n1"]
+    assert "util [red]90.0[/red]%" in device_summary(stats.disks[0])
+    assert health_disk(stats) == 30.0 and health_disk(stats, io_health=True) == 90.0
+    assert sysmon_cli.diskio_logfile("logs/sysmon.csv") == "logs/sysmon_diskio.csv"
+    monitor.close()
@@ -0,0 +1,124 @@
+import asyncio
+import http.client
+import os
+import socket
+import subprocess
+import sys
+import threading
+import pytest
+from exporter import MetricsServer, parse_address, render_metrics, build_response
+from mounts import MountUsage
+from sysmon_cli import SystemStats
+
+@pytest.fixture
+def server():
+    """A server on an event loop in a background thread, standing in for the monitor's scheduler loop."""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    s = MetricsServer("127.0.0.1", 0)
+    asyncio.run_coroutine_threadsafe(s.serve(), loop).result(timeout=5)
+    yield s
+
+    async def shutdown():
+        s.stop()
+        clients = asyncio.all_tasks() - {asyncio.current_task()}
+        await asyncio.gather(*clients, return_exceptions=True)
+
+    asyncio.run_coroutine_threadsafe(shutdown(), loop).result(timeout=5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=5)
+    loop.close()
+
+def get(port, path="/metrics", method="GET"):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    conn.request(method, path)
+    response = conn.getresponse()
+    body = response.read()
+    conn.close()
+    return response, body
+
+#=====================================================
+#Rendering
+#=====================================================
+
+def test_render_metrics_openmetrics_format():
+    """Gauges, counters with _total, trends and the mandatory # EOF terminator."""
+    stats = SystemStats(12.5, 40, 60, 2, 3)
+    text = render_metrics(stats, 70.0, SystemStats(10, 40, 60, 1, 1), 72.0).decode()
+    assert "# TYPE sysmon_cpu_percent gauge" in text
+    assert "sysmon_cpu_percent 12.5" in text
+    assert "sysmon_network_sent_bytes_total 2048" in text
+    assert 'sysmon_trend{metric="cpu"} 2.5' in text
+    assert 'sysmon_trend{metric="health"} -2.0' in text
+    assert text.endswith("# EOF\n")
+
+def test_render_metrics_escapes_labels():
+    stats = SystemStats(1, 2, 3, 4, 5, mounts=[MountUsage('/mnt/a "b"', "nfs4", "x", 50.0, stale=True)])
+    text = render_metrics(stats, 90).decode()
+    assert 'mountpoint="/mnt/a \\"b\\""' in text
+    assert 'sysmon_mount_stale{mountpoint="/mnt/a \\"b\\""} 1' in text
+
+def test_parse_address():
+    assert parse_address(":9100") == (None, 9100)
+    assert parse_address("127.0.0.1:9200") == ("127.0.0.1", 9200)
+    for bad in ("foo", ":abc", ":0", ":70000"):
+        with pytest.raises(ValueError, match="invalid --serve address"):
+            parse_address(bad)
+
+def test_bad_serve_address_is_a_usage_error():
+    """A bad --serve address is reported by argparse, before the monitor starts."""
+    result = subprocess.run([sys.executable, "sysmon_cli.py", "--serve", "foo", "--max-iterations", "1"],
+                            cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, timeout=30)
+    assert result.returncode == 2 and "invalid --serve address" in result.stderr and "Traceback" not in result.stderr
+
+#=====================================================
+#Server
+#=====================================================
+
+def test_serves_cached_body(server):
+    """Scrapes return exactly the last published body."""
+    server.publish(b"sysmon_cpu_percent 1\n# EOF\n")
+    response, body = get(server.port)
+    assert response.status == 200
+    assert response.getheader("Content-Type").startswith("application/openmetrics-text")
+    assert body == b"sysmon_cpu_percent 1\n# EOF\n"
+    server.publish(b"sysmon_cpu_percent 2\n# EOF\n")
+    assert get(server.port)[1] == b"sysmon_cpu_percent 2\n# EOF\n"
+
+def test_unknown_path_and_head(server):
+    assert get(server.port, "/nope")[0].status == 404
+    response, body = get(server.port, method="HEAD")
+    assert response.status == 200 and body == b""
+
+def test_keep_alive_and_concurrent_scrapers(server):
+    """Many concurrent connections (with keep-alive) are served by the single event loop thread."""
+    server.publish(b"x 1\n# EOF\n")
+    before = threading.active_count()
+    results = []
+
+    def scrape():
+        conn = http.client.HTTPConnection("127.0.0.1", server.port, timeout=5)
+        for _ in range(5):
+            conn.request("GET", "/metrics")
+            results.append(conn.getresponse().read())
+        conn.close()
+
+    threads = [threading.Thread(target=scrape) for _ in range(20)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == [b"x 1\n# EOF\n"] * 100
+    assert server.scrapes >= 100
+    assert threading.active_count() == before
+
+def test_port_in_use_raises():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        sock.listen()
+        with pytest.raises(OSError):
+            asyncio.run(MetricsServer("127.0.0.1", sock.getsockname()[1]).serve())
+
+def test_build_response_content_length():
+    assert b"Content-Length: 3\r\n" in build_response(200, "OK", b"abc", "text/plain")
@@ -0,0 +1,98 @@
+import csv
+import gzip
+import numpy as np
+import pytest
+from binlog import BinaryLogger, open_binary_log
+from csvlog import LOG_HEADER
+from health import HealthModel, KneeCurve, ExpCurve, create_model, parse_curve, rescore_log
+from sysmon_cli import calculate_health
+
+def read_csv(path, opener=open):
+    with opener(path, "rt", newline="") as f:
+        return list(csv.DictReader(f))
+
+#=====================================================
+#Health Model
+#=====================================================
+
+def test_default_model_matches_calculate_health():
+    """The default profile must reproduce the classic 40/40/20 score exactly."""
+    model = HealthModel()
+    for cpu, mem, disk in [(0, 0, 0), (12.5, 47.1, 88.0), (100, 100, 100), (99.9, 3.3, 61.7)]:
+        values = {"cpu": cpu, "mem": mem, "disk": disk}
+        assert model.score(values) == calculate_health(cpu, mem, disk)
+        assert calculate_health(cpu, mem, disk, model) == calculate_health(cpu, mem, disk)
+
+def test_vectorized_matches_scalar():
+    """score_columns must agree with per-sample score for every curve."""
+    model = create_model("storage", ["cpu=2"], ["cpu=knee:70", "mem=quadratic", "disk=exp:4"])
+    rng = np.random.default_rng(2)
+    columns = {metric: rng.uniform(0, 100, 500) for metric in ("cpu", "mem", "disk")}
+    expected = [model.score({m: float(columns[m][i]) for m in columns}) for i in range(500)]
+    assert model.score_columns(columns) == pytest.approx(expected)
+
+def test_weights_are_normalized():
+    """Weights are relative: 2/2/1 behaves like 0.4/0.4/0.2."""
+    assert HealthModel({"cpu": 2, "mem": 2, "disk": 1}).score({"cpu": 50, "mem": 50, "disk": 50}) == pytest.approx(50)
+
+def test_curves():
+    """Knee and exp curves hit 0 and 100 at the ends and bend as configured."""
+    knee = KneeCurve(80, 3)
+    assert knee(50) == 50 and knee(90) == 110
+    curve = ExpCurve()
+    assert curve(0) == pytest.approx(0) and curve(100) == pytest.approx(100) and curve(50) < 50
+
+def test_invalid_specs():
+    """Unknown profiles, metrics and curves are rejected."""
+    with pytest.raises(ValueError):
+        create_model("nope")
+    with pytest.raises(ValueError):
+        create_model(weights=["gpu=1"])
+    with pytest.raises(ValueError):
+        parse_curve("cubic")
+    with pytest.raises(ValueError):
+        HealthModel({"cpu": 0, "mem": 0, "disk": 0})
+
+#=====================================================
+#Rescoring Logs
+#=====================================================
+
+def test_rescore_csv_in_place(tmp_path, make_rows, write_csv):
+    """Every health cell is recomputed; other columns and damaged rows are untouched."""
+    path = str(tmp_path / "log.csv")
+    rows = make_rows(250, health=0.0)
+    write_csv(path, rows)
+    with open(path, "a") as f:
+        f.write("garbage,row\n")
+        f.write(",".join(LOG_HEADER) + "\n")
+    model = create_model("compute")
+    assert rescore_log(path, model, chunk_rows=64) == 250
+    result = read_csv(path)
+    assert len(result) == 252
+    for row, original in zip(result, rows):
+        expected = model.score({"cpu": original[1], "mem": original[2], "disk": original[3]})
+        assert float(row["health"]) == pytest.approx(expected, abs=0.005)
+        assert row["timestamp"] == str(original[0]) and row["net_recv"] == str(original[6])
+    assert result[250]["cpu"] == "row"
+
+def test_rescore_gzip_to_output(tmp_path, make_rows, write_csv):
+    """A .gz log can be rescored into a new file, leaving the original as it was."""
+    source, output = str(tmp_path / "log.csv.gz"), str(tmp_path / "new.csv.gz")
+    write_csv(source, make_rows(20, health=0.0), gzip.open)
+    rescore_log(source, create_model(curves=["cpu=quadratic"]), output)
+    assert all(row["health"] == "0.0" for row in read_csv(source, gzip.open))
+    assert all(float(row["health"]) > 0 for row in read_csv(output, gzip.open))
+
+def test_rescore_binary_in_place(tmp_path, make_rows):
+    """Binary logs are rescored through a writable memory map."""
+    path = str(tmp_path / "log.bin")
+    logger = BinaryLogger(path)
+    for i, row in enumerate(make_rows(300, health=0.0)):
+        logger.write((1_700_000_000 + i, row[1], row[2], row[3], 0.0, i, i))
+    logger.close()
+    model = create_model("memory")
+    assert rescore_log(path, model, chunk_rows=100) == 300
+    log = open_binary_log(path)
+    expected = model.score_columns({m: log[m] for m in ("cpu", "mem", "disk")})
+    assert np.allclose(log["health"], expected, atol=1e-4)
+    assert log["net_sent"][-1] == 299
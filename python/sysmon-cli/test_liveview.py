@@ -0,0 +1,87 @@
+import io
+from rich.console import Console
+from rich.table import Table
+from liveview import LiveView, CLEAR_SCREEN
+
+def terminal(width=60, height=30):
+    return Console(file=io.StringIO(), force_terminal=True, width=width, height=height, color_system="standard")
+
+def table(rows):
+    t = Table(title="Stats")
+    t.add_column("Resource")
+    t.add_column("Usage")
+    for name, value in rows:
+        t.add_row(name, value)
+    return t
+
+#=====================================================
+#Incremental rendering
+#=====================================================
+
+def test_first_frame_full_then_only_changed_lines():
+    """After the first full frame only the changed line is rewritten - no screen clear."""
+    console = terminal()
+    view = LiveView(console, max_fps=0)
+    view.update(table([("CPU", "10.0"), ("Memory", "20.0"), ("Disk", "30.0")]))
+    first = console.file.getvalue()
+    assert CLEAR_SCREEN in first
+
+    console.file.seek(0)
+    console.file.truncate()
+    view.update(table([("CPU", "55.5"), ("Memory", "20.0"), ("Disk", "30.0")]))
+    second = console.file.getvalue()
+    assert CLEAR_SCREEN not in second
+    assert "55.5" in second and "Memory" not in second and "Disk" not in second
+    assert second.count("\x1b[K") == 1
+    assert len(second) < len(first) / 3
+
+def test_identical_frame_writes_nothing():
+    console = terminal()
+    view = LiveView(console, max_fps=0)
+    view.update(table([("CPU", "1")]))
+    written = view.bytes_written
+    view.update(table([("CPU", "1")]))
+    assert view.bytes_written == written and view.frames == 2
+
+def test_shorter_frame_clears_below_and_resize_redraws():
+    console = terminal()
+    view = LiveView(console, max_fps=0)
+    view.update(table([("CPU", "1"), ("Memory", "2")]))
+    console.file.seek(0)
+    console.file.truncate()
+    view.update(table([("CPU", "1")]))
+    assert "\x1b[J" in console.file.getvalue()
+
+    console.size = (100, 30)
+    console.file.seek(0)
+    console.file.truncate()
+    view.update(table([("CPU", "1")]))
+    assert CLEAR_SCREEN in console.file.getvalue()
+
+def test_frame_cropped_to_terminal_height():
+    console = terminal(height=6)
+    view = LiveView(console, max_fps=0)
+    view.update(table([(f"row{i}", str(i)) for i in range(20)]))
+    assert len(view._lines) == 5
+
+#=====================================================
+#Rate cap / fallback
+#=====================================================
+
+def test_frame_rate_cap():
+    now = [0.0]
+    view = LiveView(terminal(), max_fps=4, clock=lambda: now[0])
+    assert view.due()
+    view.update(table([("CPU", "1")]))
+    now[0] = 0.1
+    assert not view.due()
+    now[0] = 0.25
+    assert view.due()
+
+def test_plain_output_when_not_a_terminal():
+    console = Console(file=io.StringIO(), force_terminal=False, width=60)
+    view = LiveView(console)
+    view.update(table([("CPU", "1")]))
+    view.close()
+    out = console.file.getvalue()
+    assert "CPU" in out and "\x1b[" not in out
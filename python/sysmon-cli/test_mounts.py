@@ -0,0 +1,142 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+import pytest
+from unittest.mock import patch
+from mounts import MountMonitor, MountUsage, parse_mountinfo, unescape, worst_mount
+from sysmon_cli import SystemStats, apply_mounts, mount_rows, mount_logfile, output_json
+
+MOUNTINFO = """22 1 8:1 / / rw,relatime shared:1 - ext4 /dev/sda1 rw
+23 22 0:5 / /proc rw,nosuid shared:2 - proc proc rw
+24 22 8:2 / /home rw,relatime shared:3 - xfs /dev/sda2 rw
+25 22 0:40 / /mnt/nas rw,relatime shared:4 - nfs4 nas:/export rw
+26 22 0:41 / /mnt/my\\040disk rw - fuse.sshfs user@host:/ rw
+27 22 7:0 / /snap/core/1 ro - squashfs /dev/loop0 ro
+28 22 0:30 / /run rw - tmpfs tmpfs rw
+"""
+
+@pytest.fixture
+def monitor(tmp_path):
+    info = tmp_path / "mountinfo"
+    info.write_text(MOUNTINFO)
+    fs = tmp_path / "filesystems"
+    fs.write_text("nodev\tproc\nnodev\ttmpfs\n\text4\n\txfs\n\tsquashfs\n")
+    m = MountMonitor(timeout=0.2, mountinfo=str(info), filesystems=str(fs))
+    yield m
+    m.close()
+
+class FakeStatvfs:
+    f_frsize = 4096
+    def __init__(self, blocks, free):
+        self.f_blocks, self.f_bfree, self.f_bavail = blocks, free, free
+
+#=====================================================
+#Mount List
+#=====================================================
+
+def test_parse_mountinfo_keeps_real_and_network_filesystems(monitor):
+    """Pseudo filesystems and squashfs images are skipped; NFS / FUSE are kept."""
+    assert [m.mountpoint for m in monitor.mounts] == ["/", "/home", "/mnt/nas", "/mnt/my disk"]
+
+def test_unescape_octal():
+    assert unescape(r"/mnt/a\040b") == "/mnt/a b"
+
+def test_refresh_picks_up_new_mounts(monitor, tmp_path):
+    (tmp_path / "mountinfo").write_text(MOUNTINFO.splitlines()[0] + "\n")
+    monitor.refresh()
+    assert [m.mountpoint for m in monitor.mounts] == ["/"]
+
+#=====================================================
+#Collection / Timeouts
+#=====================================================
+
+def test_collect_reports_usage(monitor):
+    with patch("mounts.os.statvfs", return_value=FakeStatvfs(100, 25)):
+        usage = monitor.collect()
+    assert all(u.percent == 75.0 and not u.stale for u in usage)
+
+def test_hung_mount_is_marked_stale_without_blocking(monitor):
+    """A statvfs that never returns should only mark that mount stale."""
+    release = threading.Event()
+
+    def fake_statvfs(path):
+        if path == "/mnt/nas":
+            release.wait(5)
+        return FakeStatvfs(100, 50)
+
+    with patch("mounts.os.statvfs", side_effect=fake_statvfs):
+        first = {u.mountpoint: u for u in monitor.collect()}
+        second = {u.mountpoint: u for u in monitor.collect()}
+        assert len([f for f in monitor._pending.values() if not f.done()]) == 1  # no second call queued
+        release.set()
+
+    assert first["/mnt/nas"].stale and second["/mnt/nas"].stale
+    assert not first["/"].stale
+    assert first["/"].percent == 50.0
+
+def test_hung_mounts_do_not_starve_the_others(tmp_path):
+    """More hung mounts than the old pool had workers: the healthy mount stays fresh and close() returns at once."""
+    info = tmp_path / "mountinfo"
+    info.write_text("".join(f"{30 + i} 22 0:{40 + i} / /mnt/nas{i} rw - nfs4 nas:/e{i} rw\n" for i in range(6)))
+    monitor = MountMonitor(timeout=0.05, mountinfo=str(info), filesystems=str(tmp_path / "missing"))
+    release = threading.Event()
+
+    def fake_statvfs(path):
+        if path != "/mnt/nas5":
+            release.wait(5)
+        return FakeStatvfs(100, 50)
+
+    with patch("mounts.os.statvfs", side_effect=fake_statvfs):
+        for _ in range(3):
+            usage = {u.mountpoint: u for u in monitor.collect()}
+            assert not usage["/mnt/nas5"].stale and usage["/mnt/nas0"].stale
+        started = time.monotonic()
+        monitor.close()
+        assert time.monotonic() - started < 0.1
+    release.set()
+
+def test_hung_mount_does_not_delay_exit(tmp_path):
+    """A statvfs that never returns is abandoned at exit instead of being joined."""
+    info = tmp_path / "mountinfo"
+    info.write_text("30 22 0:40 / /mnt/nas rw - nfs4 nas:/export rw\n")
+    code = ("import os, threading, mounts\n"
+            "os.statvfs = lambda path: threading.Event().wait()\n"
+            f"m = mounts.MountMonitor(timeout=0.05, mountinfo={str(info)!r})\n"
+            "assert m.collect()[0].stale\n"
+            "m.close()\n")
+    started = time.monotonic()
+    subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(os.path.abspath(__file__)), check=True, timeout=10)
+    assert time.monotonic() - started < 3
+
+def test_stale_mount_keeps_last_value(monitor):
+    with patch("mounts.os.statvfs", return_value=FakeStatvfs(100, 10)):
+        monitor.collect()
+    with patch("mounts.os.statvfs", side_effect=OSError("ESTALE")):
+        usage = monitor.collect()
+    assert all(u.stale and u.percent == 90.0 for u in usage)
+
+#=====================================================
+#sysmon_cli Integration
+#=====================================================
+
+def test_worst_mount_drives_health_disk(monitor, capsys):
+    """The fullest fresh mount should become stats.disk and show up in JSON and log rows."""
+    def fake_statvfs(path):
+        return FakeStatvfs(100, 5 if path == "/home" else 80)
+
+    stats = SystemStats(10, 20, 30, 1, 2)
+    with patch("mounts.os.statvfs", side_effect=fake_statvfs):
+        apply_mounts(stats, monitor.collect())
+    assert stats.disk == 95.0
+    assert len(mount_rows(stats)) == 4
+
+    output_json(stats, 50)
+    assert '"/home"' in capsys.readouterr().out
+    assert mount_logfile("logs/system_log.csv") == os.path.join("logs", "system_log_mounts.csv")
+
+def test_worst_mount_prefers_fresh_values():
+    mounts = [MountUsage("/a", "ext4", "d", 99, stale=True), MountUsage("/b", "ext4", "d", 40)]
+    assert worst_mount(mounts).mountpoint == "/b"
+    assert worst_mount([]) is None
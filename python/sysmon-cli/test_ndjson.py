@@ -0,0 +1,82 @@
+import io
+import json
+import os
+import subprocess
+import sys
+import pytest
+import ndjson
+from ndjson import NdjsonWriter, create_encoder
+from sysmon_cli import SystemStats, json_record
+
+class BrokenStream(io.BytesIO):
+    def write(self, data):
+        raise BrokenPipeError()
+
+#=====================================================
+#Encoding
+#=====================================================
+
+def test_compact_single_line_records():
+    """Every sample is one compact line that round-trips through json.loads."""
+    stream = io.BytesIO()
+    writer = NdjsonWriter(stream, flush_lines=1)
+    record = json_record(SystemStats(12.5, 40, 60, 2, 3), 71.0, SystemStats(10, 40, 60, 1, 1), 70.0)
+    writer.write(record)
+    writer.write(record)
+    lines = stream.getvalue().split(b"\n")
+    assert lines[-1] == b"" and len(lines) == 3
+    assert b" " not in lines[0].replace(b"T", b"")  # no indentation or separators padding
+    assert json.loads(lines[0])["trends"]["health"] == 1.0
+
+def test_json_backend_matches_orjson():
+    obj = {"cpu": 1.5, "name": "eth0 ✓", "values": [1, 2]}
+    name, encode = create_encoder("json")
+    assert name == "json"
+    assert json.loads(encode(obj)) == obj
+    if ndjson.orjson is not None:
+        assert create_encoder("auto")[0] == "orjson"
+        assert json.loads(create_encoder("auto")[1](obj)) == obj
+
+def test_missing_orjson(monkeypatch):
+    monkeypatch.setattr(ndjson, "orjson", None)
+    assert create_encoder("auto")[0] == "json"
+    with pytest.raises(ValueError):
+        create_encoder("orjson")
+
+def test_missing_orjson_is_a_usage_error():
+    """--json-backend orjson without orjson is reported by argparse, before the monitor starts."""
+    script = ("import runpy, sys; sys.modules['orjson'] = None; "
+              "sys.argv = ['sysmon_cli.py', '--ndjson', '--json-backend', 'orjson', '--max-iterations', '1']; "
+              "runpy.run_path('sysmon_cli.py', run_name='__main__')")
+    result = subprocess.run([sys.executable, "-c", script], cwd=os.path.dirname(os.path.abspath(__file__)),
+                            capture_output=True, text=True, timeout=30)
+    assert result.returncode == 2 and "orjson is not installed" in result.stderr and "Traceback" not in result.stderr
+
+#=====================================================
+#Batching / broken pipe
+#=====================================================
+
+def test_batched_by_lines_and_time():
+    """Lines stay buffered until the line count or the flush interval is reached."""
+    now = [0.0]
+    stream = io.BytesIO()
+    writer = NdjsonWriter(stream, flush_lines=3, flush_interval=5.0, clock=lambda: now[0])
+    writer.write({"a": 1})
+    writer.write({"a": 2})
+    assert stream.getvalue() == b""
+    writer.write({"a": 3})
+    assert stream.getvalue().count(b"\n") == 3
+    writer.write({"a": 4})
+    now[0] = 6.0
+    writer.write({"a": 5})
+    assert stream.getvalue().count(b"\n") == 5
+    writer.write({"a": 6})
+    writer.close()
+    assert stream.getvalue().count(b"\n") == 6
+
+def test_broken_pipe_stops_writer():
+    writer = NdjsonWriter(BrokenStream(), flush_lines=1)
+    assert writer.write({"a": 1}) is False
+    assert writer.broken
+    assert writer.write({"a": 2}) is False
+    writer.close()
@@ -0,0 +1,83 @@
+import pytest
+from netrates import NetRateMonitor, counter_delta, format_rate, WRAP_32
+from sysmon_cli import SystemStats, output_json, interface_summary
+
+HEADER = """Inter-|   Receive                                                |  Transmit
+ face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed
+"""
+
+def net_dev(eth0_rx, eth0_tx, errs=0, extra=""):
+    return (HEADER
+            + f"    lo: 5000 50 0 0 0 0 0 0 5000 50 0 0 0 0 0 0\n"
+            + f"  eth0: {eth0_rx} 100 {errs} 0 0 0 0 0 {eth0_tx} 50 0 1 0 0 0 0\n"
+            + extra)
+
+@pytest.fixture
+def proc(tmp_path):
+    (tmp_path / "net").mkdir()
+    (tmp_path / "net" / "dev").write_text(net_dev(1000, 2000))
+    return tmp_path
+
+#=====================================================
+#Counter Deltas
+#=====================================================
+
+def test_counter_delta_normal_wrap_and_reset():
+    """Forward moves are plain deltas, 32-bit wraps are unwrapped, other drops are resets."""
+    assert counter_delta(100, 150) == 50
+    assert counter_delta(WRAP_32 - 10, 5) == 15
+    assert counter_delta(1_000_000, 10) is None
+    assert counter_delta(WRAP_32 + 100, 10) is None
+    assert counter_delta(3_500_000_000, 1000) is None        # 64-bit counter reset below the 32-bit limit
+    assert counter_delta(2 ** 31 + 5, 7) is None
+
+def test_format_rate():
+    assert format_rate(512) == "512.0 B/s"
+    assert format_rate(2 * 1024 * 1024) == "2.0 MB/s"
+
+#=====================================================
+#Monitor
+#=====================================================
+
+def test_rates_use_monotonic_deltas(proc, clock):
+    """Rates are deltas divided by elapsed monotonic time; lo is ignored."""
+    monitor = NetRateMonitor(proc_root=str(proc), clock=clock)
+    (proc / "net" / "dev").write_text(net_dev(3000, 2500, errs=4))
+    clock.now += 2
+    rates = monitor.collect()
+    assert [r.name for r in rates] == ["eth0"]
+    eth0 = rates[0]
+    assert eth0.rx_bytes == 1000
+    assert eth0.tx_bytes == 250
+    assert eth0.rx_errors == 2
+    assert eth0.rx_packets == 0
+    monitor.close()
+
+def test_interface_reset_gives_no_spike(proc, clock):
+    monitor = NetRateMonitor(proc_root=str(proc), clock=clock)
+    (proc / "net" / "dev").write_text(net_dev(10, 2000))
+    clock.now += 1
+    eth0 = monitor.collect()[0]
+    assert eth0.reset
+    assert eth0.rx_bytes == 0
+    monitor.close()
+
+def test_new_interface_starts_on_next_tick(proc, clock):
+    monitor = NetRateMonitor(proc_root=str(proc), clock=clock)
+    wlan = "  wlan0: 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0\n"
+    (proc / "net" / "dev").write_text(net_dev(1000, 2000, extra=wlan))
+    clock.now += 1
+    assert [r.name for r in monitor.collect()] == ["eth0"]
+    clock.now += 1
+    assert [r.name for r in monitor.collect()] == ["eth0", "wlan0"]
+    monitor.close()
+
+def test_rates_in_json_and_table(proc, capsys, clock):
+    monitor = NetRateMonitor(proc_root=str(proc), clock=clock)
+    (proc / "net" / "dev").write_text(net_dev(2000, 2000, errs=1))
+    clock.now += 1
+    stats = SystemStats(1, 2, 3, 4, 5, interfaces=monitor.collect())
+    output_json(stats, 90)
+    assert '"rx_bytes_per_s": 1000.0' in capsys.readouterr().out
+    assert "err" in interface_summary(stats.interfaces[0])
+    monitor.close()
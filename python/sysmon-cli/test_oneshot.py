@@ -0,0 +1,100 @@
+import json
+import os
+import subprocess
+import sys
+import time
+import pytest
+import oneshot
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+def stat_text(busy, idle):
+    return f"cpu  {busy} 0 0 {idle} 0 0 0 0 0 0\ncpu0 {busy} 0 0 {idle} 0 0 0 0 0 0\nintr 1\n"
+
+@pytest.fixture
+def proc(tmp_path):
+    (tmp_path / "net").mkdir()
+    (tmp_path / "stat").write_text(stat_text(100, 900))
+    (tmp_path / "meminfo").write_text("MemTotal: 1000 kB\nMemFree: 100 kB\nMemAvailable: 250 kB\nBuffers: 0 kB\nCached: 0 kB\n")
+    (tmp_path / "net" / "dev").write_text("Inter-| Receive | Transmit\n face |bytes packets|bytes packets\n"
+                                         "  eth0: 4096 1 0 0 0 0 0 0 8192 1 0 0 0 0 0 0\n")
+    return tmp_path
+
+def run_cli(*args):
+    """Run the script as a cron job would, returning (stdout, stderr)."""
+    result = subprocess.run([sys.executable, "sysmon_cli.py", *args], cwd=HERE, capture_output=True, text=True, timeout=30)
+    assert result.returncode == 0, result.stderr
+    return result.stdout, result.stderr
+
+#=====================================================
+#Sampling
+#=====================================================
+
+def test_cpu_covers_exactly_the_window(proc, monkeypatch):
+    """The counters are primed, the window elapses, and only that delta is scored."""
+    def sleep(seconds):
+        assert seconds == 0.05
+        (proc / "stat").write_text(stat_text(130, 970))
+    monkeypatch.setattr(oneshot.time, "sleep", sleep)
+    cpu, mem, disk, sent, recv, cores = oneshot.take_sample(0.05, per_core=True, proc_root=str(proc))
+    assert cpu == 30.0 and cores == [30.0]
+    assert mem == 75.0 and (sent, recv) == (8, 4)
+
+def test_window_must_be_positive():
+    with pytest.raises(SystemExit):
+        oneshot.parse_args(["--once", "--window", "0"])
+
+def test_loop_only_options_are_ignored():
+    """A cron line shared with the looping monitor still works: options --once has no use for are skipped."""
+    args = oneshot.parse_args(["--json", "--once", "--max-iterations", "1", "--collector", "proc"])
+    assert args.json and args.model is None
+
+def test_bad_health_options_fail_before_sampling(monkeypatch):
+    """An unknown profile or a bad weight is a usage error raised before the window is spent."""
+    monkeypatch.setattr(oneshot, "take_sample", lambda *args: pytest.fail("sampled before the options were checked"))
+    for bad in (["--health-profile", "server"], ["--health-weight", "cpu=abc"]):
+        with pytest.raises(SystemExit) as exit_info:
+            oneshot.run(["--once", "--json", *bad], time.perf_counter())
+        assert exit_info.value.code == 2
+    assert oneshot.parse_args(["--once", "--health-profile", "compute"]).model is not None
+
+def test_budget_warning(capsys, monkeypatch):
+    """Exceeding the start-up budget is reported on stderr, the sample is still printed."""
+    monkeypatch.setattr(oneshot, "take_sample", lambda *args: (50.0, 50.0, 50.0, 1, 2, None))
+    assert oneshot.run(["--once", "--json", "--window", "0.01", "--once-budget", "0"], time.perf_counter() - 1) == 0
+    out, err = capsys.readouterr()
+    assert json.loads(out)["health"] == 50.0 and "over the 0 ms budget" in err
+
+#=====================================================
+#Fast Start
+#=====================================================
+
+def test_once_json_output():
+    """--once --json prints one record with the usual fields plus the window and start-up time."""
+    out, _ = run_cli("--once", "--json", "--window", "0.05")
+    record = json.loads(out)
+    assert {"timestamp", "cpu", "mem", "disk", "health", "net_sent_kb", "net_recv_kb", "startup_ms"} <= set(record)
+    assert record["window"] == 0.05 and record["startup_ms"] >= 0
+
+def test_json_path_skips_heavy_imports():
+    """Neither rich, psutil, asyncio nor numpy are imported for a JSON snapshot."""
+    code = ("import runpy, sys\n"
+            "sys.argv = ['sysmon_cli.py', '--once', '--json', '--window', '0.01', '--once-budget', '10000']\n"
+            "try:\n"
+            "    runpy.run_path('sysmon_cli.py', run_name='__main__')\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "print(sorted(m for m in ('rich', 'psutil', 'asyncio', 'numpy') if m in sys.modules))\n")
+    result = subprocess.run([sys.executable, "-c", code], cwd=HERE, capture_output=True, text=True, timeout=30)
+    assert result.stdout.splitlines()[-1] == "[]"
+
+def test_once_after_a_subcommand_is_not_intercepted():
+    """--once after analyze / rescore / collect belongs to that subcommand, which rejects it."""
+    result = subprocess.run([sys.executable, "sysmon_cli.py", "analyze", "missing.csv", "--once"], cwd=HERE,
+                            capture_output=True, text=True, timeout=30)
+    assert result.returncode == 2 and "unrecognized arguments: --once" in result.stderr
+
+def test_startup_within_budget():
+    """Script start to output stays within a generous multiple of the default budget, even on a slow CI box."""
+    out, _ = run_cli("--once", "--json", "--window", "0.01", "--once-budget", "10000")
+    assert json.loads(out)["startup_ms"] < oneshot.DEFAULT_BUDGET_MS["json"] * 4
@@ -0,0 +1,102 @@
+import pytest
+from unittest.mock import patch
+from procfs import ProcCollector, ProcFile, cpu_times, cpu_percent
+from sysmon_cli import get_stats, create_collector, SystemStats
+
+STAT_1 = """cpu  100 0 100 800 0 0 0 0 0 0
+cpu0 50 0 50 400 0 0 0 0 0 0
+cpu1 50 0 50 400 0 0 0 0 0 0
+intr 12345
+"""
+
+STAT_2 = """cpu  200 0 200 1400 200 0 0 0 0 0
+cpu0 150 0 150 600 0 0 0 0 0 0
+cpu1 50 0 50 900 200 0 0 0 0 0
+intr 12399
+"""
+
+MEMINFO = """MemTotal:       1000000 kB
+MemFree:         200000 kB
+MemAvailable:    250000 kB
+Buffers:          10000 kB
+Cached:          100000 kB
+SwapCached:           0 kB
+"""
+
+NET_DEV = """Inter-|   Receive                                                |  Transmit
+ face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed
+    lo:    1000      10    0    0    0     0          0         0     1000      10    0    0    0     0       0          0
+  eth0: 2048000    1500    0    0    0     0          0         0   512000     900    0    0    0     0       0          0
+"""
+
+@pytest.fixture
+def proc_root(tmp_path):
+    (tmp_path / "net").mkdir()
+    (tmp_path / "stat").write_text(STAT_1)
+    (tmp_path / "meminfo").write_text(MEMINFO)
+    (tmp_path / "net" / "dev").write_text(NET_DEV)
+    return tmp_path
+
+#=====================================================
+#Parsing Helpers
+#=====================================================
+
+def test_cpu_times_counts_iowait_as_idle():
+    """Idle and iowait jiffies should not count as busy time."""
+    busy, total = cpu_times(b"cpu  10 0 10 70 10 0 0 0 0 0")
+    assert total == 100
+    assert busy == 20
+
+def test_cpu_percent_first_sample_is_zero():
+    """Without a previous sample there is no delta, so usage is 0."""
+    assert cpu_percent(None, (20, 100)) == 0.0
+    assert cpu_percent((20, 100), (20, 100)) == 0.0
+
+def test_proc_file_rereads_and_grows(tmp_path):
+    """Rereading should see new content, even when it outgrows the buffer."""
+    path = tmp_path / "stat"
+    path.write_text("short")
+    proc_file = ProcFile(str(path), size=4)
+    assert proc_file.read() == b"short"
+    path.write_text("x" * 100)
+    assert proc_file.read() == b"x" * 100
+    proc_file.close()
+
+#=====================================================
+#Collector Tests
+#=====================================================
+
+def test_collector_reads_all_metrics(proc_root):
+    """CPU comes from the stat delta, memory from MemAvailable, network summed over interfaces."""
+    collector = ProcCollector(proc_root=str(proc_root))
+    (proc_root / "stat").write_text(STAT_2)
+
+    cpu, mem, disk, sent, recv, cores = collector.read(per_core=True)
+    assert cpu == 20.0          # busy +200 over total +1000
+    assert cores == [50.0, 0.0]
+    assert mem == 75.0
+    assert 0 <= disk <= 100
+    assert sent == 513000
+    assert recv == 2049000
+    collector.close()
+
+def test_collector_skips_per_core_when_disabled(proc_root):
+    """Per-core values should be None unless requested."""
+    collector = ProcCollector(proc_root=str(proc_root))
+    assert collector.read(per_core=False)[5] is None
+    collector.close()
+
+def test_get_stats_uses_collector(proc_root):
+    """get_stats() should convert collector bytes to KB."""
+    collector = ProcCollector(proc_root=str(proc_root))
+    stats = get_stats(collector=collector)
+    assert isinstance(stats, SystemStats)
+    assert stats.mem == 75.0
+    assert stats.net_sent == 513000 // 1024
+    collector.close()
+
+def test_create_collector_falls_back_to_psutil():
+    """A missing /proc should fall back to the psutil backend (None)."""
+    with patch("sysmon_cli.ProcCollector", side_effect=FileNotFoundError("no /proc")):
+        assert create_collector("proc") is None
+    assert create_collector("psutil") is None
@@ -0,0 +1,93 @@
+import asyncio
+import json
+import time
+from profiling import Histogram, LoopProfiler, BUCKET_BOUNDS
+from scheduler import Collector, Scheduler
+from sysmon_cli import SystemStats, output_json, print_profile
+
+#=====================================================
+#Histogram
+#=====================================================
+
+def test_histogram_buckets_and_percentiles():
+    """Percentiles come from fixed buckets: the bucket upper bound, capped at the real max."""
+    h = Histogram()
+    for _ in range(99):
+        h.record(0.0015)          # falls in the 2.048 ms bucket
+    h.record(0.5)
+    assert h.count == 100 and len(h.buckets) == len(BUCKET_BOUNDS) + 1
+    assert h.percentile(50) == BUCKET_BOUNDS[11]
+    assert h.percentile(100) == 0.5
+    summary = h.summary()
+    assert summary["max_ms"] == 500.0
+    assert summary["p99_ms"] == 2.048
+
+def test_histogram_overflow_and_empty():
+    h = Histogram()
+    assert h.summary()["p95_ms"] == 0.0
+    h.record(100.0)
+    assert h.buckets[-1] == 1 and h.percentile(50) == 100.0
+
+#=====================================================
+#LoopProfiler
+#=====================================================
+
+def test_laps_and_deadlines():
+    """Laps measure the time since the previous mark; overruns count missed and skipped ticks."""
+    now = [0.0]
+    profiler = LoopProfiler(clock=lambda: now[0])
+    profiler.begin()
+    now[0] = 0.001
+    profiler.lap("collect")
+    now[0] = 0.004
+    profiler.lap("render")
+    profiler.tick(0.0002)
+    profiler.overrun(2)
+    profiler.tick(2.5)
+    summary = profiler.summary()
+    assert summary["stages"]["collect"]["max_ms"] == 1.0
+    assert summary["stages"]["render"]["max_ms"] == 3.0
+    assert (summary["ticks"], summary["missed_deadlines"], summary["skipped_ticks"]) == (2, 1, 2)
+    assert summary["jitter"]["max_ms"] == 2500.0
+
+def test_disabled_profiler_records_nothing():
+    profiler = LoopProfiler(enabled=False)
+    profiler.begin()
+    profiler.lap("collect")
+    profiler.tick(1.0)
+    profiler.overrun(3)
+    assert profiler.summary()["stages"] == {} and profiler.ticks == 0 and profiler.missed == 0
+
+def test_scheduler_reports_overruns_and_reads():
+    """A consumer that overruns its interval shows up as missed deadlines; collector reads are timed by name."""
+    profiler = LoopProfiler()
+
+    async def scenario():
+        scheduler = Scheduler([Collector("cpu", 0.01, lambda: 1, blocking=False)], profiler=profiler)
+        await scheduler.start()
+        count = 0
+        async for _ in scheduler.subscribe(0.02):
+            count += 1
+            if count == 2:
+                time.sleep(0.05)  # blocks the loop: the next deadline is missed
+            if count == 4:
+                break
+        await scheduler.stop()
+
+    asyncio.run(scenario())
+    assert profiler.missed == 1 and profiler.skipped >= 1
+    assert profiler.stages["read:cpu"].count >= 1
+
+#=====================================================
+#Output
+#=====================================================
+
+def test_profile_in_json(capsys):
+    profiler = LoopProfiler()
+    profiler.record("log", 0.002)
+    output_json(SystemStats(1, 2, 3, 4, 5), 90, profile=profiler.summary())
+    data = json.loads(capsys.readouterr().out)
+    assert data["profile"]["stages"]["log"]["count"] == 1
+
+    print_profile(profiler, json_output=True)
+    assert "missed_deadlines" in json.loads(capsys.readouterr().out)["profile"]
@@ -0,0 +1,91 @@
+import pytest
+from health import HealthModel
+from psi import PressureMonitor, parse_pressure, pressure_values, stall_percent
+from sysmon_cli import SystemStats, json_record, pressure_rows, pressure_summary, stats_health
+
+def pressure_file(some_total, full_total=0, some_avg10=0.0, full_avg10=0.0):
+    return (f"some avg10={some_avg10:.2f} avg60=1.50 avg300=0.50 total={some_total}\n"
+            f"full avg10={full_avg10:.2f} avg60=0.00 avg300=0.00 total={full_total}\n")
+
+@pytest.fixture
+def proc(tmp_path):
+    (tmp_path / "pressure").mkdir()
+    for resource in ("cpu", "memory", "io"):
+        (tmp_path / "pressure" / resource).write_text(pressure_file(1_000_000))
+    return tmp_path
+
+def advance(proc, clock, seconds, **stalls):
+    """Move the clock and add stall microseconds ("some", "full") per resource."""
+    clock.now += seconds
+    for resource, (some, full) in stalls.items():
+        (proc / "pressure" / resource).write_text(pressure_file(1_000_000 + some, full, some_avg10=5.0))
+
+#=====================================================
+#Parsing and Rates
+#=====================================================
+
+def test_parse_pressure_lines():
+    """Both lines give avg10 / avg60 / avg300 and the total stall time."""
+    lines = parse_pressure(pressure_file(42, 7, some_avg10=2.34).encode())
+    assert lines["some"] == (2.34, 1.5, 0.5, 42) and lines["full"][3] == 7
+
+def test_stall_rate_covers_the_last_tick(proc, clock):
+    """Stall % comes from the total counter delta, the kernel averages are passed through."""
+    monitor = PressureMonitor(str(proc), clock=clock)
+    advance(proc, clock, 2.0, memory=(500_000, 100_000))
+    pressure = monitor.collect()
+    assert pressure["memory"].some_percent == 25.0 and pressure["memory"].full_percent == 5.0
+    assert pressure["memory"].some_avg10 == 5.0 and pressure["memory"].some_avg60 == 1.5
+    assert pressure["cpu"].some_percent == 0.0
+    monitor.close()
+
+def test_counter_reset_and_missing_psi(tmp_path, proc):
+    """A counter going backwards gives 0 % rather than a negative stall; no pressure files raises OSError."""
+    assert stall_percent(500, 100, 1.0) == 0.0 and stall_percent(None, 100, 1.0) == 0.0
+    with pytest.raises(OSError):
+        PressureMonitor(str(tmp_path / "missing"))
+    (proc / "pressure" / "cpu").unlink()
+    monitor = PressureMonitor(str(proc))
+    assert set(monitor.collect()) == {"memory", "io"}
+    monitor.close()
+
+#=====================================================
+#PSI Health
+#=====================================================
+
+def test_psi_health_ignores_busy_cpu_without_stalls(proc, clock):
+    """90 % CPU with no stalls is healthy; 40 % memory under heavy memory pressure is not."""
+    monitor = PressureMonitor(str(proc), clock=clock)
+    model = HealthModel()
+    advance(proc, clock, 1.0)
+    busy = SystemStats(90.0, 30.0, 20.0, 0, 0)
+    busy.pressure = monitor.collect()
+    assert stats_health(busy, model) == 48.0 and stats_health(busy, model, psi_health=True) == 100
+    advance(proc, clock, 1.0, memory=(200_000, 50_000))
+    thrashing = SystemStats(20.0, 40.0, 20.0, 0, 0)
+    thrashing.pressure = monitor.collect()
+    assert pressure_values(thrashing.pressure)["mem"] == 80.0
+    assert stats_health(thrashing, model) == 72.0 and stats_health(thrashing, model, psi_health=True) == 68.0
+    monitor.close()
+
+def test_psi_health_falls_back_without_pressure():
+    """Without pressure data (no PSI, replay) the utilization score is used."""
+    stats = SystemStats(50.0, 50.0, 50.0, 0, 0)
+    assert stats_health(stats, psi_health=True) == stats_health(stats) == 50.0
+
+#=====================================================
+#Output
+#=====================================================
+
+def test_pressure_reaches_json_rows_and_table(proc, clock):
+    """Every resource is in JSON, the pressure log and the table."""
+    monitor = PressureMonitor(str(proc), clock=clock)
+    advance(proc, clock, 1.0, io=(150_000, 60_000))
+    stats = SystemStats(1.0, 2.0, 3.0, 0, 0)
+    stats.pressure = monitor.collect()
+    record = json_record(stats, 99.0)["pressure"]
+    assert set(record) == {"cpu", "memory", "io"} and record["io"]["some_percent"] == 15.0
+    assert [row[1] for row in pressure_rows(stats)] == ["cpu", "memory", "io"]
+    assert "some [red]15.0[/red]%" in pressure_summary(stats.pressure["io"])
+    assert "full [red]6.0[/red]%" in pressure_summary(stats.pressure["io"])
+    monitor.close()
@@ -0,0 +1,109 @@
+import asyncio
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+import pytest
+from datetime import timedelta
+from rich.console import Console
+import sysmon_cli
+from binlog import BinaryLogger
+from csvlog import LOG_HEADER
+from replay import Replayer, iter_samples, parse_speed
+
+def replay_rows(start, n, step=2.0, spike=None):
+    """Steady rows 2 s apart (cpu 20-22 %), with an optional cpu spike at index `spike`."""
+    return [[start + timedelta(seconds=i * step), 95.0 if i == spike else 20.0 + (i % 3), 40.0, 30.0, 0.0, i, i] for i in range(n)]
+
+async def drain(replayer):
+    return [snapshot async for snapshot in replayer.ticks()]
+
+#=====================================================
+#Reading Logs
+#=====================================================
+
+def test_parse_speed():
+    """Speeds accept an optional x suffix; max means unpaced."""
+    assert parse_speed("100x") == 100 and parse_speed("0.5") == 0.5 and parse_speed("MAX") is None
+    with pytest.raises(ValueError):
+        parse_speed("fast")
+    with pytest.raises(ValueError):
+        parse_speed("0x")
+
+def test_csv_samples_skip_damaged_rows(tmp_path, write_csv, log_start):
+    """Repeated headers and damaged rows are skipped; timestamps become epoch seconds."""
+    path = str(tmp_path / "log.csv")
+    write_csv(path, replay_rows(log_start, 5))
+    with open(path, "a") as f:
+        f.write(",".join(LOG_HEADER) + "\n")
+        f.write("bad,row\n")
+    samples = list(iter_samples(path))
+    assert len(samples) == 5
+    assert samples[1][0] - samples[0][0] == pytest.approx(2.0)
+    assert samples[0][0] == pytest.approx(log_start.timestamp())
+
+def test_binary_samples(tmp_path):
+    """Binary logs stream the same tuple shape, health column ignored."""
+    path = str(tmp_path / "log.bin")
+    logger = BinaryLogger(path)
+    for i in range(25):
+        logger.write((1_700_000_000.0 + i, 10.1, 20.2, 30.3, 99.0, i, i * 2))
+    logger.close()
+    samples = list(iter_samples(path))
+    assert len(samples) == 25
+    assert samples[-1] == (1_700_000_024.0, 10.1, 20.2, 30.3, 24, 48)
+
+#=====================================================
+#Pacing
+#=====================================================
+
+def test_max_speed_replays_everything(tmp_path, write_csv, log_start):
+    """At max speed every sample is yielded, with its recorded timestamp, and the clock follows the log."""
+    path = str(tmp_path / "log.csv")
+    write_csv(path, replay_rows(log_start, 3000))
+    replayer = Replayer(path)
+    snapshots = asyncio.run(drain(replayer))
+    assert len(snapshots) == 3000 and replayer.samples == 3000
+    assert replayer.now() == snapshots[-1]["timestamp"]
+    assert replayer.summary()["end"] == str(log_start + timedelta(seconds=5998))
+
+def test_speed_multiplier_paces_samples(tmp_path, write_csv, log_start):
+    """10 samples 2 s apart at 100x take about 0.18 s."""
+    path = str(tmp_path / "log.csv")
+    write_csv(path, replay_rows(log_start, 10))
+    started = time.perf_counter()
+    asyncio.run(drain(Replayer(path, speed=100)))
+    assert 0.15 <= time.perf_counter() - started < 1.0
+
+#=====================================================
+#Pipeline
+#=====================================================
+
+def test_replay_runs_the_monitor_pipeline(tmp_path, monkeypatch, write_csv, log_start):
+    """Replayed samples go through health, trends and alerts and keep their recorded timestamps."""
+    monkeypatch.setattr(sysmon_cli, "console", Console(file=io.StringIO()))
+    path = str(tmp_path / "log.csv")
+    write_csv(path, replay_rows(log_start, 200, spike=150))
+    out = io.BytesIO()
+    sysmon_cli.main(replay=[path], speed=None, ndjson=True, ndjson_options={"stream": out, "flush_lines": 1000},
+                    alerts=True, alert_options={"cooldown": 0.0})
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    samples, summary = records[:-1], records[-1]["replay"]
+    assert len(samples) == 200 and summary["samples"] == 200
+    assert samples[0]["timestamp"] == log_start.isoformat()
+    assert samples[1]["health"] == sysmon_cli.calculate_health(21.0, 40.0, 30.0)
+    assert "trends" in samples[1]
+    fired = [a for a in samples[150].get("alerts", []) if a["state"] == "firing"]
+    assert {a["detector"] for a in fired} == {"zscore", "rate"}
+    assert fired[0]["timestamp"] == (log_start + timedelta(seconds=300)).isoformat()
+
+def test_missing_replay_file_is_a_usage_error(tmp_path, write_csv, make_rows):
+    """Every --replay file is checked before the display starts, not when the loop reaches it."""
+    path = str(tmp_path / "log.csv")
+    write_csv(path, make_rows(3))
+    result = subprocess.run([sys.executable, "sysmon_cli.py", "--replay", path, str(tmp_path / "missing.csv"), "--json"],
+                            cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, timeout=30)
+    assert result.returncode == 2 and "missing.csv" in result.stderr and "Traceback" not in result.stderr
+    assert result.stdout == ""
@@ -0,0 +1,90 @@
+import os
+import subprocess
+import sys
+import time
+import pytest
+from ringbuffer import RingBuffer, Sampler, ring_capacity
+from sysmon_cli import SystemStats, window_stats, output_json
+
+#=====================================================
+#Ring Buffer Tests
+#=====================================================
+
+def test_ring_buffer_is_preallocated():
+    """Columns should be allocated once at full capacity."""
+    buf = RingBuffer(4)
+    assert len(buf) == 0
+    assert all(len(column) == 4 for column in buf._columns)
+    assert buf.summary() is None
+
+def test_ring_buffer_overwrites_oldest():
+    """When full, new samples replace the oldest ones."""
+    buf = RingBuffer(3, fields=("cpu",))
+    for value in [1, 2, 3, 4, 5]:
+        buf.append([value])
+    assert len(buf) == 3
+    assert list(buf.tail("cpu")) == [3, 4, 5]
+    assert list(buf.tail("cpu", 2)) == [4, 5]
+
+def test_ring_buffer_summary_min_mean_max():
+    """Summary should give min/mean/max per field over the newest samples."""
+    buf = RingBuffer(10, fields=("cpu", "mem"))
+    for cpu in [10, 90, 20]:
+        buf.append([cpu, 50])
+    window = buf.summary()
+    assert window["samples"] == 3
+    assert window["cpu"] == (10, 40, 90)
+    assert window["mem"] == (50, 50, 50)
+    assert buf.summary(1)["cpu"] == (20, 20, 20)
+
+def test_ring_buffer_rejects_zero_capacity():
+    with pytest.raises(ValueError):
+        RingBuffer(0)
+
+def test_ring_capacity_covers_two_intervals():
+    assert ring_capacity(100, 2) >= 400
+    assert ring_capacity(0.1, 0.1) == 1
+
+#=====================================================
+#Sampler Tests
+#=====================================================
+
+def test_sampler_catches_spikes_between_renders():
+    """A short spike between two renders should show up in the window max."""
+    values = iter([10, 95, 10, 10] + [10] * 1000)
+    sampler = Sampler(lambda: SystemStats(next(values), 50, 60, 1, 2), 200, RingBuffer(1000))
+    sampler.start()
+    time.sleep(0.05)
+    sampler.stop()
+
+    window = sampler.window()
+    assert window["samples"] >= 4
+    assert window["cpu"][2] == 95
+    assert window["cpu"][0] == 10
+
+def test_sampler_window_only_covers_new_samples():
+    """Each window should start where the previous one ended."""
+    sampler = Sampler(lambda: SystemStats(1, 2, 3, 4, 5), 10, RingBuffer(10))
+    sampler._sample_once()
+    sampler._sample_once()
+    assert sampler.window()["samples"] == 2
+    assert sampler.window()["samples"] == 1   # nothing new: newest sample is reused
+
+def test_window_stats_and_json(capsys):
+    """Window means feed SystemStats, min/max appear in JSON output."""
+    window = {"samples": 3, "cpu": (10, 40, 90), "mem": (50, 50, 50), "disk": (60, 60, 60),
+              "net_sent": (1, 1, 1), "net_recv": (2, 2, 2)}
+    stats = window_stats(window, SystemStats(90, 50, 60, 7, 8, None))
+    assert stats.cpu == 40
+    assert stats.net_sent == 7
+
+    output_json(stats, 50, window=window)
+    out = capsys.readouterr().out
+    assert '"window"' in out
+    assert '"max": 90' in out
+
+@pytest.mark.parametrize("rate", ["0", "-5"])
+def test_non_positive_sample_rate_is_a_usage_error(rate):
+    result = subprocess.run([sys.executable, "sysmon_cli.py", "--sample-rate", rate, "--max-iterations", "1"],
+                            cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, timeout=30)
+    assert result.returncode == 2 and "--sample-rate must be positive" in result.stderr and "Traceback" not in result.stderr
@@ -0,0 +1,117 @@
+import os
+import subprocess
+import sys
+import pytest
+from rrd import RoundRobinStore, parse_duration, stored_rows, tier_rows
+from sysmon_cli import SystemStats, create_store, store_values
+
+ROWS = {"raw": 5, "1min": 3, "1h": 2}
+
+def sample(value):
+    return (value, value + 1, value + 2, 100 - value, value * 10, value * 20)
+
+@pytest.fixture
+def store(tmp_path):
+    s = RoundRobinStore(str(tmp_path / "sysmon.rrd"), ROWS)
+    yield s
+    s.close()
+
+#=====================================================
+#Layout / Preallocation
+#=====================================================
+
+def test_file_is_preallocated_and_never_grows(store):
+    """The file should have its full size from the start and keep it."""
+    size = os.path.getsize(store.path)
+    assert size == store.size
+    for t in range(0, 10_000, 10):
+        store.update(float(t), sample(t % 100))
+    store.flush()
+    assert os.path.getsize(store.path) == size
+
+def test_reopen_continues_and_checks_layout(tmp_path):
+    """Reopening keeps the data; a different layout is refused."""
+    path = str(tmp_path / "sysmon.rrd")
+    s = RoundRobinStore(path, ROWS)
+    s.update(0.0, sample(1))
+    s.close()
+
+    s = RoundRobinStore(path, ROWS)
+    s.update(1.0, sample(2))
+    assert [row[0] for row in s.fetch("raw")] == [0.0, 1.0]
+    s.close()
+
+    with pytest.raises(ValueError):
+        RoundRobinStore(path, {"raw": 6, "1min": 3, "1h": 2})
+
+#=====================================================
+#Raw Tier / Rollups
+#=====================================================
+
+def test_raw_tier_keeps_newest_rows(store):
+    """The raw tier wraps around and keeps only the newest samples, oldest first."""
+    for t in range(8):
+        store.update(float(t), sample(t))
+    raw = store.fetch("raw")
+    assert [row[0] for row in raw] == [3.0, 4.0, 5.0, 6.0, 7.0]
+    assert raw[-1][2]["cpu"] == {"min": 7, "max": 7, "avg": 7, "last": 7}
+
+def test_minute_rollup_min_max_avg_last(store):
+    """Samples in the same minute fold into one row incrementally."""
+    for t, cpu in [(0, 10), (20, 50), (40, 30), (60, 90)]:
+        store.update(float(t), sample(cpu))
+    rows = store.fetch("1min")
+    assert [row[0] for row in rows] == [0.0, 60.0]
+    first = rows[0]
+    assert first[1] == 3
+    assert first[2]["cpu"] == {"min": 10, "max": 50, "avg": pytest.approx(30), "last": 30}
+    assert first[2]["health"]["min"] == 50
+
+def test_rollup_tiers_wrap(store):
+    """Rollup tiers keep a bounded number of slots."""
+    for minute in range(5):
+        store.update(minute * 60.0, sample(minute))
+    assert [row[0] for row in store.fetch("1min")] == [120.0, 180.0, 240.0]
+    hours = store.fetch("1h")
+    assert len(hours) == 1
+    assert hours[0][1] == 5
+
+#=====================================================
+#Helpers / sysmon_cli Integration
+#=====================================================
+
+def test_parse_duration_and_tier_rows():
+    assert parse_duration("90") == 90
+    assert parse_duration("30m") == 1800
+    assert parse_duration("7d") == 7 * 86400
+    assert tier_rows(2, 3600, 7 * 86400, 365 * 86400) == {"raw": 1800, "1min": 10080, "1h": 8760}
+
+def test_create_store_from_retention(tmp_path):
+    """create_store() sizes tiers from the retention periods and the interval."""
+    s = create_store(str(tmp_path / "s.rrd"), 2, ("10m", "1h", "1d"))
+    assert s.rows == [300, 60, 24]
+    s.update(0.0, store_values(SystemStats(1, 2, 3, 4, 5), 90))
+    assert s.fetch("raw")[0][2]["health"]["last"] == 90
+    s.close()
+
+def test_reopen_with_another_interval_keeps_stored_layout(tmp_path):
+    """A restart with a different --interval reuses the tier sizes stored in the file instead of refusing it."""
+    path = str(tmp_path / "s.rrd")
+    s = create_store(path, 2, ("10m", "1h", "1d"))
+    s.update(0.0, store_values(SystemStats(1, 2, 3, 4, 5), 90))
+    s.close()
+    s = create_store(path, 5, ("10m", "1h", "1d"))
+    assert s.rows == [300, 60, 24] and len(s.fetch("raw")) == 1
+    s.close()
+    assert stored_rows(str(tmp_path / "missing.rrd")) is None
+
+def test_bad_rrd_options_are_usage_errors(tmp_path):
+    """A bad retention or a file that is not a store is reported by argparse, before the monitor starts."""
+    (tmp_path / "other.rrd").write_bytes(b"x" * 200)
+    for args in (["--rrd-raw", "xx"], ["--rrd-raw", "1h"]):
+        path = str(tmp_path / ("new.rrd" if "xx" in args else "other.rrd"))
+        result = subprocess.run([sys.executable, "sysmon_cli.py", "--rrd", path, *args, "--max-iterations", "1"],
+                                cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, timeout=30)
+        assert result.returncode == 2 and "error:" in result.stderr and "Traceback" not in result.stderr
+    with pytest.raises(ValueError, match="invalid duration"):
+        parse_duration("xx")
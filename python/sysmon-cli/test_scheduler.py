@@ -0,0 +1,160 @@
+import asyncio
+import os
+import subprocess
+import sys
+import threading
+import time
+import pytest
+from scheduler import Collector, Scheduler, LatestState
+from sysmon_cli import metric_collectors, snapshot_stats, DEFAULT_PERIODS
+from mounts import MountUsage
+
+def run(coro):
+    return asyncio.run(coro)
+
+#=====================================================
+#Scheduling
+#=====================================================
+
+def test_collectors_run_at_their_own_period():
+    """A fast collector should run many times while a slow one runs once."""
+    async def scenario():
+        scheduler = Scheduler([Collector("fast", 0.02, lambda: "f", blocking=False),
+                               Collector("slow", 10, lambda: "s")])
+        await scheduler.start()
+        await asyncio.sleep(0.25)
+        await scheduler.stop()
+        return scheduler
+
+    scheduler = run(scenario())
+    assert scheduler.runs["slow"] == 1
+    assert scheduler.runs["fast"] >= 8
+    assert scheduler.state.snapshot() == {"fast": "f", "slow": "s"}
+
+def test_slow_collector_does_not_delay_others():
+    """A blocking read stuck in its worker thread must not hold back the other collectors."""
+    release = threading.Event()
+
+    def hung():
+        release.wait(5)
+        return "late"
+
+    async def scenario():
+        scheduler = Scheduler([Collector("hung", 0.01, hung), Collector("cpu", 0.02, lambda: 1, blocking=False),
+                               Collector("disk", 0.02, lambda: 2)])
+        await scheduler.start(timeout=0.05)
+        await asyncio.sleep(0.2)
+        snapshot = scheduler.state.snapshot()
+        runs = dict(scheduler.runs)
+        release.set()
+        await scheduler.stop()
+        return snapshot, runs
+
+    snapshot, runs = run(scenario())
+    assert "hung" not in snapshot
+    assert runs["cpu"] >= 5 and runs["disk"] >= 5
+
+def test_collector_that_never_returns_does_not_block_exit():
+    """After stop() the process exits even though a read is stuck for good (e.g. in a kernel call)."""
+    code = ("import asyncio, threading\n"
+            "from scheduler import Collector, Scheduler\n"
+            "async def main():\n"
+            "    scheduler = Scheduler([Collector('stuck', 1, lambda: threading.Event().wait())])\n"
+            "    await scheduler.start(timeout=0.05)\n"
+            "    await scheduler.stop()\n"
+            "asyncio.run(main())\n")
+    started = time.monotonic()
+    subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(os.path.abspath(__file__)), check=True, timeout=10)
+    assert time.monotonic() - started < 3
+
+def test_failing_collector_keeps_last_value():
+    calls = []
+    errors = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) > 1:
+            raise OSError("gone")
+        return 42
+
+    async def scenario():
+        scheduler = Scheduler([Collector("flaky", 0.02, flaky, blocking=False)],
+                              on_error=lambda name, e: errors.append(name))
+        await scheduler.start()
+        await asyncio.sleep(0.1)
+        await scheduler.stop()
+        return scheduler
+
+    scheduler = run(scenario())
+    assert scheduler.state.snapshot() == {"flaky": 42}
+    assert isinstance(scheduler.state.errors["flaky"], OSError)
+    assert errors and set(errors) == {"flaky"}
+
+def test_subscribe_yields_at_interval():
+    async def scenario():
+        scheduler = Scheduler([Collector("cpu", 0.01, time.monotonic, blocking=False)])
+        await scheduler.start()
+        seen = []
+        started = time.monotonic()
+        async for snapshot in scheduler.subscribe(0.05):
+            seen.append(snapshot["cpu"])
+            if len(seen) == 4:
+                break
+        elapsed = time.monotonic() - started
+        await scheduler.stop()
+        return seen, elapsed
+
+    seen, elapsed = run(scenario())
+    assert seen == sorted(seen) and len(set(seen)) == 4
+    assert 0.14 <= elapsed < 0.5
+
+def test_invalid_period():
+    with pytest.raises(ValueError):
+        Scheduler([Collector("cpu", 0, lambda: 0)])
+
+def test_latest_state_version_and_copy():
+    state = LatestState(clock=lambda: 5.0)
+    state.set("cpu", 1)
+    snapshot = state.snapshot()
+    state.set("cpu", 2)
+    assert snapshot == {"cpu": 1} and state.version == 2 and state.updated["cpu"] == 5.0
+
+#=====================================================
+#sysmon_cli integration
+#=====================================================
+
+class FakeBackend:
+    def read_cpu(self, per_core=False):
+        return 12.5, [10.0, 15.0] if per_core else None
+
+    def read_mem(self):
+        return 40.0
+
+    def read_disk(self):
+        return 55.0
+
+    def read_net(self):
+        return 4096, 8192
+
+def test_metric_collectors_and_snapshot_stats():
+    """Default periods, blocking only for disk, values converted into a SystemStats."""
+    collectors = {c.name: c for c in metric_collectors(DEFAULT_PERIODS, per_core=True, backend=FakeBackend())}
+    assert {name: c.period for name, c in collectors.items()} == {"cpu": 1.0, "mem": 5.0, "net": 1.0, "disk": 60.0}
+    assert [name for name, c in collectors.items() if c.blocking] == ["disk"]
+
+    snapshot = {name: c.read() for name, c in collectors.items()}
+    snapshot["mounts"] = [MountUsage("/", "ext4", "sda1", 70.0), MountUsage("/data", "xfs", "sdb1", 91.0)]
+    stats = snapshot_stats(snapshot)
+    assert (stats.cpu, stats.mem, stats.net_sent, stats.net_recv, stats.per_core) == (12.5, 40.0, 4, 8, [10.0, 15.0])
+    assert stats.disk == 91.0
+
+def test_snapshot_stats_before_first_read():
+    stats = snapshot_stats({})
+    assert (stats.cpu, stats.mem, stats.disk, stats.net_sent) == (0.0, 0.0, 0.0, 0)
+
+@pytest.mark.parametrize("args", [["--interval", "0", "--profile"], ["--interval", "-1"], ["--cpu-period", "0"], ["--net-period", "-2"]])
+def test_non_positive_periods_are_usage_errors(args):
+    """Periods that would divide by zero are refused by argparse instead of crashing the loop."""
+    result = subprocess.run([sys.executable, "sysmon_cli.py", *args, "--max-iterations", "1"],
+                            cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, timeout=30)
+    assert result.returncode == 2 and "must be positive" in result.stderr and "Traceback" not in result.stderr
@@ -0,0 +1,106 @@
+import os
+import subprocess
+import sys
+import pytest
+from multiprocessing import shared_memory
+from shm import (SamplePublisher, SampleReader, read_sample, HEADER, MAGIC, VERSION, PAYLOAD, SEQUENCE, SEQUENCE_OFFSET,
+                 TRAILER_OFFSET)
+from sysmon_cli import SystemStats, shm_values
+
+@pytest.fixture
+def name(request):
+    name = f"sysmon-test-{os.getpid()}-{request.node.name[-20:]}"
+    yield name
+    if os.path.exists(f"/dev/shm/{name}"):  # a failed test must not leave its segment behind
+        os.unlink(f"/dev/shm/{name}")
+
+def values(i):
+    return (1_700_000_000.0 + i, float(i), float(i), float(i), 100.0 - i % 100, i, i, 2.0)
+
+#=====================================================
+#Publish / Read
+#=====================================================
+
+def test_round_trip(name):
+    """Readers see nothing before the first publish, then always the latest sample."""
+    publisher = SamplePublisher(name)
+    reader = SampleReader(name)
+    assert reader.read() is None
+    publisher.publish(values(1))
+    publisher.publish(values(2))
+    sample = reader.read()
+    assert sample.sequence == 2 and sample.cpu == 2.0 and sample.net_recv == 2 and sample.interval == 2.0
+    assert reader.alive()
+    reader.close()
+    publisher.close()
+
+def test_write_in_progress_is_never_returned(name):
+    """An odd sequence or a trailer that does not match means a write is in flight: retry, then time out."""
+    publisher = SamplePublisher(name)
+    publisher.publish(values(1))
+    reader = SampleReader(name)
+    buf = reader._buf
+    SEQUENCE.pack_into(buf, SEQUENCE_OFFSET, 3)
+    with pytest.raises(TimeoutError):
+        reader.read(timeout=0.01)
+    SEQUENCE.pack_into(buf, SEQUENCE_OFFSET, 4)
+    with pytest.raises(TimeoutError):
+        reader.read(timeout=0.01)
+    SEQUENCE.pack_into(buf, TRAILER_OFFSET, 4)
+    assert reader.read().sequence == 2
+    reader.close()
+    publisher.close()
+
+def test_reader_in_another_process_sees_consistent_samples(name):
+    """A reader process polling while the writer publishes never sees a mix of two samples, and leaves the segment in place."""
+    publisher = SamplePublisher(name)
+    publisher.publish(values(0))
+    code = ("from shm import SampleReader\n"
+            f"r = SampleReader({name!r}); bad = 0\n"
+            "for _ in range(20000):\n"
+            "    s = r.read()\n"
+            "    bad += not (s.cpu == s.mem == s.disk == s.net_sent == s.net_recv)\n"
+            "r.close(); print(bad)\n")
+    child = subprocess.Popen([sys.executable, "-c", code], cwd=os.path.dirname(__file__), stdout=subprocess.PIPE, text=True)
+    i = 0
+    while child.poll() is None:
+        i += 1
+        publisher.publish(values(i))
+    assert child.stdout.read().strip() == "0"
+    child.stdout.close()
+    assert read_sample(name).cpu == float(i)
+    publisher.close()
+
+#=====================================================
+#Segment Lifetime
+#=====================================================
+
+def test_stale_segment_is_taken_over_and_live_one_refused(name):
+    """A segment left by a dead writer is reused; one owned by a running process is not."""
+    leftover = shared_memory.SharedMemory(name, create=True, size=TRAILER_OFFSET + SEQUENCE.size)
+    HEADER.pack_into(leftover.buf, 0, MAGIC, VERSION, PAYLOAD.size, 2 ** 31 - 2)
+    publisher = SamplePublisher(name)
+    publisher.publish(values(5))
+    assert read_sample(name).cpu == 5.0
+    HEADER.pack_into(leftover.buf, 0, MAGIC, VERSION, PAYLOAD.size, os.getppid())
+    with pytest.raises(FileExistsError):
+        SamplePublisher(name)
+    HEADER.pack_into(leftover.buf, 0, MAGIC, VERSION, PAYLOAD.size, os.getpid())
+    leftover.close()
+    publisher.close()
+    with pytest.raises(FileNotFoundError):
+        SampleReader(name)
+
+def test_foreign_segment_rejected(name):
+    """Readers refuse segments that do not carry the sysmon header."""
+    other = shared_memory.SharedMemory(name, create=True, size=256)
+    with pytest.raises(ValueError):
+        SampleReader(name)
+    other.close()
+    other.unlink()
+
+def test_shm_values_from_stats():
+    """The published tuple matches the payload layout, recorded timestamps are kept."""
+    stats = SystemStats(10.0, 20.0, 30.0, 40, 50, timestamp=1_700_000_000.0)
+    assert shm_values(stats, 77.0, 2) == (1_700_000_000.0, 10.0, 20.0, 30.0, 77.0, 40, 50, 2)
+    PAYLOAD.pack(*shm_values(stats, 77.0, 2))
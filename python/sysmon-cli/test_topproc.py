@@ -0,0 +1,79 @@
+import os
+import pytest
+from topproc import TopProcesses, read_stat, read_cmdline, CLK_TCK, PAGE_SIZE
+from sysmon_cli import SystemStats, output_json, process_table
+
+def write_proc(root, pid, comm, ticks, starttime, rss_pages, cmdline=b""):
+    d = root / str(pid)
+    d.mkdir(exist_ok=True)
+    fields = ["S"] + ["0"] * 10 + [str(ticks), "0"] + ["0"] * 6 + [str(starttime), "0", str(rss_pages)] + ["0"] * 20
+    (d / "stat").write_text(f"{pid} ({comm}) " + " ".join(fields) + "\n")
+    (d / "cmdline").write_bytes(cmdline)
+
+@pytest.fixture
+def proc(tmp_path):
+    write_proc(tmp_path, 1, "init", 100, 10, 100, b"/sbin/init\x00splash\x00")
+    write_proc(tmp_path, 42, "my (weird) proc", 0, 20, 5000)
+    (tmp_path / "self").mkdir()
+    (tmp_path / "stat").write_text("cpu 1 2 3\n")
+    return tmp_path
+
+#=====================================================
+#Parsing
+#=====================================================
+
+def test_read_stat_handles_parentheses_in_comm(proc):
+    comm, ticks, starttime, rss = read_stat(str(proc / "42" / "stat"))
+    assert comm == "my (weird) proc"
+    assert (ticks, starttime, rss) == (0, 20, 5000)
+
+def test_read_cmdline(proc):
+    assert read_cmdline(str(proc / "1")) == "/sbin/init splash"
+    assert read_cmdline(str(proc / "42")) == ""
+
+def test_read_stat_missing_process(tmp_path):
+    assert read_stat(str(tmp_path / "999" / "stat")) is None
+
+#=====================================================
+#Collector
+#=====================================================
+
+def test_top_by_cpu_and_rss(proc, clock):
+    """CPU % comes from tick deltas; RSS from pages."""
+    top = TopProcesses(1, proc_root=str(proc), clock=clock)
+    write_proc(proc, 1, "init", 100 + CLK_TCK, 10, 100)
+    clock.now += 2
+    result = top.collect()
+    assert result["cpu"][0].pid == 1
+    assert result["cpu"][0].cpu == 50.0
+    assert result["rss"][0].pid == 42
+    assert result["rss"][0].rss == 5000 * PAGE_SIZE
+    assert len(result["cpu"]) == 1
+
+def test_metadata_is_cached_until_pid_reuse(proc, clock):
+    """Static metadata is read once per (pid, starttime); a reused PID gets fresh metadata."""
+    top = TopProcesses(5, proc_root=str(proc), clock=clock)
+    (proc / "1" / "cmdline").write_bytes(b"changed\x00")
+    clock.now += 1
+    assert {p.pid: p.cmdline for p in top.collect()["cpu"]}[1] == "/sbin/init splash"
+
+    write_proc(proc, 1, "init", 100, 99, 100, b"new\x00")
+    clock.now += 1
+    result = {p.pid: p for p in top.collect()["cpu"]}
+    assert result[1].cmdline == "new"
+    assert result[1].cpu == 0.0
+
+def test_exited_processes_are_evicted(proc, clock):
+    top = TopProcesses(5, proc_root=str(proc), clock=clock)
+    for f in (proc / "42").iterdir():
+        f.unlink()
+    (proc / "42").rmdir()
+    top.collect()
+    assert [key[0] for key in top._cache] == [1]
+
+def test_top_in_json_and_table(proc, capsys, clock):
+    top = TopProcesses(2, proc_root=str(proc), clock=clock)
+    stats = SystemStats(1, 2, 3, 4, 5, processes=top.collect())
+    output_json(stats, 90)
+    assert '"top"' in capsys.readouterr().out
+    assert process_table(stats.processes).row_count == 2
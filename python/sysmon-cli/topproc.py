@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# =======================================================================================================================================================================
+#  File        : topproc.py
+#  Author      : Ionescu Robert-Constantin
+#  Date        : 2025-11-13
+#  Version     : 1.0
+#  Description : Incremental top-N process collector for sysmon_cli - per-PID metadata cache, one /proc/<pid>/stat read per process per tick.
+# =======================================================================================================================================================================
+#  Usage       : from topproc import TopProcesses
+# =======================================================================================================================================================================
+
+import heapq
+import os
+import pwd
+import time
+from dataclasses import dataclass
+
+from procfs import PROC_ROOT
+
+# =======================================================================================================================================================================
+# TO DO SECTION / Development Steps / Requirements
+# =======================================================================================================================================================================
+
+# TODO - STEP1 - List PIDs with one scandir of /proc per tick
+# TODO - STEP2 - Read only /proc/<pid>/stat per tick (CPU times, start time and RSS are all in it)
+# TODO - STEP3 - Cache static metadata (name, cmdline, user) under (pid, starttime) so PID reuse is detected
+# TODO - STEP4 - Compute CPU % from utime + stime deltas, evict cache entries of exited processes
+# TODO - STEP5 - Pick the top N by CPU and by RSS with bounded heaps (heapq.nlargest)
+
+# =======================================================================================================================================================================
+# Constants / Variables / Classes
+# =======================================================================================================================================================================
+
+CLK_TCK = os.sysconf("SC_CLK_TCK")
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+@dataclass
+class ProcessInfo:
+    pid: int
+    name: str
+    user: str
+    cmdline: str
+    cpu: float = 0.0        # percent of one core
+    rss: int = 0            # bytes
+
+# Cached per-process state: static metadata plus the last CPU time seen
+class _Entry:
+    __slots__ = ("name", "user", "cmdline", "cpu_ticks")
+
+    # Method to store the metadata read when the process was first seen
+    def __init__(self, name, user, cmdline, cpu_ticks):
+        self.name = name
+        self.user = user
+        self.cmdline = cmdline
+        self.cpu_ticks = cpu_ticks
+
+# Collects the heaviest processes by CPU and RSS each tick
+class TopProcesses:
+    # Method to initialize the collector and take the baseline CPU times
+    def __init__(self, count=10, proc_root=PROC_ROOT, clock=time.monotonic):
+        self.count = count
+        self.proc_root = proc_root
+        self.clock = clock
+        self._cache = {}
+        self._users = {}
+        self._prev_time = None
+        self.collect()
+
+    # Method to scan /proc once and return {"cpu": [...], "rss": [...]} with the top N ProcessInfo each
+    def collect(self):
+        now = self.clock()
+        elapsed = now - self._prev_time if self._prev_time is not None else 0.0
+        scale = 100.0 / (elapsed * CLK_TCK) if elapsed > 0 else 0.0
+        cache = self._cache
+        seen = {}
+        samples = []
+
+        for entry in os.scandir(self.proc_root):
+            name = entry.name
+            if not name.isdigit():
+                continue
+            stat = read_stat(os.path.join(entry.path, "stat"))
+            if stat is None:
+                continue  # process exited between scandir and read
+            comm, ticks, starttime, rss_pages = stat
+            key = (int(name), starttime)
+            cached = cache.get(key)
+            if cached is None:
+                cached = _Entry(comm, self._user(entry.path), read_cmdline(entry.path), ticks)
+                cpu = 0.0
+            else:
+                cpu = (ticks - cached.cpu_ticks) * scale
+                cached.cpu_ticks = ticks
+            seen[key] = cached
+            samples.append((cpu, rss_pages * PAGE_SIZE, key))
+
+        self._cache = seen           # drops exited processes (and stale entries of reused PIDs)
+        self._prev_time = now
+        return {
+            "cpu": [self._info(s) for s in heapq.nlargest(self.count, samples, key=lambda s: s[0])],
+            "rss": [self._info(s) for s in heapq.nlargest(self.count, samples, key=lambda s: s[1])],
+        }
+
+    # Method to build a ProcessInfo from a (cpu, rss, key) sample
+    def _info(self, sample):
+        cpu, rss, key = sample
+        entry = self._cache[key]
+        return ProcessInfo(key[0], entry.name, entry.user, entry.cmdline, round(cpu, 1), rss)
+
+    # Method to resolve the owner of a process (uid -> name lookups are cached)
+    def _user(self, path):
+        try:
+            uid = os.stat(path).st_uid
+        except OSError:
+            return "?"
+        user = self._users.get(uid)
+        if user is None:
+            try:
+                user = pwd.getpwuid(uid).pw_name
+            except KeyError:
+                user = str(uid)
+            self._users[uid] = user
+        return user
+
+# =======================================================================================================================================================================
+# Helper Functions
+# =======================================================================================================================================================================
+
+# Function to read a small /proc file with raw os calls (no Python file object)
+def read_small(path, size=4096):
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        return os.read(fd, size)
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+
+# Function to parse /proc/<pid>/stat into (comm, utime + stime ticks, starttime, rss pages)
+def read_stat(path):
+    data = read_small(path)
+    if not data:
+        return None
+    end = data.rfind(b")")  # comm may itself contain spaces and parentheses
+    comm = data[data.find(b"(") + 1:end].decode(errors="replace")
+    fields = data[end + 2:].split(None, 22)
+    # fields[0] is field 3 (state) of proc(5): utime=14, stime=15, starttime=22, rss=24
+    return comm, int(fields[11]) + int(fields[12]), int(fields[19]), int(fields[21])
+
+# Function to read a process command line (NUL-separated), falling back to an empty string
+def read_cmdline(path):
+    data = read_small(os.path.join(path, "cmdline"), 65536)
+    if not data:
+        return ""
+    return data.rstrip(b"\x00").replace(b"\x00", b" ").decode(errors="replace")
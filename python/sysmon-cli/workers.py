@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# =======================================================================================================================================================================
+#  File        : workers.py
+#  Author      : Ionescu Robert-Constantin
+#  Date        : 2025-11-30
+#  Version     : 1.0
+#  Description : Single daemon worker threads for calls that may hang in the kernel (statvfs on a dead NFS mount, /proc reads) - never joined at exit.
+# =======================================================================================================================================================================
+#  Usage       : from workers import DaemonWorker; future = worker.submit(os.statvfs, "/mnt/nas")
+# =======================================================================================================================================================================
+
+import queue
+import threading
+from concurrent.futures import Future
+
+# =======================================================================================================================================================================
+# TO DO SECTION / Development Steps / Requirements
+# =======================================================================================================================================================================
+
+# TODO - STEP1 - One daemon thread per worker, fed through a queue, results returned as concurrent.futures.Future
+# TODO - STEP2 - Owners keep at most one call in flight per worker, so a hung call holds only its own thread
+# TODO - STEP3 - close() never waits: a thread stuck in a syscall is abandoned and cannot delay interpreter exit
+#                (ThreadPoolExecutor workers are joined at exit even after shutdown(wait=False))
+
+# =======================================================================================================================================================================
+# Constants / Variables / Classes
+# =======================================================================================================================================================================
+
+# Runs submitted calls one at a time on its own daemon thread
+class DaemonWorker:
+    # Method to start the worker thread
+    def __init__(self, name="sysmon-worker"):
+        self.name = name
+        self._jobs = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._loop, name=name, daemon=True)
+        self._thread.start()
+
+    # Method to queue fn(*args) and return its Future
+    def submit(self, fn, *args):
+        future = Future()
+        self._jobs.put((future, fn, args))
+        return future
+
+    # Method to stop the worker after the call in progress (if any) without waiting for it
+    def close(self):
+        self._jobs.put(None)
+
+    # Method to run queued calls until closed
+    def _loop(self):
+        while (job := self._jobs.get()) is not None:
+            future, fn, args = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = fn(*args)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)